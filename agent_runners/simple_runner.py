@@ -1,4 +1,7 @@
 import asyncio
+import time
+
+from typing import Dict
 
 from google.adk.agents import Agent
 from google.adk.runners import InMemoryRunner
@@ -6,12 +9,18 @@ from google.genai import types
 
 
 class SimpleRunner:
+    """
+    Runs an agent on a single message in a new in-memory session and returns its final response.
+    The time each agent of the run finished at is recorded in timings, in seconds from the start of the run.
+    """
+
     _DEFAULT_USER_ID = "user"
     _DEFAULT_APPLICATION_NAME = "agents"
 
     def __init__(self, user_id=None, application_name=None):
         self._user_id = user_id if user_id else SimpleRunner._DEFAULT_USER_ID
         self._application_name = application_name if application_name else SimpleRunner._DEFAULT_APPLICATION_NAME
+        self.timings: Dict[str, float] = {}
 
     def run(self, agent: Agent, message: str) -> str:
 
@@ -26,11 +35,41 @@ class SimpleRunner:
         )
 
         response = None
+        self.timings = {}
+        start = time.perf_counter()
         
         for event in runner.run(user_id = self._user_id, session_id = session.id, new_message = message) :
+            # the last event of an agent marks the time it finished at
+            self.timings[event.author] = time.perf_counter() - start
+            if event.is_final_response() :
+                if (event.content) and (event.content.parts) and (len(event.content.parts) > 0):
+                    if event.content.parts[0].text : 
+                        response = event.content.parts[0].text
+
+        return response
+
+    async def arun(self, agent: Agent, message: str, state: Dict[str, any] = None) -> str:
+
+        runner = InMemoryRunner(agent, app_name=self._application_name)
+        
+        session = await runner.session_service.create_session(
+            app_name=self._application_name, user_id=self._user_id, state=state
+        )
+
+        message = types.Content(
+            role='user', parts=[types.Part(text=message)]
+        )
+
+        response = None
+        self.timings = {}
+        start = time.perf_counter()
+        
+        async for event in runner.run_async(user_id = self._user_id, session_id = session.id, new_message = message) :
+            # the last event of an agent marks the time it finished at
+            self.timings[event.author] = time.perf_counter() - start
             if event.is_final_response() :
-                if (event.content.parts) and (len(event.content.parts) > 0):
+                if (event.content) and (event.content.parts) and (len(event.content.parts) > 0):
                     if event.content.parts[0].text : 
                         response = event.content.parts[0].text
 
-        return response
\ No newline at end of file
+        return response
@@ -1,7 +1,7 @@
 import os
 
 from tools.data_sources import get_web_sources_urls
-from tools.content import retrieve_curated_document_content_from_url
+from tools.content import aretrieve_curated_document_content_from_url, search_curated_documents, find_curated_documents, retrieve_passages_for_hypotheses
 from agents.base_gemini_llm_agent_factory import BaseGeminiLLMAgentFactory
 
 class AnalysisWebInformationAgentFactory(BaseGeminiLLMAgentFactory):
@@ -19,7 +19,10 @@ class AnalysisWebInformationAgentFactory(BaseGeminiLLMAgentFactory):
                 You are aware about the following tools:
                 
                 * {get_web_sources_urls.__name__} tool to retrieve a list of URLs for curated web sources
-                * {retrieve_curated_document_content_from_url.__name__} tool to retrieve the content of a web source using its URL
+                * {aretrieve_curated_document_content_from_url.__name__} tool to retrieve the content of a web source using its URL
+                * {search_curated_documents.__name__} tool to retrieve only the passages of the already retrieved web sources that best match a query
+                * {find_curated_documents.__name__} tool to list the already retrieved web sources having a given keyword or author
+                * {retrieve_passages_for_hypotheses.__name__} tool to retrieve, for each hypothesis, the passages of the already retrieved web sources closest to it
                 
                 You MUST call the tools provided in the task_description section in order to formulate your response.
             </role>
@@ -27,8 +30,12 @@ class AnalysisWebInformationAgentFactory(BaseGeminiLLMAgentFactory):
                 You will perform the information analysis according to the following rules:
 
                 * You will call first the {get_web_sources_urls.__name__} tool to get the list of URLs for the curated web source.
-                * You will call afterwards the {retrieve_curated_document_content_from_url.__name__} tool with the URL of each of the curated web source in order to retrieve the content of these sources. 
-                * You will analyze all the retrieved content in order to formulate the response.
+                * You will call afterwards the {find_curated_documents.__name__} tool without any condition to list the web sources already retrieved, with their summaries.
+                * You will call the {aretrieve_curated_document_content_from_url.__name__} tool only with the URLs of the web sources not listed, so every web source is retrieved once.
+                * You will call the {retrieve_passages_for_hypotheses.__name__} tool with the list of all the hypotheses in order to find the passages relevant to each of them. These passages are the main material of your analysis.
+                * You may call the {search_curated_documents.__name__} tool with focused queries, using the words the web sources would use, to find more passages across the retrieved web sources.
+                * You will call the {aretrieve_curated_document_content_from_url.__name__} tool again for a web source already retrieved only when its passages and summary are not enough to settle a point, to read the full document.
+                * You will analyze the retrieved passages, and the full documents you had to read, in order to formulate the response.
                 * You will always respond in clear text with the result of your analysis.
                 
                 NEVER return an empty answer!
@@ -44,7 +51,10 @@ class AnalysisWebInformationAgentFactory(BaseGeminiLLMAgentFactory):
     def _get_tools(self):
         return [
             get_web_sources_urls,
-            retrieve_curated_document_content_from_url
+            aretrieve_curated_document_content_from_url,
+            search_curated_documents,
+            find_curated_documents,
+            retrieve_passages_for_hypotheses
         ]
         
     def _get_output_key(self):
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+
+from abc import abstractmethod
+from typing import List
+
+from document_database import DocumentDatabase
+from storage.blob_store import BlobStore
+from storage.retention_document_database import RetentionPolicy
+
+from agent_runners.simple_runner import SimpleRunner
+from agents.base_function_agent_factory import BaseFunctionAgentFactory
+from agents.base_gemini_llm_agent_factory import BaseGeminiLLMAgentFactory
+
+
+class BaseChunkedAgentFactory(BaseFunctionAgentFactory):
+    """
+    Runs an LLM agent on the chunks of a content rather than on the whole content, so long contents
+    stay within the output limits of the model and a failing call only loses its own chunk.
+    Chunks are processed concurrently, within a bounded number of calls in flight, and their results
+    are cached by chunk hash, so an edited page only has its changed chunks processed again.
+    """
+
+    # The results of the chunks, keyed by the hash of the chunk, the agent instruction and the model
+    _CHUNK_STORAGE = "./0_0_2_cache/0_0_3_chunks"
+
+    # Results of chunks no longer part of any page are useless, the most recently used ones are kept
+    _CHUNK_STORAGE_RETENTION_POLICY = RetentionPolicy(
+        max_size = 256 * 1024 * 1024,
+        max_entries = 100_000,
+        eviction = RetentionPolicy.EVICTION_LRU
+    )
+
+    # About 3,000 tokens, leaving the model room to answer with the whole chunk
+    _MAX_CHUNK_CHARACTERS = 12_000
+
+    # The maximum number of LLM calls in flight for a content
+    _MAX_CONCURRENCY = 4
+
+    @abstractmethod
+    def _get_chunk_agent_factory(self) -> BaseGeminiLLMAgentFactory:
+        """
+        Gives the factory of the LLM agent run on each chunk.
+
+        Returns:
+            BaseGeminiLLMAgentFactory: The factory.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _get_chunk_input_key(self) -> str:
+        """
+        Gives the session state key the instruction of the LLM agent reads its content from.
+
+        Returns:
+            str: The session state key.
+        """
+        raise NotImplementedError
+
+    def _get_fallback_result(self, chunk: str) -> str:
+        """
+        Gives the result of a chunk the LLM agent returned nothing for.
+
+        Args:
+            chunk (str): The chunk.
+
+        Returns:
+            str: The result standing for the one of the agent.
+
+        Raises:
+            Exception: If the chunk cannot go without a result, the default.
+        """
+        raise Exception(f"The {self._get_chunk_agent_factory()._get_name()} agent returned nothing for a chunk")
+
+    def _get_chunk_key(self, agent_factory: BaseGeminiLLMAgentFactory, chunk: str) -> str:
+        """
+        Identifies the result of a chunk, which changes with the chunk, the agent instruction and the model.
+
+        Args:
+            agent_factory (BaseGeminiLLMAgentFactory): The factory of the LLM agent.
+            chunk (str): The chunk.
+
+        Returns:
+            str: The key of the result in the chunk storage.
+        """
+        return BlobStore.get_hash("\n".join([
+            agent_factory._get_name(), agent_factory._get_baseline_llm(), agent_factory._get_instruction(), chunk
+        ]))
+
+    async def _aprocess_chunks(self, chunks: List[str]) -> List[str]:
+        """
+        Runs the LLM agent on each chunk not processed yet, concurrently, and reads the others from the cache.
+
+        Args:
+            chunks (List[str]): The chunks of the content.
+
+        Returns:
+            List[str]: The result of each chunk, in the order of the chunks.
+        """
+        agent_factory = self._get_chunk_agent_factory()
+        semaphore = asyncio.Semaphore(self._MAX_CONCURRENCY)
+        processed_count = 0
+
+        chunk_database = DocumentDatabase.acquire(self._CHUNK_STORAGE, retention_policy = self._CHUNK_STORAGE_RETENTION_POLICY)
+
+        async def process(chunk: str) -> str:
+            nonlocal processed_count
+
+            key = self._get_chunk_key(agent_factory, chunk)
+            if await chunk_database.ahas(key):
+                return (await chunk_database.aget(key))[1]
+
+            async with semaphore:
+                try:
+                    # every call has a session of its own, holding only its chunk
+                    result = await SimpleRunner().arun(
+                        agent_factory.get_agent(), "Process the content", state = {self._get_chunk_input_key(): chunk}
+                    )
+                except Exception as e:
+                    logging.warning(f"The {agent_factory._get_name()} agent failed on a chunk of {len(chunk)} characters: {e}")
+                    result = None
+            processed_count = processed_count + 1
+
+            # only the failing chunk is lost, the fallback is not cached so the chunk is processed again next time
+            if not (result and result.strip()):
+                logging.warning(f"The {agent_factory._get_name()} agent returned nothing for a chunk of {len(chunk)} characters")
+                return self._get_fallback_result(chunk)
+
+            await chunk_database.ainsert_if_absent(key, {"agent": agent_factory._get_name()}, result)
+
+            return result
+
+        try:
+            # all the chunks are done with before the storage is released, even if one of them fails
+            results = await asyncio.gather(*[process(chunk) for chunk in chunks], return_exceptions = True)
+        finally:
+            DocumentDatabase.release(chunk_database)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        logging.info(f"Ran the {agent_factory._get_name()} agent on {processed_count} of {len(chunks)} chunks, the others were cached")
+
+        return list(results)
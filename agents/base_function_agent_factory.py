@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+from typing import AsyncGenerator, Awaitable, Callable, Dict
+
+from google.genai import types
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+
+class FunctionAgent(BaseAgent):
+    """
+    Runs a function instead of calling an LLM, writing its results to the session state.
+    The function receives the user message and the session state, and returns the values to set in the session state.
+    """
+
+    function: Callable[[str, Dict[str, any]], Awaitable[Dict[str, any]]]
+    output_key: str = None
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        message = ""
+        if ctx.user_content and ctx.user_content.parts:
+            message = "".join(part.text for part in ctx.user_content.parts if part.text)
+
+        state_delta = await self.function(message, dict(ctx.session.state))
+
+        # the value of the output key is the response of the agent, as for LLM agents
+        content = None
+        if self.output_key and (state_delta.get(self.output_key) is not None):
+            content = types.Content(role = "model", parts = [types.Part(text = str(state_delta[self.output_key]))])
+
+        yield Event(
+            author = self.name,
+            invocation_id = ctx.invocation_id,
+            branch = ctx.branch,
+            content = content,
+            actions = EventActions(state_delta = state_delta)
+        )
+
+
+class BaseFunctionAgentFactory (ABC):
+    """
+    Creates the workflow stages which need no LLM: their work is done by code, at no token cost.
+    """
+
+    def _get_output_key(self) -> str :
+        return None
+
+    @abstractmethod
+    def _get_name(self) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _arun(self, message: str, state: Dict[str, any]) -> Dict[str, any]:
+        """
+        Does the work of the stage.
+
+        Args:
+            message (str): The user message of the workflow.
+            state (Dict[str, any]): The session state, as left by the previous stages.
+
+        Returns:
+            Dict[str, any]: The values to set in the session state.
+        """
+        raise NotImplementedError
+
+    def get_agent(self) -> BaseAgent:
+        agent = FunctionAgent(
+            name = self._get_name(),
+            function = self._arun,
+            output_key = self._get_output_key()
+        )
+
+        return agent
@@ -0,0 +1,41 @@
+from typing import Dict
+
+from tools.library.passages import split_chunks
+from agents.base_chunked_agent_factory import BaseChunkedAgentFactory
+from agents.base_gemini_llm_agent_factory import BaseGeminiLLMAgentFactory
+from agents.content_cleanup_agent_factory import ContentCleanupAgentFactory
+from agents.content_retrieval_agent_factory import ContentRetrievalAgentFactory
+
+
+class ChunkedContentCleanupAgentFactory(BaseChunkedAgentFactory):
+    """
+    Cleans up the original content chunk by chunk, split at heading and paragraph boundaries,
+    and merges the cleaned up chunks in order into cleaned_up_content.
+    """
+
+    _INPUT_KEY = ContentRetrievalAgentFactory._OUTPUT_KEY
+    _OUTPUT_KEY = ContentCleanupAgentFactory.OUTPUT_KEY
+
+    def _get_name(self) -> str:
+        return "ChunkedContentCleanupAgent"
+
+    def _get_chunk_agent_factory(self) -> BaseGeminiLLMAgentFactory:
+        return ContentCleanupAgentFactory()
+
+    def _get_chunk_input_key(self) -> str:
+        return ChunkedContentCleanupAgentFactory._INPUT_KEY
+
+    def _get_fallback_result(self, chunk: str) -> str:
+        # a chunk left as retrieved is better than a hole in the content
+        return chunk
+
+    async def _arun(self, message: str, state: Dict[str, any]) -> Dict[str, any]:
+        chunks = split_chunks(state.get(ChunkedContentCleanupAgentFactory._INPUT_KEY) or "", self._MAX_CHUNK_CHARACTERS)
+        cleaned_up_chunks = await self._aprocess_chunks(chunks)
+
+        # the cleaned up content is written to the session state only, it is not repeated as a response
+        state_delta = {
+            ChunkedContentCleanupAgentFactory._OUTPUT_KEY: "\n\n".join(chunk.strip() for chunk in cleaned_up_chunks)
+        }
+
+        return state_delta
@@ -0,0 +1,74 @@
+from typing import Dict
+
+from tools.library.passages import split_chunks
+from agents.base_chunked_agent_factory import BaseChunkedAgentFactory
+from agents.base_gemini_llm_agent_factory import BaseGeminiLLMAgentFactory
+from agents.content_cleanup_agent_factory import ContentCleanupAgentFactory
+from agents.content_summarization_agent_factory import ContentSummarizationAgentFactory
+
+
+class ChunkedContentSummarizationAgentFactory(BaseChunkedAgentFactory):
+    """
+    Summarizes the cleaned up content hierarchically: each chunk is summarized, then the summaries
+    of the chunks are summarized together, until a single summary is left.
+    A content fitting in a single chunk is summarized in a single call.
+    A chunk the agent fails on is stood for by its beginning, so the summary is still produced.
+    """
+
+    _INPUT_KEY = ContentCleanupAgentFactory.OUTPUT_KEY
+    _OUTPUT_KEY = ContentSummarizationAgentFactory._OUTPUT_KEY
+
+    # About the length of a summary, so the summaries keep getting shorter level after level
+    _FALLBACK_SUMMARY_CHARACTERS = 2_000
+
+    def _get_name(self) -> str:
+        return "ChunkedContentSummarizationAgent"
+
+    def _get_chunk_agent_factory(self) -> BaseGeminiLLMAgentFactory:
+        return ContentSummarizationAgentFactory()
+
+    def _get_chunk_input_key(self) -> str:
+        return ChunkedContentSummarizationAgentFactory._INPUT_KEY
+
+    def _get_fallback_result(self, chunk: str) -> str:
+        # the beginning of a chunk usually states what it is about
+        return self._truncate(chunk, self._FALLBACK_SUMMARY_CHARACTERS)
+
+    def _truncate(self, text: str, max_characters: int) -> str:
+        """
+        Cuts a text to the given length at a word boundary.
+
+        Args:
+            text (str): The text.
+            max_characters (int): The maximum number of characters kept.
+
+        Returns:
+            str: The beginning of the text, the whole text if it is short enough.
+        """
+        text = text.strip()
+        if len(text) <= max_characters:
+            return text
+
+        cut = text.rfind(" ", 0, max_characters)
+
+        return text[:cut if cut > 0 else max_characters]
+
+    async def _arun(self, message: str, state: Dict[str, any]) -> Dict[str, any]:
+        chunks = split_chunks(state.get(ChunkedContentSummarizationAgentFactory._INPUT_KEY) or "", self._MAX_CHUNK_CHARACTERS)
+        summaries = await self._aprocess_chunks(chunks)
+
+        while len(summaries) > 1:
+            chunks = split_chunks("\n\n".join(summaries), self._MAX_CHUNK_CHARACTERS)
+            # summaries not getting shorter are summarized together at once, to end the hierarchy,
+            # each of them cut to its share of a chunk so the call stays within the limits of the model
+            if len(chunks) >= len(summaries):
+                max_summary_characters = (self._MAX_CHUNK_CHARACTERS - 2 * (len(summaries) - 1)) // len(summaries)
+                chunks = ["\n\n".join(self._truncate(summary, max_summary_characters) for summary in summaries)]
+            summaries = await self._aprocess_chunks(chunks)
+
+        # the summary is written to the session state only, it is not repeated as a response
+        state_delta = {
+            ChunkedContentSummarizationAgentFactory._OUTPUT_KEY: summaries[0].strip() if summaries else ""
+        }
+
+        return state_delta
@@ -1,4 +1,7 @@
+from typing import Dict
+
 from agents.base_gemini_llm_agent_factory import BaseGeminiLLMAgentFactory
+from agents.content_properties_extraction_agent_factory import ContentPropertiesExtractionAgentFactory
 
 
 class ContentAuthorsExtractionAgentFactory(BaseGeminiLLMAgentFactory):
@@ -39,6 +42,13 @@ class ContentAuthorsExtractionAgentFactory(BaseGeminiLLMAgentFactory):
 
         return instruction
 
+    def _get_additional_arguments(self) -> Dict[str, any]:
+        # the LLM is called only if the page metadata did not give the value with confidence
+        additional_arguments = {
+            "before_agent_callback" : ContentPropertiesExtractionAgentFactory.get_before_agent_callback(ContentAuthorsExtractionAgentFactory._OUTPUT_KEY)
+        }
+        return additional_arguments
+
     def _get_output_key(self):
         return ContentAuthorsExtractionAgentFactory._OUTPUT_KEY
 
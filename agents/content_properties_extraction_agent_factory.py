@@ -0,0 +1,94 @@
+import logging
+
+from typing import Callable, Dict
+
+from google.genai import types
+
+from google.adk.agents.callback_context import CallbackContext
+
+from tools.library.document_properties import MIN_CONFIDENCE, extract_authors, extract_title
+from agents.base_function_agent_factory import BaseFunctionAgentFactory
+from agents.content_retrieval_agent_factory import ContentRetrievalAgentFactory
+
+
+class ContentPropertiesExtractionAgentFactory(BaseFunctionAgentFactory):
+    """
+    Finds the title and the authors of the document in the metadata of its page (title, OpenGraph, meta tags, JSON-LD),
+    before the LLM agents are called for them. For each property, the path taken is recorded in the session state,
+    under "<property>_extraction", so the share of the documents needing no LLM call can be tracked.
+    """
+
+    TITLE_OUTPUT_KEY = "title"
+    AUTHORS_OUTPUT_KEY = "authors"
+
+    # The paths a property can be extracted through
+    EXTRACTION_METADATA = "metadata"
+    EXTRACTION_LLM = "llm"
+
+    def _get_name(self) -> str:
+        return "ContentPropertiesExtractionAgent"
+
+    @staticmethod
+    def get_extraction_key(output_key: str) -> str:
+        """
+        Gives the session state key recording how a property was extracted.
+
+        Args:
+            output_key (str): The session state key of the property.
+
+        Returns:
+            str: The session state key of its extraction path.
+        """
+        return output_key + "_extraction"
+
+    @staticmethod
+    def get_before_agent_callback(output_key: str) -> Callable[[CallbackContext], types.Content]:
+        """
+        Gives the callback skipping the LLM agent extracting a property, when it was already found in the page metadata.
+
+        Args:
+            output_key (str): The session state key of the property.
+
+        Returns:
+            Callable[[CallbackContext], types.Content]: The callback, answering in place of the agent
+            with the property found, or letting the agent run.
+        """
+        extraction_key = ContentPropertiesExtractionAgentFactory.get_extraction_key(output_key)
+
+        def skip_if_extracted(callback_context: CallbackContext) -> types.Content:
+            if callback_context.state.get(extraction_key) != ContentPropertiesExtractionAgentFactory.EXTRACTION_METADATA:
+                return None
+
+            return types.Content(role = "model", parts = [types.Part(text = callback_context.state.get(output_key, ""))])
+
+        return skip_if_extracted
+
+    async def _arun(self, message: str, state: Dict[str, any]) -> Dict[str, any]:
+        state_delta = {
+            self.get_extraction_key(self.TITLE_OUTPUT_KEY): self.EXTRACTION_LLM,
+            self.get_extraction_key(self.AUTHORS_OUTPUT_KEY): self.EXTRACTION_LLM
+        }
+
+        # the page metadata is left in the session state by the retrieval
+        url = state.get(ContentRetrievalAgentFactory.URL_OUTPUT_KEY)
+        metadata = state.get(ContentRetrievalAgentFactory.METADATA_OUTPUT_KEY) or {}
+
+        extractions = {
+            self.TITLE_OUTPUT_KEY: extract_title(metadata),
+            self.AUTHORS_OUTPUT_KEY: extract_authors(metadata)
+        }
+
+        for output_key, (value, confidence) in extractions.items():
+            if value and (confidence >= MIN_CONFIDENCE):
+                state_delta[output_key] = value
+                state_delta[self.get_extraction_key(output_key)] = self.EXTRACTION_METADATA
+
+        logging.info(
+            f"Extracted the properties of {url}: "
+            + ", ".join(
+                f"{output_key} from {state_delta[self.get_extraction_key(output_key)]} (confidence {confidence:.1f})"
+                for output_key, (_, confidence) in extractions.items()
+            )
+        )
+
+        return state_delta
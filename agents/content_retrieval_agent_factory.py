@@ -1,47 +1,38 @@
-import os
+import re
 
-from tools.content import retrieve_content_from_url
-from agents.base_gemini_llm_agent_factory import BaseGeminiLLMAgentFactory
+from typing import Dict
+
+from tools.content import aretrieve_metadata_and_content_from_url
+from agents.base_function_agent_factory import BaseFunctionAgentFactory
+
+_URL_PATTERN = re.compile(r"https?://\S+")
+
+class ContentRetrievalAgentFactory(BaseFunctionAgentFactory):
+    """
+    Retrieves the page at the URL of the user message and writes its main content, its metadata and its URL
+    to the session state, where the following agents read them. No LLM is called and the content is not
+    repeated as a response, so fetching costs no tokens.
+    """
 
-class ContentRetrievalAgentFactory(BaseGeminiLLMAgentFactory):
     _OUTPUT_KEY = "original_content"
-    
+    METADATA_OUTPUT_KEY = "original_metadata"
+    URL_OUTPUT_KEY = "url"
+
     def _get_name(self) -> str:
         return "ContentRetrievalAgent"
-    
-    def _get_baseline_llm(self) -> str:
-        assert not os.environ["BASELINE_LLM"] is None
-        return os.environ["BASELINE_LLM"]
-    
-    def _get_instruction(self) -> str:
-        instruction = f"""
-            <role>
-                You are an expert agent specialized in content retrieval operations using URL addresses by using the '{retrieve_content_from_url.__name__}'. 
-                THis tool which must ALWAYS be called in the process of content retrieval. Never provide your own information.
-                The content retrieval procedure is described in the task description and you MUST call the tool provided in the task_description.
-            </role>
-            <task_description>
-                You will receive a web URL from which you will have to retrieve the content using the following rules:
-                
-                1. You MUST ALWAYS call the '{retrieve_content_from_url.__name__}' tool to retrieve the content from the URL.
-                Respond with the content returned by the '{retrieve_content_from_url.__name__}' tool without any changes or modifications.
-                2. You MUST ALWAYS reply with the content exactly as returned by the tool. No modifications to it!
-
-                IMPORTANT: Never return an empty answer.
-            </task_description>
-            <format>
-                Return the content in text format without any confirmation or acknowledgment.
-                Do not modify the content under any circumstances.
-                Do not add any acknowledgements or introductions.
-            </format>
-        """
-        
-        return instruction
-
-    def _get_tools(self):
-        return [
-            retrieve_content_from_url
-        ]
-        
-    def _get_output_key(self):
-        return ContentRetrievalAgentFactory._OUTPUT_KEY
\ No newline at end of file
+
+    async def _arun(self, message: str, state: Dict[str, any]) -> Dict[str, any]:
+        match = _URL_PATTERN.search(message)
+        if not match:
+            raise Exception(f"No URL to retrieve in the message {message}")
+        url = match.group(0)
+
+        metadata, content = await aretrieve_metadata_and_content_from_url(url)
+
+        state_delta = {
+            ContentRetrievalAgentFactory._OUTPUT_KEY: content,
+            ContentRetrievalAgentFactory.METADATA_OUTPUT_KEY: metadata,
+            ContentRetrievalAgentFactory.URL_OUTPUT_KEY: url
+        }
+
+        return state_delta
@@ -1,38 +1,75 @@
-from google.adk.agents import Agent, SequentialAgent
+from google.adk.agents import Agent, ParallelAgent, SequentialAgent
 
 from agents.content_retrieval_agent_factory import ContentRetrievalAgentFactory
+from agents.content_properties_extraction_agent_factory import ContentPropertiesExtractionAgentFactory
 from agents.content_title_extraction_agent_factory import ContentTitleExtractionAgentFactory
 from agents.content_authors_extraction_agent_factory import ContentAuthorsExtractionAgentFactory
-from agents.content_cleanup_agent_factory import ContentCleanupAgentFactory
-from agents.content_summarization_agent_factory import ContentSummarizationAgentFactory
+from agents.chunked_content_cleanup_agent_factory import ChunkedContentCleanupAgentFactory
+from agents.chunked_content_summarization_agent_factory import ChunkedContentSummarizationAgentFactory
 from agents.content_keywords_extraction_agent_factory import ContentKeywordsExtractionAgentFactory
 from agents.document_information_assembling_agent_factory import DocumentInformationAssemblingAgentFactory
 
 class WorkflowDocumentInformationAssemblingAgentFactory:
+    """
+    Curates a document in stages, the agents of a stage depending only on the previous stages and running concurrently:
+
+    1. retrieval, without LLM, producing original_content and the page metadata
+    2. title and authors extraction from the page metadata, without LLM
+    3. title extraction and authors extraction, when the page metadata did not give them, and cleanup, reading original_content
+    4. summarization and keywords extraction, reading cleaned_up_content
+    5. assembling, without LLM, reading all of the above
+
+    Cleanup and summarization run chunk by chunk, so long contents are processed in bounded, cached pieces.
+    """
+
     def __init__(self):
         self.content_retrieval_agent_factory = ContentRetrievalAgentFactory()
+        self.content_properties_extraction_agent_factory = ContentPropertiesExtractionAgentFactory()
         self.content_title_extraction_agent_factory = ContentTitleExtractionAgentFactory()
         self.content_authors_extraction_agent_factory = ContentAuthorsExtractionAgentFactory()
-        self.content_cleanup_agent_factory = ContentCleanupAgentFactory()
-        self.content_summarization_agent_factory = ContentSummarizationAgentFactory()
+        self.content_cleanup_agent_factory = ChunkedContentCleanupAgentFactory()
+        self.content_summarization_agent_factory = ChunkedContentSummarizationAgentFactory()
         self.content_keywords_extraction_agent_factory = ContentKeywordsExtractionAgentFactory()
         self.document_information_assembling_agent_factory = DocumentInformationAssemblingAgentFactory()
 
     def _get_name(self) -> str:
         return "WorkflowDocumentInformationAssemblingAgent"
 
+    def _get_original_content_processing_agent(self) -> Agent:
+        # the agents reading only the original content
+        agent = ParallelAgent(
+            name = "OriginalContentProcessingAgent",
+            sub_agents = [
+                self.content_title_extraction_agent_factory.get_agent(),
+                self.content_authors_extraction_agent_factory.get_agent(),
+                self.content_cleanup_agent_factory.get_agent()
+            ]
+        )
+
+        return agent
+
+    def _get_cleaned_up_content_processing_agent(self) -> Agent:
+        # the agents reading only the cleaned up content
+        agent = ParallelAgent(
+            name = "CleanedUpContentProcessingAgent",
+            sub_agents = [
+                self.content_summarization_agent_factory.get_agent(),
+                self.content_keywords_extraction_agent_factory.get_agent()
+            ]
+        )
+
+        return agent
+
     def get_agent(self) -> Agent:
         agent = SequentialAgent(
             name = self._get_name(),
             sub_agents = [
-                self.content_retrieval_agent_factory.get_agent(), 
-                self.content_title_extraction_agent_factory.get_agent(), 
-                self.content_authors_extraction_agent_factory.get_agent(), 
-                self.content_cleanup_agent_factory.get_agent(),
-                self.content_summarization_agent_factory.get_agent(),
-                self.content_keywords_extraction_agent_factory.get_agent(),
+                self.content_retrieval_agent_factory.get_agent(),
+                self.content_properties_extraction_agent_factory.get_agent(),
+                self._get_original_content_processing_agent(),
+                self._get_cleaned_up_content_processing_agent(),
                 self.document_information_assembling_agent_factory.get_agent()
             ]
         )
-        
-        return agent
\ No newline at end of file
+
+        return agent
@@ -0,0 +1,87 @@
+import sys
+sys.dont_write_bytecode = True
+
+import tempfile
+import time
+
+from typing import Dict, List
+
+from google.adk.agents import Agent, SequentialAgent
+
+from agent_runners.simple_runner import SimpleRunner
+from agents.base_chunked_agent_factory import BaseChunkedAgentFactory
+from agents.workflow_document_content_assembling_agent_factory import WorkflowDocumentInformationAssemblingAgentFactory
+from tools.content import prefetch_web_sources
+from tools.data_sources import get_web_sources_urls
+
+# the number of curated sources each workflow is measured on, unless URLs are given on the command line
+_DOCUMENT_COUNT = 3
+
+def _get_sequential_agent(workflow_factory: WorkflowDocumentInformationAssemblingAgentFactory) -> Agent:
+    """
+    Chains the agents of the curation workflow one after the other, as the workflow used to.
+
+    Args:
+        workflow_factory (WorkflowDocumentInformationAssemblingAgentFactory): The factory of the agents.
+
+    Returns:
+        Agent: The sequential workflow.
+    """
+    return SequentialAgent(
+        name = "SequentialDocumentInformationAssemblingAgent",
+        sub_agents = [
+            workflow_factory.content_retrieval_agent_factory.get_agent(),
+            workflow_factory.content_properties_extraction_agent_factory.get_agent(),
+            workflow_factory.content_title_extraction_agent_factory.get_agent(),
+            workflow_factory.content_authors_extraction_agent_factory.get_agent(),
+            workflow_factory.content_cleanup_agent_factory.get_agent(),
+            workflow_factory.content_summarization_agent_factory.get_agent(),
+            workflow_factory.content_keywords_extraction_agent_factory.get_agent(),
+            workflow_factory.document_information_assembling_agent_factory.get_agent()
+        ]
+    )
+
+def _measure(get_agent: callable, urls: List[str]) -> List[Dict[str, float]]:
+    """
+    Curates the documents one after the other with the real agents, LLM calls included.
+    The results of the chunks are cached in an empty directory, so no workflow reuses the work of another.
+
+    Args:
+        get_agent (callable): Creates the curation workflow.
+        urls (List[str]): The URLs of the documents.
+
+    Returns:
+        List[Dict[str, float]]: For each document, the time each agent finished at in seconds from the start of the run.
+    """
+    BaseChunkedAgentFactory._CHUNK_STORAGE = tempfile.mkdtemp()
+
+    timings = []
+    for url in urls:
+        runner = SimpleRunner()
+        response = runner.run(get_agent(), f"Process the content from {url}")
+        assert response is not None
+        timings.append(runner.timings)
+
+    return timings
+
+if __name__ == "__main__":
+    urls = sys.argv[1:] if len(sys.argv) > 1 else get_web_sources_urls()[:_DOCUMENT_COUNT]
+
+    # the pages are downloaded once beforehand, so both workflows read them from the cache
+    prefetch_web_sources()
+
+    workflow_factory = WorkflowDocumentInformationAssemblingAgentFactory()
+    workflows = {
+        "sequential": lambda: _get_sequential_agent(workflow_factory),
+        "staged": workflow_factory.get_agent
+    }
+
+    for name, get_agent in workflows.items():
+        start = time.perf_counter()
+        timings = _measure(get_agent, urls)
+        print(f"{name}: {(time.perf_counter() - start) / len(urls):.2f}s per document")
+
+        for url, document_timings in zip(urls, timings):
+            print(f"  {url}")
+            for agent_name, seconds in document_timings.items():
+                print(f"    {agent_name:>40} finished at {seconds:>7.2f}s")
@@ -0,0 +1,72 @@
+import sys
+sys.dont_write_bytecode = True
+
+import tempfile
+import time
+
+from document_database import DocumentDatabase
+
+# the number of documents written and read in a single batch
+_DOCUMENT_COUNT = 10_000
+
+# the documents inserted one at a time, to extrapolate the per-document baseline
+_SINGLE_DOCUMENT_COUNT = 1_000
+
+_IMPLEMENTATIONS = [
+    DocumentDatabase._IMPLEMENTATION_TINYDB,
+    DocumentDatabase._IMPLEMENTATION_SQLITE
+]
+
+def _generate_documents(document_count: int) -> list:
+    """
+    Generates distinct documents of a few kilobytes each.
+
+    Args:
+        document_count (int): The number of documents to generate.
+
+    Returns:
+        list: The identifier, metadata and content of each document.
+    """
+    documents = []
+    for index in range(document_count):
+        content = f"<html><title>Benchmark {index}</title><body>" + f"paragraph {index} " * 200 + "</body></html>"
+        documents.append((f"https://example.com/{index}", {"title": f"Benchmark {index}"}, content))
+
+    return documents
+
+def _measure_throughput(implementation: str) -> tuple[float, float, float]:
+    """
+    Measures the document throughput of single inserts, insert_many and get_many.
+
+    Args:
+        implementation (str): The document database implementation to use.
+
+    Returns:
+        tuple[float, float, float]: The documents per second for insert, insert_many and get_many.
+    """
+    documents = _generate_documents(_DOCUMENT_COUNT)
+    ids = [id for id, _, _ in documents]
+
+    with tempfile.TemporaryDirectory() as database_directory:
+        document_database = DocumentDatabase.get_implementation(database_directory + "/single", implementation, cache_size=0)
+        start = time.perf_counter()
+        for id, metadata, content in documents[:_SINGLE_DOCUMENT_COUNT]:
+            document_database.insert(id, metadata, content)
+        insert_throughput = _SINGLE_DOCUMENT_COUNT / (time.perf_counter() - start)
+
+        document_database = DocumentDatabase.get_implementation(database_directory + "/batch", implementation, cache_size=0)
+        start = time.perf_counter()
+        document_database.insert_many(documents)
+        insert_many_throughput = _DOCUMENT_COUNT / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        document_database.get_many(ids)
+        get_many_throughput = _DOCUMENT_COUNT / (time.perf_counter() - start)
+
+    return insert_throughput, insert_many_throughput, get_many_throughput
+
+if __name__ == "__main__":
+    print(f"{'implementation':>15} {'insert (doc/s)':>16} {'insert_many (doc/s)':>20} {'get_many (doc/s)':>18}")
+    for implementation in _IMPLEMENTATIONS:
+        insert_throughput, insert_many_throughput, get_many_throughput = _measure_throughput(implementation)
+        print(f"{implementation:>15} {insert_throughput:>16.0f} {insert_many_throughput:>20.0f} {get_many_throughput:>18.0f}")
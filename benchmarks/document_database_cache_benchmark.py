@@ -0,0 +1,53 @@
+import sys
+sys.dont_write_bytecode = True
+
+import random
+import tempfile
+import time
+
+from document_database import DocumentDatabase
+
+# the curated documents of an analysis, read repeatedly by the agents
+_DOCUMENT_COUNT = 50
+
+# the number of reads, spread over the documents
+_READ_COUNT = 5_000
+
+# the read cache budgets compared, in bytes
+_CACHE_SIZES = [0, 64 * 1024 * 1024]
+
+def _measure_read_latency(cache_size: int) -> tuple[float, dict]:
+    """
+    Measures the average latency of repeated reads of the same documents.
+
+    Args:
+        cache_size (int): The read cache budget in bytes, 0 disabling the cache.
+
+    Returns:
+        tuple[float, dict]: The average get() latency in microseconds and the cache statistics, if any.
+    """
+    with tempfile.TemporaryDirectory() as database_directory:
+        document_database = DocumentDatabase.get_implementation(database_directory, cache_size=cache_size)
+
+        documents = []
+        for index in range(_DOCUMENT_COUNT):
+            content = f"<html><title>Benchmark {index}</title><body>" + f"paragraph {index} " * 20_000 + "</body></html>"
+            documents.append((f"https://example.com/{index}", {"title": f"Benchmark {index}"}, content))
+        document_database.insert_many(documents)
+
+        ids = [f"https://example.com/{random.randrange(_DOCUMENT_COUNT)}" for _ in range(_READ_COUNT)]
+
+        start = time.perf_counter()
+        for id in ids:
+            document_database.get(id)
+        latency = (time.perf_counter() - start) / _READ_COUNT * 1_000_000
+
+        statistics = document_database.get_statistics() if cache_size > 0 else {}
+
+    return latency, statistics
+
+if __name__ == "__main__":
+    print(f"{'cache (bytes)':>14} {'get (us)':>10}  statistics")
+    for cache_size in _CACHE_SIZES:
+        latency, statistics = _measure_read_latency(cache_size)
+        print(f"{cache_size:>14} {latency:>10.1f}  {statistics}")
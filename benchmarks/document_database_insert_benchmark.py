@@ -0,0 +1,46 @@
+import sys
+sys.dont_write_bytecode = True
+
+import tempfile
+import time
+
+from document_database import DocumentDatabase
+
+# the number of documents inserted one at a time for each implementation
+_DOCUMENT_COUNTS = [500, 1_000, 2_000]
+
+_IMPLEMENTATIONS = [
+    DocumentDatabase._IMPLEMENTATION_TINYDB,
+    DocumentDatabase._IMPLEMENTATION_SQLITE
+]
+
+def _measure_insert_time(implementation: str, document_count: int) -> float:
+    """
+    Measures the time needed to insert documents one at a time into an empty database.
+
+    Args:
+        implementation (str): The document database implementation to use.
+        document_count (int): The number of documents to insert.
+
+    Returns:
+        float: The average insert latency in milliseconds.
+    """
+    with tempfile.TemporaryDirectory() as database_directory:
+        document_database = DocumentDatabase.get_implementation(database_directory, implementation, cache_size=0)
+
+        start = time.perf_counter()
+        for index in range(document_count):
+            document_database.insert(
+                f"https://example.com/{index}",
+                {"title": "Benchmark", "time": "Sat, 29 Nov 2025 16:51:47 GMT"},
+                "<html><title>Benchmark</title></html>"
+            )
+        
+        return (time.perf_counter() - start) / document_count * 1_000
+
+if __name__ == "__main__":
+    print(f"{'implementation':>15} {'documents':>10} {'insert (ms)':>12}")
+    for implementation in _IMPLEMENTATIONS:
+        for document_count in _DOCUMENT_COUNTS:
+            insert_time = _measure_insert_time(implementation, document_count)
+            print(f"{implementation:>15} {document_count:>10} {insert_time:>12.3f}")
@@ -0,0 +1,80 @@
+import sys
+sys.dont_write_bytecode = True
+
+import json
+import os
+import random
+import tempfile
+import time
+
+from document_database import DocumentDatabase
+
+# the database sizes for which the lookup latency is measured
+_DOCUMENT_COUNTS = [100, 1_000, 10_000, 100_000]
+
+# the number of lookups timed for each database size
+_LOOKUP_COUNT = 2_000
+
+def _populate_database_directory(database_directory: str, document_count: int) -> None:
+    """
+    Writes an index with the requested number of documents directly to disk.
+    Inserting one document at a time would make the setup itself quadratic.
+
+    Args:
+        database_directory (str): The directory in which the database files are created.
+        document_count (int): The number of documents to register in the index.
+    """
+    content_directory = database_directory + "/" + DocumentDatabase._DOCUMENT_DATABASE_CONTENT
+    os.makedirs(content_directory)
+
+    # all the records share a single content file, only the index size matters here
+    with open(content_directory + "/shared", "w", encoding="utf-8") as f:
+        f.write("<html><title>Benchmark</title></html>")
+
+    records = {}
+    for index in range(document_count):
+        records[str(index + 1)] = {
+            DocumentDatabase._KEY_ID: f"https://example.com/{index}",
+            DocumentDatabase._KEY_FILE_NAME: "shared",
+            DocumentDatabase._KEY_METADATA: {"title": "Benchmark", "time": "Sat, 29 Nov 2025 16:51:47 GMT"}
+        }
+
+    with open(database_directory + "/" + DocumentDatabase._DOCUMENT_DATABASE_FILE, "w", encoding="utf-8") as f:
+        json.dump({"_default": records}, f)
+
+def _measure_lookup_latency(document_count: int) -> tuple[float, float, float]:
+    """
+    Measures the average latency of has() and get() for a database of the given size.
+
+    Args:
+        document_count (int): The number of documents stored in the database.
+
+    Returns:
+        tuple[float, float, float]: The open time in milliseconds, then the has() and get() latency in microseconds.
+    """
+    with tempfile.TemporaryDirectory() as database_directory:
+        _populate_database_directory(database_directory, document_count)
+
+        start = time.perf_counter()
+        document_database = DocumentDatabase.get_implementation(database_directory, cache_size=0)
+        open_time = (time.perf_counter() - start) * 1_000
+
+        ids = [f"https://example.com/{random.randrange(document_count)}" for _ in range(_LOOKUP_COUNT)]
+
+        start = time.perf_counter()
+        for id in ids:
+            document_database.has(id)
+        has_latency = (time.perf_counter() - start) / _LOOKUP_COUNT * 1_000_000
+
+        start = time.perf_counter()
+        for id in ids:
+            document_database.get(id)
+        get_latency = (time.perf_counter() - start) / _LOOKUP_COUNT * 1_000_000
+
+    return open_time, has_latency, get_latency
+
+if __name__ == "__main__":
+    print(f"{'documents':>10} {'open (ms)':>12} {'has (us)':>12} {'get (us)':>12}")
+    for document_count in _DOCUMENT_COUNTS:
+        open_time, has_latency, get_latency = _measure_lookup_latency(document_count)
+        print(f"{document_count:>10} {open_time:>12.1f} {has_latency:>12.2f} {get_latency:>12.2f}")
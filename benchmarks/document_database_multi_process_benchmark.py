@@ -0,0 +1,59 @@
+import sys
+sys.dont_write_bytecode = True
+
+import tempfile
+import time
+
+from multiprocessing import Pool
+
+from document_database import DocumentDatabase
+
+# the number of worker processes sharing one database directory
+_WORKER_COUNT = 4
+
+# every worker tries to cache the same documents, as concurrent tool calls would
+_DOCUMENT_COUNT = 500
+
+_IMPLEMENTATIONS = [
+    DocumentDatabase._IMPLEMENTATION_TINYDB,
+    DocumentDatabase._IMPLEMENTATION_SQLITE
+]
+
+def _run_worker(arguments: tuple[str, str, int]) -> int:
+    """
+    Caches all the documents in a shared database, skipping the ones cached by other workers.
+
+    Args:
+        arguments (tuple[str, str, int]): The database directory, the implementation and the worker index.
+
+    Returns:
+        int: The number of documents inserted by this worker.
+    """
+    database_directory, implementation, worker_index = arguments
+    document_database = DocumentDatabase.get_implementation(database_directory, implementation, cache_size=0)
+
+    inserted_count = 0
+    for index in range(_DOCUMENT_COUNT):
+        # stagger the workers so they race on different documents
+        document_index = (index + worker_index * _DOCUMENT_COUNT // _WORKER_COUNT) % _DOCUMENT_COUNT
+        content = f"<html><title>Benchmark {document_index}</title></html>"
+        if document_database.insert_if_absent(f"https://example.com/{document_index}", {}, content):
+            inserted_count = inserted_count + 1
+
+    return inserted_count
+
+if __name__ == "__main__":
+    print(f"{'implementation':>15} {'workers':>8} {'inserted':>9} {'readable':>9} {'time (s)':>9}")
+    for implementation in _IMPLEMENTATIONS:
+        with tempfile.TemporaryDirectory() as database_directory:
+            start = time.perf_counter()
+            with Pool(_WORKER_COUNT) as pool:
+                inserted_counts = pool.map(_run_worker, [(database_directory, implementation, index) for index in range(_WORKER_COUNT)])
+            elapsed_time = time.perf_counter() - start
+
+            # every document must be stored exactly once and readable from a fresh handle
+            document_database = DocumentDatabase.get_implementation(database_directory, implementation, cache_size=0)
+            ids = [f"https://example.com/{index}" for index in range(_DOCUMENT_COUNT)]
+            readable_count = len(document_database.get_many(ids))
+
+            print(f"{implementation:>15} {_WORKER_COUNT:>8} {sum(inserted_counts):>9} {readable_count:>9} {elapsed_time:>9.2f}")
@@ -0,0 +1,77 @@
+import sys
+sys.dont_write_bytecode = True
+
+import random
+import tempfile
+import time
+
+from document_database import DocumentDatabase
+
+# the database sizes for which the search latency is measured
+_DOCUMENT_COUNTS = [100, 1_000, 5_000]
+
+# the number of searches timed for each database size
+_SEARCH_COUNT = 200
+
+# the number of documents inserted per batch while building the database
+_BATCH_SIZE = 100
+
+_VOCABULARY = [f"term{index}" for index in range(20_000)]
+
+def _generate_text(random_generator: random.Random, word_count: int) -> str:
+    """
+    Generates a text whose word frequencies roughly follow the skewed distribution of natural language.
+
+    Args:
+        random_generator (random.Random): The seeded generator to draw the words from.
+        word_count (int): The number of words of the text.
+
+    Returns:
+        str: The generated text, one paragraph per hundred words.
+    """
+    words = [_VOCABULARY[min(int(random_generator.paretovariate(1.0)) - 1, len(_VOCABULARY) - 1)] for _ in range(word_count)]
+    return "\n\n".join(" ".join(words[index:index + 100]) for index in range(0, word_count, 100))
+
+def _measure_search_latency(document_count: int) -> tuple[float, float]:
+    """
+    Measures the indexing throughput and the average search latency for a database of the given size.
+
+    Args:
+        document_count (int): The number of documents stored in the database.
+
+    Returns:
+        tuple[float, float]: The indexed documents per second and the search latency in milliseconds.
+    """
+    random_generator = random.Random(document_count)
+
+    with tempfile.TemporaryDirectory() as database_directory:
+        document_database = DocumentDatabase.get_implementation(
+            database_directory, implementation="sqlite", cache_size=0, searchable=True
+        )
+
+        documents = [
+            (f"https://example.com/{index}", {"title": _generate_text(random_generator, 8)}, _generate_text(random_generator, 1_000))
+            for index in range(document_count)
+        ]
+
+        start = time.perf_counter()
+        for index in range(0, document_count, _BATCH_SIZE):
+            document_database.insert_many(documents[index:index + _BATCH_SIZE])
+        indexing_throughput = document_count / (time.perf_counter() - start)
+
+        queries = [" ".join(random_generator.sample(_VOCABULARY[:2_000], 3)) for _ in range(_SEARCH_COUNT)]
+
+        start = time.perf_counter()
+        for query in queries:
+            document_database.search(query, 10)
+        search_latency = (time.perf_counter() - start) / _SEARCH_COUNT * 1_000
+
+        document_database.close()
+
+    return indexing_throughput, search_latency
+
+if __name__ == "__main__":
+    print(f"{'documents':>10} {'indexed/s':>12} {'search (ms)':>12}")
+    for document_count in _DOCUMENT_COUNTS:
+        indexing_throughput, search_latency = _measure_search_latency(document_count)
+        print(f"{document_count:>10} {indexing_throughput:>12.1f} {search_latency:>12.2f}")
@@ -0,0 +1,87 @@
+import sys
+sys.dont_write_bytecode = True
+
+import tempfile
+import time
+
+import numpy as np
+
+from storage.vector_index import VectorIndex
+
+# the numbers of indexed chunks for which the search latency is measured
+_CHUNK_COUNTS = [1_000, 10_000, 100_000]
+
+# the number of queries searched together, e.g. the hypotheses of an analysis
+_QUERY_COUNT = 8
+
+# the number of searches timed for each index size
+_SEARCH_COUNT = 20
+
+_DIMENSION = 1024
+
+# the number of chunks per indexed document
+_DOCUMENT_CHUNK_COUNT = 10
+
+def _random_unit_vectors(random_generator: np.random.Generator, count: int) -> np.ndarray:
+    """
+    Draws random unit-length vectors.
+
+    Args:
+        random_generator (np.random.Generator): The seeded generator to draw the vectors from.
+        count (int): The number of vectors.
+
+    Returns:
+        np.ndarray: The vectors, one per row.
+    """
+    vectors = random_generator.standard_normal((count, _DIMENSION)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def _measure_search_latency(chunk_count: int) -> tuple[float, float, float]:
+    """
+    Measures the indexing throughput and the batched and one-by-one search latency for an index of the given size.
+
+    Args:
+        chunk_count (int): The number of chunks stored in the index.
+
+    Returns:
+        tuple[float, float, float]: The indexed chunks per second, then the latency in milliseconds
+        of searching all the queries together and of searching them one after the other.
+    """
+    random_generator = np.random.default_rng(chunk_count)
+
+    with tempfile.TemporaryDirectory() as index_directory:
+        vector_index = VectorIndex(index_directory + "/vectors.sqlite", index_directory + "/vectors.f32", "random", _DIMENSION)
+
+        vectors = _random_unit_vectors(random_generator, chunk_count)
+        documents = [
+            (f"https://example.com/{index}", ["chunk"] * _DOCUMENT_CHUNK_COUNT, vectors[index * _DOCUMENT_CHUNK_COUNT:(index + 1) * _DOCUMENT_CHUNK_COUNT])
+            for index in range(chunk_count // _DOCUMENT_CHUNK_COUNT)
+        ]
+
+        start = time.perf_counter()
+        for index in range(0, len(documents), 100):
+            vector_index.add_many(documents[index:index + 100])
+        indexing_throughput = chunk_count / (time.perf_counter() - start)
+
+        queries = _random_unit_vectors(random_generator, _QUERY_COUNT)
+
+        start = time.perf_counter()
+        for _ in range(_SEARCH_COUNT):
+            vector_index.search(queries, 5)
+        batched_latency = (time.perf_counter() - start) / _SEARCH_COUNT * 1_000
+
+        start = time.perf_counter()
+        for _ in range(_SEARCH_COUNT):
+            for query in queries:
+                vector_index.search(query, 5)
+        sequential_latency = (time.perf_counter() - start) / _SEARCH_COUNT * 1_000
+
+        vector_index.close()
+
+    return indexing_throughput, batched_latency, sequential_latency
+
+if __name__ == "__main__":
+    print(f"{'chunks':>10} {'indexed/s':>12} {'batched (ms)':>14} {'one by one (ms)':>16}")
+    for chunk_count in _CHUNK_COUNTS:
+        indexing_throughput, batched_latency, sequential_latency = _measure_search_latency(chunk_count)
+        print(f"{chunk_count:>10} {indexing_throughput:>12.0f} {batched_latency:>14.2f} {sequential_latency:>16.2f}")
@@ -0,0 +1,35 @@
+import sys
+sys.dont_write_bytecode = True
+
+import time
+
+from markdownify import markdownify
+
+from storage.blob_store import BlobStore
+from tools.library.main_content import extract_main_content
+
+# the cached raw pages, as retrieved from the curated web sources
+_RAW_CONTENT_DIRECTORY = "./0_0_2_cache/0_0_1_raw/content"
+
+if __name__ == "__main__":
+    blob_store = BlobStore(_RAW_CONTENT_DIRECTORY)
+
+    print(f"{'page':>10} {'html (KB)':>10} {'full md tokens':>15} {'main md tokens':>15} {'reduction':>10} {'full (ms)':>10} {'main (ms)':>10}")
+    for key in blob_store.list_keys():
+        html = blob_store.get(key)
+
+        start = time.perf_counter()
+        full_markdown = markdownify(html, heading_style="ATX")
+        full_elapsed = (time.perf_counter() - start) * 1_000
+
+        start = time.perf_counter()
+        _, statistics = extract_main_content(html)
+        main_elapsed = (time.perf_counter() - start) * 1_000
+
+        # tokens are estimated at four characters each, as in the extraction statistics
+        full_tokens = len(full_markdown) // 4
+        reduction = 1 - statistics["markdown_tokens"] / max(full_tokens, 1)
+        print(
+            f"{key.split('/')[-1][:10]:>10} {len(html) // 1_024:>10} {full_tokens:>15} {statistics['markdown_tokens']:>15} "
+            f"{reduction:>10.0%} {full_elapsed:>10.0f} {main_elapsed:>10.0f}"
+        )
@@ -0,0 +1,100 @@
+import sys
+sys.dont_write_bytecode = True
+
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from content.http_session import HttpSessionConfiguration
+from content.web_content_provider import WebContentProvider
+from document_database import _DOCUMENT_DATABASE_REGISTRY
+
+# the size of the oversized page served without announcing its length, like a chunked response would
+_OVERSIZED_PAGE_SIZE = 200 * 1024 * 1024
+
+_CHUNK = b"<p>" + b"x" * (64 * 1024 - 7) + b"</p>\n"
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """
+    Serves an oversized HTML page at /page.html and a binary file announcing its size at /file.pdf.
+    """
+
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        self.send_response(200)
+        if self.path == "/file.pdf":
+            self.send_header("Content-Type", "application/pdf")
+        else:
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+
+        try:
+            self.wfile.write(b"<html><head><title>Benchmark</title></head><body>")
+            for _ in range(_OVERSIZED_PAGE_SIZE // len(_CHUNK)):
+                self.wfile.write(_CHUNK)
+            self.wfile.write(b"</body></html>")
+        except (BrokenPipeError, ConnectionResetError):
+            # the client gave up on the download
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+def _measure(fetch: callable, url: str) -> tuple[float, float, str]:
+    """
+    Downloads a URL and reports the cost of doing so.
+
+    Args:
+        fetch (callable): Downloads the URL.
+        url (str): The URL to download.
+
+    Returns:
+        tuple[float, float, str]: The elapsed time in seconds, the peak memory allocated in megabytes and the outcome.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fetch(url)
+        outcome = "downloaded"
+    except Exception as e:
+        outcome = str(e).split(" from ")[0]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / (1024 * 1024), outcome
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as storage_directory:
+        class _BenchmarkWebContentProvider(WebContentProvider):
+            _DOCUMENT_STORAGE = storage_directory
+
+        web_content_provider = _BenchmarkWebContentProvider(HttpSessionConfiguration(max_content_size=10 * 1024 * 1024))
+
+        fetchers = {
+            "whole body": lambda url: requests.get(url).text,
+            "streamed, 10 MB cap": lambda url: web_content_provider.retrieve(url)
+        }
+
+        print(f"{'client':>20} {'page':>10} {'time (s)':>9} {'peak (MB)':>10}  outcome")
+        for name, fetch in fetchers.items():
+            for page in ["page.html", "file.pdf"]:
+                elapsed, peak, outcome = _measure(fetch, f"{base_url}/{page}")
+                print(f"{name:>20} {page:>10} {elapsed:>9.2f} {peak:>10.1f}  {outcome}")
+
+        web_content_provider.close()
+        # the released document database stays open for reuse, it is closed before its directory is removed
+        _DOCUMENT_DATABASE_REGISTRY.close_unused()
+
+    server.shutdown()
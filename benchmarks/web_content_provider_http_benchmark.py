@@ -0,0 +1,109 @@
+import sys
+sys.dont_write_bytecode = True
+
+import gzip
+import socket
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from content.http_session import HttpSessionConfiguration, create_http_session, get_timeout
+
+# the number of pages fetched sequentially from the stand-in server
+_FETCH_COUNT = 200
+
+# the delay the stand-in server adds to every new connection, standing for the TCP and TLS handshakes with a remote host
+_HANDSHAKE_DELAY = 0.02
+
+# a page of about 100 KB, compressible like real HTML
+_PAGE = ("<html><head><title>Benchmark</title></head><body>" + "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>" * 1_600 + "</body></html>").encode("utf-8")
+_COMPRESSED_PAGE = gzip.compress(_PAGE)
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """
+    Serves the benchmark page over keep-alive HTTP/1.1, compressed when the client accepts gzip.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    # connections opened and body bytes sent since the server started
+    connection_count = 0
+    sent_bytes = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        # like production servers, do not let Nagle's algorithm hold the body behind the headers
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        time.sleep(_HANDSHAKE_DELAY)
+        with _StandInHandler.lock:
+            _StandInHandler.connection_count = _StandInHandler.connection_count + 1
+
+    def do_GET(self):
+        body = _PAGE
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = _COMPRESSED_PAGE
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with _StandInHandler.lock:
+            _StandInHandler.sent_bytes = _StandInHandler.sent_bytes + len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _measure(fetch: callable, url: str) -> tuple[float, int, int]:
+    """
+    Fetches the benchmark page repeatedly and reports the cost of doing so.
+
+    Args:
+        fetch (callable): Fetches a URL and returns the response.
+        url (str): The URL of the benchmark page.
+
+    Returns:
+        tuple[float, int, int]: The average latency in milliseconds, the connections opened and the kilobytes transferred.
+    """
+    connection_count = _StandInHandler.connection_count
+    sent_bytes = _StandInHandler.sent_bytes
+
+    start = time.perf_counter()
+    for _ in range(_FETCH_COUNT):
+        response = fetch(url)
+        assert len(response.text) > 0
+    latency = (time.perf_counter() - start) / _FETCH_COUNT * 1_000
+
+    return (
+        latency,
+        _StandInHandler.connection_count - connection_count,
+        (_StandInHandler.sent_bytes - sent_bytes) // 1_024
+    )
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/page.html"
+
+    configuration = HttpSessionConfiguration()
+    session = create_http_session(configuration)
+
+    fetchers = {
+        "requests.get, uncompressed": lambda url: requests.get(url, headers={"Accept-Encoding": "identity"}),
+        "requests.get": lambda url: requests.get(url),
+        "pooled session": lambda url: session.get(url, timeout=get_timeout(configuration))
+    }
+
+    print(f"{'client':>28} {'latency (ms)':>14} {'connections':>12} {'transferred (KB)':>17}")
+    for name, fetch in fetchers.items():
+        latency, connection_count, transferred = _measure(fetch, url)
+        print(f"{name:>28} {latency:>14.2f} {connection_count:>12} {transferred:>17}")
+
+    session.close()
+    server.shutdown()
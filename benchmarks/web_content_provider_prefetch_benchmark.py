@@ -0,0 +1,131 @@
+import sys
+sys.dont_write_bytecode = True
+
+import asyncio
+import random
+import tempfile
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from content.web_content_provider import WebContentProvider
+from document_database import _DOCUMENT_DATABASE_REGISTRY
+
+# the number of curated sources in the registry
+_SOURCE_COUNT = 500
+
+# the number of stand-in servers the sources are spread over, each listening on its own port
+_HOST_COUNT = 25
+
+# the range of the delays, in seconds, the stand-in servers take to answer
+_MIN_LATENCY = 0.01
+_MAX_LATENCY = 0.05
+
+_PAGE = ("<html><head><title>Benchmark</title></head><body>" + "<p>Lorem ipsum dolor sit amet.</p>" * 200 + "</body></html>").encode("utf-8")
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """
+    Serves the benchmark page over keep-alive HTTP/1.1 after a delay depending on the requested path.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(random.Random(self.path).uniform(_MIN_LATENCY, _MAX_LATENCY))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(_PAGE)))
+        self.end_headers()
+        self.wfile.write(_PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+def _create_provider(storage_directory: str) -> WebContentProvider:
+    """
+    Creates a web content provider caching the pages in a temporary directory instead of the project cache.
+
+    Args:
+        storage_directory (str): The directory of the document store.
+
+    Returns:
+        WebContentProvider: The provider, to be closed by the caller.
+    """
+    class _BenchmarkWebContentProvider(WebContentProvider):
+        _DOCUMENT_STORAGE = storage_directory
+
+    return _BenchmarkWebContentProvider()
+
+def _measure_sequential(urls: list[str]) -> float:
+    """
+    Retrieves the sources one after the other, as the agents do on a cold cache.
+
+    Args:
+        urls (list[str]): The URLs of the sources.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    with tempfile.TemporaryDirectory() as storage_directory:
+        web_content_provider = _create_provider(storage_directory)
+
+        start = time.perf_counter()
+        for url in urls:
+            web_content_provider.retrieve(url)
+        elapsed = time.perf_counter() - start
+
+        web_content_provider.close()
+        # the released document database stays open for reuse, it is closed before its directory is removed
+        _DOCUMENT_DATABASE_REGISTRY.close_unused()
+
+    return elapsed
+
+def _measure_prefetch(urls: list[str]) -> float:
+    """
+    Prefetches all the sources concurrently.
+
+    Args:
+        urls (list[str]): The URLs of the sources.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    with tempfile.TemporaryDirectory() as storage_directory:
+        web_content_provider = _create_provider(storage_directory)
+
+        start = time.perf_counter()
+        failures = asyncio.run(web_content_provider.aprefetch(urls, politeness_delay=0.05))
+        elapsed = time.perf_counter() - start
+
+        assert not failures, failures
+        assert all(web_content_provider._document_database.has_many(urls).values())
+        web_content_provider.close()
+        # the released document database stays open for reuse, it is closed before its directory is removed
+        _DOCUMENT_DATABASE_REGISTRY.close_unused()
+
+    return elapsed
+
+if __name__ == "__main__":
+    servers = []
+    for _ in range(_HOST_COUNT):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+    urls = [
+        f"http://127.0.0.1:{servers[index % _HOST_COUNT].server_address[1]}/source/{index}.html"
+        for index in range(_SOURCE_COUNT)
+    ]
+
+    sequential_elapsed = _measure_sequential(urls)
+    prefetch_elapsed = _measure_prefetch(urls)
+
+    print(f"{'strategy':>12} {'cold start (s)':>15}")
+    print(f"{'sequential':>12} {sequential_elapsed:>15.2f}")
+    print(f"{'prefetch':>12} {prefetch_elapsed:>15.2f}")
+
+    for server in servers:
+        server.shutdown()
@@ -1,9 +1,17 @@
-from typing import Dict, Tuple
+import asyncio
+import logging
+import time
+
+from typing import Dict, List, Tuple
 
 from pydantic_core import from_json
 
 from content.provider import ContentProvider
+from content.web_content_provider import WebContentProvider
 from document_database import DocumentDatabase
+from storage.metadata_index import MetadataIndex
+from storage.retention_document_database import RetentionPolicy
+from tools.library.embeddings import get_default_embedding_function
 
 from agent_runners.simple_runner import SimpleRunner
 from agents.workflow_document_content_assembling_agent_factory import WorkflowDocumentInformationAssemblingAgentFactory
@@ -15,20 +23,66 @@ class CuratedContentProvider(ContentProvider):
     """
     
     _DOCUMENT_STORAGE = "./0_0_2_cache/0_0_2_curated"
+
+    # Curated documents are expensive to produce, they never expire and the most used ones are kept
+    _DOCUMENT_STORAGE_RETENTION_POLICY = RetentionPolicy(
+        max_size = 512 * 1024 * 1024,
+        max_entries = 10_000,
+        eviction = RetentionPolicy.EVICTION_LFU
+    )
+
+    # Curated documents are selected by keyword and author, and by the time they were curated
+    _DOCUMENT_STORAGE_METADATA_INDEXES = {
+        "keywords": MetadataIndex.KIND_TERM,
+        "authors": MetadataIndex.KIND_TERM
+    }
     
     def __init__(self):
         """
         Initializes the content provider system.
         """
         super().__init__()
-        self._document_database = DocumentDatabase.get_implementation(self._DOCUMENT_STORAGE)
+        self._document_database = DocumentDatabase.acquire(
+            self._DOCUMENT_STORAGE, 
+            retention_policy = self._DOCUMENT_STORAGE_RETENTION_POLICY,
+            searchable = True,
+            metadata_indexes = self._DOCUMENT_STORAGE_METADATA_INDEXES,
+            embedding_function = get_default_embedding_function()
+        )
         
     def _run_retrieval_workflow(self, url: str) -> Tuple[Dict[str, any], str] :
         
         runner = SimpleRunner()
         agent = WorkflowDocumentInformationAssemblingAgentFactory().get_agent()
         
+        start = time.perf_counter()
         agent_response = runner.run(agent, f"Process the content from {url}")
+        logging.info(f"Curated {url} in {time.perf_counter() - start:.2f}s, agents finished at {self._format_timings(runner.timings)}")
+
+        return self._parse_workflow_response(url, agent_response)
+
+    async def _arun_retrieval_workflow(self, url: str) -> Tuple[Dict[str, any], str] :
+        
+        runner = SimpleRunner()
+        agent = WorkflowDocumentInformationAssemblingAgentFactory().get_agent()
+        
+        start = time.perf_counter()
+        # the pages fetched by the workflow share one client, closed before the event loop of the caller ends
+        web_content_provider = ContentProvider.acquire(WebContentProvider)
+        try:
+            async with web_content_provider.async_http_client():
+                agent_response = await runner.arun(agent, f"Process the content from {url}")
+        finally:
+            ContentProvider.release(web_content_provider)
+        logging.info(f"Curated {url} in {time.perf_counter() - start:.2f}s, agents finished at {self._format_timings(runner.timings)}")
+
+        return self._parse_workflow_response(url, agent_response)
+
+    def _format_timings(self, timings: Dict[str, float]) -> str:
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+
+    def _parse_workflow_response(self, url: str, agent_response: str) -> Tuple[Dict[str, any], str] :
+
         document_information  = from_json(agent_response)
         
         metadata = {
@@ -42,12 +96,63 @@ class CuratedContentProvider(ContentProvider):
 
         return (metadata, content)
 
-    def retrieve(self, url: str) -> Tuple[Dict[str, any], str]:
+    def close(self) -> None:
+        """
+        Releases the shared document database used by the provider.
+        """
+        DocumentDatabase.release(self._document_database)
+
+    def _revalidate_source(self, url: str) -> bool:
+        """
+        Checks whether the page a curated document was produced from changed, refreshing the raw page if so.
+        A page no longer cached counts as changed, a page that cannot be revalidated as unchanged.
+
+        Args:
+            url (str): The location identifier for the resource.
+
+        Returns:
+            bool: True if the page changed since it was retrieved, False otherwise.
+        """
+        web_content_provider = ContentProvider.acquire(WebContentProvider)
+        try:
+            return web_content_provider.revalidate(url)
+        except Exception as e:
+            # the curated document is better than no document while the server is unreachable
+            logging.warning(f"Failed to revalidate {url}, serving the curated document: {e}")
+            return False
+        finally:
+            ContentProvider.release(web_content_provider)
+
+    async def _arevalidate_source(self, url: str) -> bool:
+        """
+        Checks whether the page a curated document was produced from changed, refreshing the raw page if so,
+        without blocking the event loop.
+        A page no longer cached counts as changed, a page that cannot be revalidated as unchanged.
+
+        Args:
+            url (str): The location identifier for the resource.
+
+        Returns:
+            bool: True if the page changed since it was retrieved, False otherwise.
+        """
+        web_content_provider = ContentProvider.acquire(WebContentProvider)
+        try:
+            return await web_content_provider.arevalidate(url)
+        except Exception as e:
+            # the curated document is better than no document while the server is unreachable
+            logging.warning(f"Failed to revalidate {url}, serving the curated document: {e}")
+            return False
+        finally:
+            ContentProvider.release(web_content_provider)
+
+    def retrieve(self, url: str, refresh: bool = False) -> Tuple[Dict[str, any], str]:
         """
         Obtains the content and associated properties for the provided URL.
 
         Args:
             url (str): The location identifier for the resource.
+            refresh (bool): Whether the source page of a cached document is revalidated,
+                the document being curated again only if the page changed.
 
         Returns:
             Tuple[Dict[str, any], str]: A tuple containing the document metadata and document content.
@@ -57,11 +162,137 @@ class CuratedContentProvider(ContentProvider):
         """
         # Check for existing record
         if self._document_database.has(url):
-            return self._document_database.get(url)
+            if not (refresh and self._revalidate_source(url)):
+                return self._document_database.get(url)
+
+            # The curated document is outdated, it is produced again from the new page
+            self._document_database.delete(url)
 
         metadata, content = self._run_retrieval_workflow(url)
         
-        # Store content and metadata for future access
-        self._document_database.insert(url, metadata, content)
+        # Store content and metadata for future access,
+        # keeping the stored version if another process has been faster
+        if not self._document_database.insert_if_absent(url, metadata, content):
+            return self._document_database.get(url)
                     
         return (metadata, content)
+
+    async def aretrieve(self, url: str, refresh: bool = False) -> Tuple[Dict[str, any], str]:
+        """
+        Obtains the content and associated properties for the provided URL without blocking the event loop.
+        The curation workflow runs on the event loop, the cache is accessed from worker threads.
+
+        Args:
+            url (str): The location identifier for the resource.
+            refresh (bool): Whether the source page of a cached document is revalidated,
+                the document being curated again only if the page changed.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the document metadata and document content.
+
+        Raises:
+            Exception: If the content cannot be obtained from the source.
+        """
+        # Check for existing record
+        if await self._document_database.ahas(url):
+            if not (refresh and await self._arevalidate_source(url)):
+                return await self._document_database.aget(url)
+
+            # The curated document is outdated, it is produced again from the new page
+            await asyncio.to_thread(self._document_database.delete, url)
+
+        metadata, content = await self._arun_retrieval_workflow(url)
+        
+        # Store content and metadata for future access,
+        # keeping the stored version if another process has been faster
+        if not await self._document_database.ainsert_if_absent(url, metadata, content):
+            return await self._document_database.aget(url)
+                    
+        return (metadata, content)
+
+    def find(self, keyword: str = None, author: str = None, curated_after: float = None) -> List[Dict[str, any]]:
+        """
+        Selects the curated documents matching all the given conditions, without reading their content.
+
+        Args:
+            keyword (str, optional): A keyword the documents must have.
+            author (str, optional): An author the documents must have.
+            curated_after (float, optional): The POSIX timestamp after which the documents must have been curated.
+
+        Returns:
+            List[Dict[str, any]]: The metadata of the matching documents, most recently curated first.
+        """
+        terms = {}
+        if keyword:
+            terms["keywords"] = keyword
+        if author:
+            terms["authors"] = author
+
+        time_ranges = {}
+        if curated_after is not None:
+            time_ranges[MetadataIndex.KEY_INSERTED_AT] = (curated_after, None)
+
+        urls = self._document_database.find(terms, time_ranges)
+
+        return [self._document_database.get_metadata(url) for url in urls]
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, any]]:
+        """
+        Finds the passages of the curated documents best matching a query, without curating new content.
+
+        Args:
+            query (str): The free text query.
+            k (int): The maximum number of passages returned.
+
+        Returns:
+            List[Dict[str, any]]: The best passages first, each with the URL ("url") and title ("title") 
+            of its document, its text ("passage") and its BM25 score ("score").
+        """
+        results = self._document_database.search(query, k)
+
+        passages = []
+        for result in results:
+            url = result["id"]
+            metadata = self._document_database.get_metadata(url)
+            passages.append({
+                "url": url,
+                "title": metadata.get("title"),
+                "passage": result["passage"],
+                "score": result["score"]
+            })
+
+        return passages
+
+    def search_similar(self, queries: List[str], k: int = 5) -> List[List[Dict[str, any]]]:
+        """
+        Finds the chunks of the curated documents closest to each query, without curating new content.
+        The chunks are matched on their meaning by a local sentence embedding model when one is installed,
+        on their vocabulary by the hashing embedding otherwise.
+
+        Args:
+            queries (List[str]): The free text queries, searched together in a single pass.
+            k (int): The maximum number of chunks returned per query.
+
+        Returns:
+            List[List[Dict[str, any]]]: For each query, the closest chunks first, each with the URL ("url") 
+            and title ("title") of its document, its text ("passage") and its cosine similarity ("score").
+        """
+        results = self._document_database.search_similar(queries, k)
+
+        titles = {}
+        passages = []
+        for query_results in results:
+            query_passages = []
+            for result in query_results:
+                url = result["id"]
+                if url not in titles:
+                    titles[url] = self._document_database.get_metadata(url).get("title")
+                query_passages.append({
+                    "url": url,
+                    "title": titles[url],
+                    "passage": result["chunk"],
+                    "score": result["score"]
+                })
+            passages.append(query_passages)
+
+        return passages
@@ -0,0 +1,298 @@
+import codecs
+import hashlib
+import httpx
+import requests
+import time
+
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# The media types of the pages the content providers can make sense of
+_DEFAULT_ALLOWED_CONTENT_TYPES = ["text/html", "application/xhtml+xml", "text/plain"]
+
+
+class HttpSessionConfiguration:
+    """
+    Describes how the content providers connect to web servers.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 10,
+        read_timeout: float = 30,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        max_connections_per_host: int = 10,
+        max_hosts: int = 32,
+        user_agent: str = None,
+        max_content_size: int = 10 * 1024 * 1024,
+        allowed_content_types: List[str] = None
+    ):
+        """
+        Initializes the configuration.
+
+        Args:
+            connect_timeout (float): The number of seconds to wait for a connection to a server.
+            read_timeout (float): The number of seconds to wait for a server to send data.
+            max_retries (int): The number of times a request failing to connect or answered with a transient
+                error status (429, 500, 502, 503, 504) is retried.
+            retry_backoff (float): The base delay in seconds of the exponential backoff between retries.
+            max_connections_per_host (int): The number of connections kept open to each server.
+            max_hosts (int): The number of servers for which connections are kept open.
+            user_agent (str, optional): The User-Agent header sent instead of the HTTP library default.
+            max_content_size (int): The number of bytes of a page, once decompressed, above which its download is aborted.
+            allowed_content_types (List[str], optional): The media types of the pages which are downloaded,
+                HTML and plain text by default. Responses without a Content-Type header are downloaded as well.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_connections_per_host = max_connections_per_host
+        self.max_hosts = max_hosts
+        self.user_agent = user_agent
+        self.max_content_size = max_content_size
+        self.allowed_content_types = allowed_content_types if allowed_content_types else _DEFAULT_ALLOWED_CONTENT_TYPES
+
+
+# The statuses worth retrying, the server being temporarily overloaded or unavailable
+RETRIED_STATUSES = [429, 500, 502, 503, 504]
+
+# The longest wait before a retry, whatever the backoff or the server ask for
+_MAX_RETRY_DELAY = 120
+
+
+def get_accepted_encodings() -> str:
+    """
+    Lists the content encodings the HTTP clients can decode.
+    Brotli is only accepted when a Brotli decoder is installed.
+
+    Returns:
+        str: The value of the Accept-Encoding header.
+    """
+    encodings = ["gzip", "deflate"]
+    try:
+        import brotli
+        encodings.append("br")
+    except ImportError:
+        pass
+
+    return ", ".join(encodings)
+
+
+class _CappedRetry(Retry):
+    """
+    Retries the requests of a session like Retry, never waiting longer than _MAX_RETRY_DELAY
+    whatever the Retry-After header of the server asks for.
+    """
+
+    def get_retry_after(self, response) -> float:
+        """
+        Gives the delay the server asks for before a retry, capped.
+
+        Args:
+            response (urllib3.BaseHTTPResponse): The response with the transient error status.
+
+        Returns:
+            float: The delay in seconds, None if the server asks for none.
+        """
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+
+        return min(retry_after, _MAX_RETRY_DELAY)
+
+
+def create_http_session(configuration: HttpSessionConfiguration) -> requests.Session:
+    """
+    Creates a session keeping connections open between requests, retrying transient failures
+    and accepting compressed responses. The timeouts are passed with each request, see get_timeout.
+
+    Args:
+        configuration (HttpSessionConfiguration): The connection settings.
+
+    Returns:
+        requests.Session: The pooled session, to be closed by the caller.
+    """
+    retry = _CappedRetry(
+        total = configuration.max_retries,
+        backoff_factor = configuration.retry_backoff,
+        backoff_max = _MAX_RETRY_DELAY,
+        status_forcelist = RETRIED_STATUSES,
+        allowed_methods = ["GET", "HEAD"],
+        respect_retry_after_header = True,
+        # the last response is returned, the caller reports its status
+        raise_on_status = False
+    )
+    adapter = HTTPAdapter(
+        pool_connections = configuration.max_hosts,
+        pool_maxsize = configuration.max_connections_per_host,
+        max_retries = retry
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    session.headers["Accept-Encoding"] = get_accepted_encodings()
+    if configuration.user_agent:
+        session.headers["User-Agent"] = configuration.user_agent
+
+    return session
+
+
+def get_timeout(configuration: HttpSessionConfiguration) -> Tuple[float, float]:
+    """
+    Gives the timeouts of a request made through a session.
+
+    Args:
+        configuration (HttpSessionConfiguration): The connection settings.
+
+    Returns:
+        Tuple[float, float]: The connect and read timeouts in seconds.
+    """
+    return (configuration.connect_timeout, configuration.read_timeout)
+
+
+def get_retry_delay(configuration: HttpSessionConfiguration, retry_count: int, headers: Dict[str, str]) -> float:
+    """
+    Gives the time to wait before retrying a request answered with a transient error status,
+    the delay the server asks for in its Retry-After header or else an exponential backoff.
+
+    Args:
+        configuration (HttpSessionConfiguration): The connection settings.
+        retry_count (int): The number of retries already made for the request.
+        headers (Dict[str, str]): The HTTP response headers, looked up case-insensitively.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    delay = configuration.retry_backoff * (2 ** retry_count)
+
+    # the server gives either a number of seconds or an HTTP date
+    retry_after = headers.get("Retry-After", "").strip()
+    if retry_after.isdigit():
+        delay = float(retry_after)
+    elif retry_after:
+        try:
+            delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+        except (TypeError, ValueError):
+            pass
+
+    return min(max(delay, 0), _MAX_RETRY_DELAY)
+
+
+def create_async_http_client(configuration: HttpSessionConfiguration) -> httpx.AsyncClient:
+    """
+    Creates an asynchronous client keeping connections open between requests and accepting compressed responses.
+    Only failed connections are retried by the client, transient error statuses are retried by the caller
+    with get_retry_delay. The client is bound to the event loop it is first used in.
+
+    Args:
+        configuration (HttpSessionConfiguration): The connection settings.
+
+    Returns:
+        httpx.AsyncClient: The pooled client, to be closed by the caller.
+    """
+    headers = {"Accept-Encoding": get_accepted_encodings()}
+    if configuration.user_agent:
+        headers["User-Agent"] = configuration.user_agent
+
+    return httpx.AsyncClient(
+        headers = headers,
+        follow_redirects = True,
+        timeout = httpx.Timeout(configuration.read_timeout, connect = configuration.connect_timeout),
+        limits = httpx.Limits(
+            max_connections = configuration.max_hosts * configuration.max_connections_per_host,
+            max_keepalive_connections = configuration.max_hosts
+        ),
+        transport = httpx.AsyncHTTPTransport(retries = configuration.max_retries)
+    )
+
+
+# The number of bytes read from the network at once when a page is streamed
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ContentReader:
+    """
+    Decodes a page as it is streamed from the network, computing its content address along the way.
+    Pages of a type which is not allowed are refused before their body is read,
+    and the download is aborted as soon as a page exceeds the maximum size.
+    """
+
+    def __init__(self, url: str, headers: Dict[str, str], encoding: str, configuration: HttpSessionConfiguration):
+        """
+        Checks the response headers and prepares to read the body.
+
+        Args:
+            url (str): The URL of the page.
+            headers (Dict[str, str]): The HTTP response headers, looked up case-insensitively.
+            encoding (str, optional): The character encoding of the page, UTF-8 if unknown.
+            configuration (HttpSessionConfiguration): The connection settings, including the size and type limits.
+
+        Raises:
+            Exception: If the type of the page is not allowed, or its announced size exceeds the maximum size.
+        """
+        self._url = url
+        self._max_content_size = configuration.max_content_size
+
+        content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and (content_type not in configuration.allowed_content_types):
+            raise Exception(f"Refused content from {url}. Content type: {content_type}")
+
+        # the announced size is the compressed one, the decompressed size is checked while reading
+        content_length = headers.get("Content-Length", "")
+        if content_length.isdigit() and (int(content_length) > self._max_content_size):
+            raise Exception(f"Refused content from {url}. Size: {content_length} bytes, maximum: {self._max_content_size} bytes")
+
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding if encoding else "utf-8")(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        self._size = 0
+        self._parts = []
+        self._hash = hashlib.sha256()
+
+    def _add_text(self, text: str) -> None:
+        """
+        Appends decoded text to the content and to its hash.
+
+        Args:
+            text (str): The decoded text.
+        """
+        if text:
+            self._parts.append(text)
+            # the hash is the one of the UTF-8 content, as computed by the blob store
+            self._hash.update(text.encode("utf-8"))
+
+    def feed(self, data: bytes) -> None:
+        """
+        Reads the next chunk of the body.
+
+        Args:
+            data (bytes): The decompressed chunk.
+
+        Raises:
+            Exception: If the page exceeds the maximum size.
+        """
+        self._size = self._size + len(data)
+        if self._size > self._max_content_size:
+            raise Exception(f"Aborted retrieving content from {self._url}. Size exceeds {self._max_content_size} bytes")
+
+        self._add_text(self._decoder.decode(data))
+
+    def finish(self) -> Tuple[str, str]:
+        """
+        Completes the reading of the body.
+
+        Returns:
+            Tuple[str, str]: The content of the page and the hexadecimal SHA-256 hash of its UTF-8 encoding.
+        """
+        self._add_text(self._decoder.decode(b"", final=True))
+
+        return ("".join(self._parts), self._hash.hexdigest())
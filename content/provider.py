@@ -1,7 +1,10 @@
+import asyncio
 
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Type
 from abc import ABC, abstractmethod
 
+from tools.library.shared_instances import SharedInstanceRegistry
+
 
 class ContentProvider(ABC):
     """
@@ -12,12 +15,13 @@ class ContentProvider(ABC):
     """
 
     @abstractmethod
-    def retrieve(self, identifier: str) -> Tuple[Dict[str, any], str]:
+    def retrieve(self, identifier: str, refresh: bool = False) -> Tuple[Dict[str, any], str]:
         """
         Obtains the content and associated properties for the provided identifier.
 
         Args:
             identifier (str): The location identifier for the resource.
+            refresh (bool): Whether cached content is checked against the source instead of being served as is.
 
         Returns:
             Tuple[Dict[str, any], str]: A tuple containing the document metadata and document content.
@@ -27,6 +31,23 @@ class ContentProvider(ABC):
         """
         raise NotImplementedError
 
+    async def aretrieve(self, identifier: str, refresh: bool = False) -> Tuple[Dict[str, any], str]:
+        """
+        Obtains the content and associated properties for the provided identifier without blocking the event loop.
+        Runs retrieve in a worker thread unless the implementation provides a native asynchronous retrieval.
+
+        Args:
+            identifier (str): The location identifier for the resource.
+            refresh (bool): Whether cached content is checked against the source instead of being served as is.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the document metadata and document content.
+
+        Raises:
+            Exception: If the content cannot be obtained from the source.
+        """
+        return await asyncio.to_thread(self.retrieve, identifier, refresh)
+
     @staticmethod
     def get_implementation() -> 'ContentProvider':
         """
@@ -39,3 +60,36 @@ class ContentProvider(ABC):
         import content.web_content_provider
         return content.web_content_provider.WebContentProvider()
 
+    def close(self) -> None:
+        """
+        Releases the resources held by the content provider, the instance must not be used afterwards.
+        """
+        pass
+
+    @staticmethod
+    def acquire(provider_class: Type['ContentProvider']) -> 'ContentProvider':
+        """
+        Obtains the instance of the given content provider shared by the whole process, creating it on first use.
+        Every acquisition must be paired with a call to release.
+
+        Args:
+            provider_class (Type[ContentProvider]): The concrete content provider class.
+
+        Returns:
+            ContentProvider: The shared content provider instance.
+        """
+        return _CONTENT_PROVIDER_REGISTRY.acquire(provider_class, provider_class)
+
+    @staticmethod
+    def release(content_provider: 'ContentProvider') -> None:
+        """
+        Releases a shared content provider, which stays open for later acquisitions until the process exits.
+
+        Args:
+            content_provider (ContentProvider): The instance obtained through acquire.
+        """
+        _CONTENT_PROVIDER_REGISTRY.release(content_provider)
+
+
+# The content provider instances shared by the whole process, keyed by their class
+_CONTENT_PROVIDER_REGISTRY = SharedInstanceRegistry()
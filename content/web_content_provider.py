@@ -1,12 +1,26 @@
-import requests
-import re
+import asyncio
+import contextlib
+import contextvars
+import httpx
+import logging
+import weakref
 
-from typing import Dict, Tuple
+from typing import AsyncIterator, Dict, List, Tuple
+from urllib.parse import urlsplit
 from datetime import datetime
 from document_database import DocumentDatabase
 
 from content.provider import ContentProvider
-from document_database import DocumentDatabase
+from content.http_session import RETRIED_STATUSES, STREAM_CHUNK_SIZE, ContentReader, HttpSessionConfiguration
+from content.http_session import create_async_http_client, create_http_session, get_retry_delay, get_timeout
+from storage.blob_store import BlobStore
+from storage.metadata_index import MetadataIndex
+from storage.retention_document_database import RetentionPolicy
+from tools.library.html_metadata import extract_html_metadata
+from tools.library.main_content import MAIN_CONTENT_CONVERTER_VERSION, extract_main_content
+
+# The asynchronous clients opened by async_http_client for the code awaited in their block, keyed by provider
+_ASYNC_HTTP_CLIENTS = contextvars.ContextVar("async_http_clients", default=None)
 
 class WebContentProvider(ContentProvider):
     """
@@ -14,20 +28,327 @@ class WebContentProvider(ContentProvider):
     """
     
     _DOCUMENT_STORAGE = "./0_0_2_cache/0_0_1_raw"
+
+    # Raw pages are cheap to fetch again, keep them for a month at most
+    _DOCUMENT_STORAGE_RETENTION_POLICY = RetentionPolicy(
+        max_age = 30 * 24 * 60 * 60,
+        max_size = 1024 * 1024 * 1024,
+        max_entries = 10_000,
+        eviction = RetentionPolicy.EVICTION_LRU
+    )
+
+    # Raw pages are selected by the time the server reports for them
+    _DOCUMENT_STORAGE_METADATA_INDEXES = {
+        "time": MetadataIndex.KIND_TIME
+    }
+    
+    # The main content of the pages converted to Markdown, keyed by page content hash and converter version
+    _MAIN_CONTENT_STORAGE = "./0_0_2_cache/0_0_1_raw_main_content"
+
+    # Converted pages are produced again from the raw pages when needed, the most used ones are kept
+    _MAIN_CONTENT_STORAGE_RETENTION_POLICY = RetentionPolicy(
+        max_size = 256 * 1024 * 1024,
+        max_entries = 10_000,
+        eviction = RetentionPolicy.EVICTION_LRU
+    )
+
+    _DEFAULT_HTTP_CONFIGURATION = HttpSessionConfiguration()
     
-    def __init__(self):
+    def __init__(self, http_configuration: HttpSessionConfiguration = None):
         """
         Initializes the content provider system.
+
+        Args:
+            http_configuration (HttpSessionConfiguration, optional): The timeouts, retries and connection limits 
+                used to fetch the pages instead of the default ones.
         """
         super().__init__()
-        self._document_database = DocumentDatabase.get_implementation(self._DOCUMENT_STORAGE)
+        self._document_database = DocumentDatabase.acquire(
+            self._DOCUMENT_STORAGE, 
+            retention_policy = self._DOCUMENT_STORAGE_RETENTION_POLICY,
+            metadata_indexes = self._DOCUMENT_STORAGE_METADATA_INDEXES
+        )
+        self._main_content_database = DocumentDatabase.acquire(
+            self._MAIN_CONTENT_STORAGE,
+            retention_policy = self._MAIN_CONTENT_STORAGE_RETENTION_POLICY
+        )
+
+        # Connections are kept open and reused by all the retrievals made through the provider
+        self._http_configuration = http_configuration if http_configuration else self._DEFAULT_HTTP_CONFIGURATION
+        self._http_session = create_http_session(self._http_configuration)
+
+        # Semaphores are bound to an event loop, they are kept per running loop and go away with it
+        self._async_host_semaphores = weakref.WeakKeyDictionary()
+
+    @contextlib.asynccontextmanager
+    async def async_http_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Opens a pooled asynchronous HTTP client, used by all the retrievals of the provider awaited in the block
+        and closed when leaving it, so its connections never outlive the event loop they belong to.
+        Retrievals awaited outside of such a block use a client of their own, closed once they are done.
+
+        Yields:
+            httpx.AsyncClient: The client.
+        """
+        async with create_async_http_client(self._http_configuration) as client:
+            token = _ASYNC_HTTP_CLIENTS.set({**(_ASYNC_HTTP_CLIENTS.get() or {}), self: client})
+            try:
+                yield client
+            finally:
+                _ASYNC_HTTP_CLIENTS.reset(token)
+
+    def _get_async_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """
+        Obtains the semaphore bounding the number of requests in flight to the server of a page in the running event loop.
+        The connection pool of the client is only bounded overall, a single server could otherwise take all of it.
+
+        Args:
+            url (str): The location identifier for the resource.
+
+        Returns:
+            asyncio.Semaphore: The semaphore of the server.
+        """
+        host_semaphores = self._async_host_semaphores.setdefault(asyncio.get_running_loop(), {})
+
+        host = urlsplit(url).netloc
+        if host not in host_semaphores:
+            host_semaphores[host] = asyncio.Semaphore(self._http_configuration.max_connections_per_host)
+
+        return host_semaphores[host]
+
+    def close(self) -> None:
+        """
+        Closes the HTTP connections and releases the shared document databases used by the provider.
+        Asynchronous clients are closed by the blocks which opened them.
+        """
+        self._http_session.close()
+        self._async_host_semaphores.clear()
+
+        DocumentDatabase.release(self._document_database)
+        DocumentDatabase.release(self._main_content_database)
+
+    def _build_metadata(self, content: str, headers: Dict[str, str], content_hash: str) -> Dict[str, any]:
+        """
+        Extracts the document properties from a retrieved page.
+
+        Args:
+            content (str): The HTML content of the page.
+            headers (Dict[str, str]): The HTTP response headers, looked up case-insensitively.
+            content_hash (str): The SHA-256 hash of the content, computed while it was downloaded.
+
+        Returns:
+            Dict[str, any]: The title, the time, the validators and the content hash of the page,
+            with the description, authors, keywords, dates and canonical URL the page declares.
+        """
+        # Derive document properties from the page head and structured data
+        metadata = extract_html_metadata(content)
+        if 'title' not in metadata:
+            metadata['title'] = "Untitled"
+
+        # Derive timestamp from source information
+        if 'Last-Modified' in headers:
+            metadata['time'] = headers['Last-Modified']
+        elif 'Date' in headers:
+            metadata['time'] = headers['Date']
+        else:
+            metadata['time'] = str(datetime.now())
+
+        # Keep the validators allowing to check later whether the page changed
+        if 'ETag' in headers:
+            metadata['etag'] = headers['ETag']
+        if 'Last-Modified' in headers:
+            metadata['last_modified'] = headers['Last-Modified']
+
+        # The hash tells whether a page sent again changed, without reading the cached one
+        metadata['content_hash'] = content_hash
+
+        return metadata
+
+    def _fetch(self, url: str, headers: Dict[str, str] = None) -> Tuple[int, Dict[str, any], str]:
+        """
+        Downloads a page, streaming its body so oversized pages and pages of other types are abandoned early.
+
+        Args:
+            url (str): The location identifier for the resource.
+            headers (Dict[str, str], optional): Additional request headers.
+
+        Returns:
+            Tuple[int, Dict[str, any], str]: The HTTP status, then the metadata and the content of the page,
+            both None unless the status is 200.
+
+        Raises:
+            Exception: If the page is not of an allowed type or exceeds the maximum size.
+        """
+        with self._http_session.get(url, headers=headers, timeout=get_timeout(self._http_configuration), stream=True) as response:
+            if response.status_code != 200:
+                return (response.status_code, None, None)
+
+            content_reader = ContentReader(url, response.headers, response.encoding, self._http_configuration)
+            for data in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                content_reader.feed(data)
+            content, content_hash = content_reader.finish()
+
+            return (response.status_code, self._build_metadata(content, response.headers, content_hash), content)
+
+    async def _afetch(self, url: str, headers: Dict[str, str] = None, client: httpx.AsyncClient = None) -> Tuple[int, Dict[str, any], str]:
+        """
+        Downloads a page with the asynchronous client of the provider, streaming its body 
+        so oversized pages and pages of other types are abandoned early.
+        Transient error statuses are retried like the synchronous session does, after the delay
+        the server asks for or an exponential backoff, and each server gets a bounded number of requests at once.
+
+        Args:
+            url (str): The location identifier for the resource.
+            headers (Dict[str, str], optional): Additional request headers.
+            client (httpx.AsyncClient, optional): The client to use instead of the one opened by async_http_client.
+
+        Returns:
+            Tuple[int, Dict[str, any], str]: The HTTP status, then the metadata and the content of the page,
+            both None unless the status is 200.
+
+        Raises:
+            Exception: If the page is not of an allowed type or exceeds the maximum size.
+        """
+        if client is None:
+            client = (_ASYNC_HTTP_CLIENTS.get() or {}).get(self)
+        if client is None:
+            async with self.async_http_client() as client:
+                return await self._afetch(url, headers, client)
+
+        host_semaphore = self._get_async_host_semaphore(url)
+
+        retry_count = 0
+        while True:
+            # the slot of the server is not held while waiting to retry
+            async with host_semaphore:
+                async with client.stream("GET", url, headers=headers) as response:
+                    if (response.status_code in RETRIED_STATUSES) and (retry_count < self._http_configuration.max_retries):
+                        delay = get_retry_delay(self._http_configuration, retry_count, response.headers)
+                    elif response.status_code != 200:
+                        return (response.status_code, None, None)
+                    else:
+                        content_reader = ContentReader(url, response.headers, response.encoding, self._http_configuration)
+                        async for data in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                            content_reader.feed(data)
+                        content, content_hash = content_reader.finish()
+
+                        return (response.status_code, self._build_metadata(content, response.headers, content_hash), content)
+
+            logging.info(f"Retrying {url} in {delay:.1f}s. Status: {response.status_code}")
+            await asyncio.sleep(delay)
+            retry_count = retry_count + 1
+
+    def _get_conditional_headers(self, metadata: Dict[str, any]) -> Dict[str, str]:
+        """
+        Builds the headers asking the server to send the page only if it changed since it was cached.
+
+        Args:
+            metadata (Dict[str, any]): The metadata of the cached page.
+
+        Returns:
+            Dict[str, str]: The If-None-Match and If-Modified-Since headers, for the validators the server provided.
+        """
+        headers = {}
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+
+        return headers
+
+    def _store_revalidated(self, url: str, status_code: int, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Updates the cached page with the answer of the server to a conditional request.
+
+        Args:
+            url (str): The location identifier for the resource.
+            status_code (int): The HTTP status of the answer.
+            metadata (Dict[str, any]): The metadata of the page sent again, None when the page did not change.
+            content (str): The content of the page sent again, None when the page did not change.
+
+        Returns:
+            bool: True if the cached page was replaced, False if it was still current.
+
+        Raises:
+            Exception: If the server answered with an error.
+        """
+        # The server confirmed the cached page is current without sending it again,
+        # it is stored again so it does not expire while it is still current
+        if status_code == 304:
+            cached_metadata, cached_content = self._document_database.get(url)
+            self._document_database.replace(url, cached_metadata, cached_content)
+            return False
+
+        if status_code != 200:
+            raise Exception(f"Failed to revalidate content from {url}. Status: {status_code}")
+
+        cached_metadata = self._document_database.get_metadata(url)
+        if cached_metadata.get('content_hash'):
+            unchanged = cached_metadata['content_hash'] == metadata['content_hash']
+        else:
+            # pages cached before their hash was recorded are compared in full
+            unchanged = self._document_database.get(url)[1] == content
+
+        # Servers without validators send the page again, it is only reported as replaced if it changed
+        changed = not (unchanged and all(metadata.get(key) == cached_metadata.get(key) for key in ('etag', 'last_modified')))
+        self._document_database.replace(url, metadata, content)
+
+        return changed
+
+    def revalidate(self, url: str) -> bool:
+        """
+        Checks with the server whether a cached page changed, replacing it if so.
+        The page is only transferred again when it changed or the server provided no validators.
+
+        Args:
+            url (str): The location identifier for the resource.
+
+        Returns:
+            bool: True if the cached page was replaced or is no longer cached, False if it was still current.
+
+        Raises:
+            Exception: If the server answered with an error.
+        """
+        # a page no longer cached cannot be current, it is retrieved again when needed
+        if not self._document_database.has(url):
+            return True
+
+        cached_metadata = self._document_database.get_metadata(url)
+
+        status_code, metadata, content = self._fetch(url, self._get_conditional_headers(cached_metadata))
+
+        return self._store_revalidated(url, status_code, metadata, content)
+
+    async def arevalidate(self, url: str) -> bool:
+        """
+        Checks with the server whether a cached page changed, replacing it if so, without blocking the event loop.
+
+        Args:
+            url (str): The location identifier for the resource.
 
-    def retrieve(self, url: str) -> Tuple[Dict[str, any], str]:
+        Returns:
+            bool: True if the cached page was replaced or is no longer cached, False if it was still current.
+
+        Raises:
+            Exception: If the server answered with an error.
+        """
+        # a page no longer cached cannot be current, it is retrieved again when needed
+        if not await self._document_database.ahas(url):
+            return True
+
+        cached_metadata = await asyncio.to_thread(self._document_database.get_metadata, url)
+
+        status_code, metadata, content = await self._afetch(url, self._get_conditional_headers(cached_metadata))
+
+        return await asyncio.to_thread(self._store_revalidated, url, status_code, metadata, content)
+
+    def retrieve(self, url: str, refresh: bool = False) -> Tuple[Dict[str, any], str]:
         """
         Obtains the content and associated properties for the provided URL.
 
         Args:
             url (str): The location identifier for the resource.
+            refresh (bool): Whether a cached page is revalidated with the server instead of being served as is.
 
         Returns:
             Tuple[Dict[str, any], str]: A tuple containing the document metadata and document content.
@@ -37,35 +358,277 @@ class WebContentProvider(ContentProvider):
         """
         # Check for existing record
         if self._document_database.has(url):
+            if refresh:
+                try:
+                    self.revalidate(url)
+                except Exception as e:
+                    # the cached page is better than no page while the server is unreachable
+                    logging.warning(f"Failed to revalidate {url}, serving the cached page: {e}")
             return self._document_database.get(url)
 
         # Acquire content from remote source
-        response = requests.get(url)
+        status_code, metadata, content = self._fetch(url)
         
-        if response.status_code == 200:
-            content = response.text
-            
-            # Prepare metadata container
-            metadata = {}
+        if status_code == 200:
+            # Store content and metadata for future access,
+            # keeping the stored version if another process has been faster
+            if not self._document_database.insert_if_absent(url, metadata, content):
+                return self._document_database.get(url)
             
-            # Derive document title from content
-            title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE | re.DOTALL)
-            if title_match:
-                metadata['title'] = title_match.group(1).strip()
-            else:
-                metadata['title'] = "Untitled"
-
-            # Derive timestamp from source information
-            if 'Last-Modified' in response.headers:
-                metadata['time'] = response.headers['Last-Modified']
-            elif 'Date' in response.headers:
-                metadata['time'] = response.headers['Date']
-            else:
-                metadata['time'] = str(datetime.now())
-
-            # Store content and metadata for future access
-            self._document_database.insert(url, metadata, content)
+            return (metadata, content)
+        else:
+            raise Exception(f"Failed to retrieve content from {url}. Status: {status_code}")
+
+    async def aretrieve(self, url: str, refresh: bool = False) -> Tuple[Dict[str, any], str]:
+        """
+        Obtains the content and associated properties for the provided URL without blocking the event loop.
+        The page is fetched with non-blocking pooled HTTP, the cache is accessed from worker threads.
+
+        Args:
+            url (str): The location identifier for the resource.
+            refresh (bool): Whether a cached page is revalidated with the server instead of being served as is.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the document metadata and document content.
+
+        Raises:
+            Exception: If the content cannot be obtained from the source.
+        """
+        # Check for existing record
+        if await self._document_database.ahas(url):
+            if refresh:
+                try:
+                    await self.arevalidate(url)
+                except Exception as e:
+                    # the cached page is better than no page while the server is unreachable
+                    logging.warning(f"Failed to revalidate {url}, serving the cached page: {e}")
+            return await self._document_database.aget(url)
+
+        # Acquire content from remote source
+        status_code, metadata, content = await self._afetch(url)
+
+        if status_code == 200:
+            # Store content and metadata for future access,
+            # keeping the stored version if another process has been faster
+            if not await self._document_database.ainsert_if_absent(url, metadata, content):
+                return await self._document_database.aget(url)
             
             return (metadata, content)
         else:
-            raise Exception(f"Failed to retrieve content from {url}. Status: {response.status_code}")
+            raise Exception(f"Failed to retrieve content from {url}. Status: {status_code}")
+
+    async def aprefetch(
+        self, 
+        urls: List[str], 
+        max_concurrency: int = 32, 
+        max_concurrency_per_host: int = 2, 
+        politeness_delay: float = 0.25,
+        batch_size: int = 50
+    ) -> Dict[str, str]:
+        """
+        Downloads all the pages not yet cached concurrently, so later retrievals are served from the cache.
+        Each server receives a bounded number of requests at once, spaced by the politeness delay,
+        and the downloaded pages are stored in batches while the others are still being fetched.
+        The pages are downloaded with a client of their own, closed once they are all downloaded.
+
+        Args:
+            urls (List[str]): The location identifiers of the resources.
+            max_concurrency (int): The number of pages downloaded at once overall.
+            max_concurrency_per_host (int): The number of pages downloaded at once from the same server.
+            politeness_delay (float): The minimum number of seconds between two requests to the same server.
+            batch_size (int): The maximum number of pages stored at once.
+
+        Returns:
+            Dict[str, str]: The reason of the failure of each page which could not be downloaded, keyed by URL.
+        """
+        urls = list(dict.fromkeys(urls))
+        cached_urls = await asyncio.to_thread(self._document_database.has_many, urls)
+        urls = [url for url in urls if not cached_urls[url]]
+
+        event_loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        host_semaphores = {}
+        host_locks = {}
+        host_next_request_times = {}
+        for url in urls:
+            host = urlsplit(url).netloc
+            host_semaphores.setdefault(host, asyncio.Semaphore(max_concurrency_per_host))
+            host_locks.setdefault(host, asyncio.Lock())
+            host_next_request_times.setdefault(host, 0.0)
+
+        failures = {}
+        # the downloaded pages waiting to be stored, None marks the end of the downloads
+        documents_queue = asyncio.Queue()
+
+        async def fetch(url: str) -> None:
+            host = urlsplit(url).netloc
+            async with host_semaphores[host]:
+                # space the requests to the same server, without holding a global slot while waiting
+                async with host_locks[host]:
+                    delay = host_next_request_times[host] - event_loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    host_next_request_times[host] = event_loop.time() + politeness_delay
+
+                async with semaphore:
+                    try:
+                        status_code, metadata, content = await self._afetch(url, client = client)
+                        if status_code != 200:
+                            raise Exception(f"Failed to retrieve content from {url}. Status: {status_code}")
+                    except Exception as e:
+                        failures[url] = str(e)
+                        return
+
+            await documents_queue.put((url, metadata, content))
+
+        async def store() -> None:
+            finished = False
+            while not finished:
+                # take whatever else is already downloaded, up to a batch
+                documents = [await documents_queue.get()]
+                while (len(documents) < batch_size) and (not documents_queue.empty()):
+                    documents.append(documents_queue.get_nowait())
+
+                if documents[-1] is None:
+                    documents.pop()
+                    finished = True
+
+                if documents:
+                    await self._astore_prefetched(documents, failures)
+
+        store_task = asyncio.create_task(store())
+        try:
+            async with self.async_http_client() as client:
+                await asyncio.gather(*[fetch(url) for url in urls])
+        finally:
+            await documents_queue.put(None)
+            await store_task
+
+        logging.info(f"Prefetched {len(urls) - len(failures)} pages, {len(cached_urls) - len(urls)} already cached, {len(failures)} failed")
+
+        return failures
+
+    async def _astore_prefetched(self, documents: List[Tuple[str, Dict[str, any], str]], failures: Dict[str, str]) -> None:
+        """
+        Stores a batch of downloaded pages, keeping the versions other processes may have stored meanwhile.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each page.
+            failures (Dict[str, str]): The failures of the prefetch, completed with the pages which could not be stored.
+        """
+        cached_urls = await asyncio.to_thread(self._document_database.has_many, [url for url, _, _ in documents])
+        documents = [document for document in documents if not cached_urls[document[0]]]
+
+        try:
+            await self._document_database.ainsert_many(documents)
+        except Exception:
+            # another process stored some of the pages meanwhile, the others are stored one by one
+            for url, metadata, content in documents:
+                try:
+                    await self._document_database.ainsert_if_absent(url, metadata, content)
+                except Exception as e:
+                    failures[url] = str(e)
+
+    def _get_cached_main_content(self, url: str) -> Tuple[Dict[str, any], str]:
+        """
+        Reads the main content of a cached page as already converted, without reading the page itself.
+
+        Args:
+            url (str): The location identifier for the resource.
+
+        Returns:
+            Tuple[Dict[str, any], str]: The page metadata and its main content in Markdown, 
+            None if the page or its conversion by the current converter is not cached.
+        """
+        if not self._document_database.has(url):
+            return None
+
+        # pages cached before their hash was recorded are read to compute it
+        metadata = self._document_database.get_metadata(url)
+        if not metadata.get('content_hash'):
+            return None
+
+        main_content_key = metadata['content_hash'] + "/" + MAIN_CONTENT_CONVERTER_VERSION
+        if not self._main_content_database.has(main_content_key):
+            return None
+
+        return (metadata, self._main_content_database.get(main_content_key)[1])
+
+    def _convert_main_content(self, url: str, metadata: Dict[str, any], content: str) -> str:
+        """
+        Converts the main content of a page to Markdown, unless the same content was already converted by the current converter.
+
+        Args:
+            url (str): The location identifier for the resource.
+            metadata (Dict[str, any]): The metadata of the page.
+            content (str): The HTML content of the page.
+
+        Returns:
+            str: The main content of the page in Markdown.
+        """
+        content_hash = metadata.get('content_hash') or BlobStore.get_hash(content)
+        main_content_key = content_hash + "/" + MAIN_CONTENT_CONVERTER_VERSION
+        if self._main_content_database.has(main_content_key):
+            return self._main_content_database.get(main_content_key)[1]
+
+        main_content, statistics = extract_main_content(content)
+
+        reduction = 1 - statistics["markdown_characters"] / max(statistics["html_characters"], 1)
+        logging.info(
+            f"Extracted the main content of {url}: {statistics['html_characters']} to {statistics['markdown_characters']} characters, "
+            f"about {statistics['html_tokens']} to {statistics['markdown_tokens']} tokens ({reduction:.0%} less)"
+        )
+
+        # the same content reached through another URL may have been converted meanwhile
+        statistics['converter'] = MAIN_CONTENT_CONVERTER_VERSION
+        self._main_content_database.insert_if_absent(main_content_key, statistics, main_content)
+
+        return main_content
+
+    def retrieve_main_content(self, url: str, refresh: bool = False) -> Tuple[Dict[str, any], str]:
+        """
+        Obtains the main content of the page at the provided URL, converted to Markdown, and the page metadata.
+        Conversions are cached, a page is only converted again when its content or the converter changes.
+
+        Args:
+            url (str): The location identifier for the resource.
+            refresh (bool): Whether a cached page is revalidated with the server instead of being served as is.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the page metadata and its main content in Markdown.
+
+        Raises:
+            Exception: If the content cannot be obtained from the source.
+        """
+        if not refresh:
+            cached_main_content = self._get_cached_main_content(url)
+            if cached_main_content is not None:
+                return cached_main_content
+
+        metadata, content = self.retrieve(url, refresh)
+
+        return (metadata, self._convert_main_content(url, metadata, content))
+
+    async def aretrieve_main_content(self, url: str, refresh: bool = False) -> Tuple[Dict[str, any], str]:
+        """
+        Obtains the main content of the page at the provided URL, converted to Markdown, and the page metadata,
+        without blocking the event loop. The conversion runs in a worker thread.
+
+        Args:
+            url (str): The location identifier for the resource.
+            refresh (bool): Whether a cached page is revalidated with the server instead of being served as is.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the page metadata and its main content in Markdown.
+
+        Raises:
+            Exception: If the content cannot be obtained from the source.
+        """
+        if not refresh:
+            cached_main_content = await asyncio.to_thread(self._get_cached_main_content, url)
+            if cached_main_content is not None:
+                return cached_main_content
+
+        metadata, content = await self.aretrieve(url, refresh)
+
+        return (metadata, await asyncio.to_thread(self._convert_main_content, url, metadata, content))
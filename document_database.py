@@ -1,8 +1,22 @@
+import asyncio
+import copy
+import io
 import os
+import json
+import sqlite3
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Tuple
-from tinydb import TinyDB, Query
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, TextIO, Tuple
+from collections import Counter
 from uuid import uuid4
+from tinydb import TinyDB
+from tinydb.storages import Storage
+
+from storage.blob_store import BlobStore
+from storage.file_lock import FileLock
+from tools.library.shared_instances import SharedInstanceRegistry
 
 class DocumentDatabase(ABC):
     """
@@ -15,10 +29,27 @@ class DocumentDatabase(ABC):
     # Internal configuration constants for storage keys and file names
     _DOCUMENT_DATABASE_CONTENT = "content"
     _DOCUMENT_DATABASE_FILE = "index.json"
+    _DOCUMENT_DATABASE_SQLITE_FILE = "index.sqlite"
+    _DOCUMENT_DATABASE_LOCK_FILE = ".lock"
+
+    # Environment variables selecting and configuring the concrete implementation
+    _IMPLEMENTATION_ENVIRONMENT_VARIABLE = "DOCUMENT_DATABASE_IMPLEMENTATION"
+    _SQLITE_INLINE_CONTENT_ENVIRONMENT_VARIABLE = "DOCUMENT_DATABASE_SQLITE_INLINE_CONTENT"
+    _CACHE_SIZE_ENVIRONMENT_VARIABLE = "DOCUMENT_DATABASE_CACHE_SIZE"
+
+    _DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+    _IMPLEMENTATION_TINYDB = "tinydb"
+    _IMPLEMENTATION_SQLITE = "sqlite"
+
+    # The number of threads reading or writing content blobs during batch operations
+    _BLOB_WORKER_COUNT = 8
 
     _KEY_ID = "id"
     _KEY_FILE_NAME = "file_name"
     _KEY_METADATA = "metadata"
+    _KEY_INSERTED_AT = "inserted_at"
+    _KEY_SIZE = "size"
 
     def __init__(self, database_directory: str):
         """
@@ -59,152 +90,1469 @@ class DocumentDatabase(ABC):
         """
         raise NotImplementedError
 
-    @staticmethod
-    def get_implementation(database_directory: str) -> 'DocumentDatabase':
+    @abstractmethod
+    def get_metadata(self, key: str) -> Dict[str, any]:
         """
-        Factory method to obtain the active database instance.
+        Retrieves a document's metadata without reading its content.
 
         Args:
-            database_directory (str): The filesystem path where documents and indices will be stored.
+            key (str): The unique identifier of the document.
 
         Returns:
-            DocumentDatabase: An instance of the concrete database implementation.
+            Dict[str, any]: The metadata dictionary.
+
+        Raises:
+            Exception: If the document identifier does not exist.
         """
-        return _TinyDBDocumentDatabase(database_directory)
+        raise NotImplementedError
 
-    
-class _TinyDBDocumentDatabase(DocumentDatabase) :
-    """
-    Concrete implementation of the DocumentDatabase interface.
-    """
+    @abstractmethod
+    def get_stream(self, key: str) -> BinaryIO:
+        """
+        Opens a document's raw content for streaming reads, without loading it into memory.
 
-    def __init__(self, database_directory: str):
+        Args:
+            key (str): The unique identifier of the document.
+
+        Returns:
+            BinaryIO: A binary file-like object yielding the UTF-8 encoded content, to be closed by the caller.
+
+        Raises:
+            Exception: If the document identifier does not exist.
         """
-        Initializes the persistence layer using the configured directory.
-        
-        Ensures the required directory structure exists and establishes 
-        a connection to the data index.
+        raise NotImplementedError
+
+    def open_content(self, key: str) -> TextIO:
+        """
+        Opens a document's raw content as a text stream, e.g. to read only its head.
 
         Args:
-            database_directory (str): The filesystem path where documents and indices will be stored.
+            key (str): The unique identifier of the document.
+
+        Returns:
+            TextIO: A text file-like object yielding the content, to be closed by the caller.
+
+        Raises:
+            Exception: If the document identifier does not exist.
         """
-        super().__init__(database_directory)
-        
-        # Ensure the root database directory exists
-        if not os.path.exists(self._database_directory):
-            os.makedirs(self._database_directory)
+        return io.TextIOWrapper(self.get_stream(key), encoding="utf-8")
+
+    @abstractmethod
+    def insert(self, key: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores a document's metadata and raw content under the given identifier.
+
+        Args:
+            key (str): The unique identifier of the document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Raises:
+            Exception: If the document identifier already exists.
+        """
+        raise NotImplementedError
+
+    def insert_if_absent(self, key: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores a document unless the identifier already exists, as a single atomic step.
+        Use it instead of has() followed by insert() when other processes share the database.
+
+        Args:
+            key (str): The unique identifier of the document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            bool: True if the document was stored, False if the identifier already existed.
+        """
+        if self.has(key):
+            return False
         
-        # Ensure the content subdirectory exists
-        if not os.path.exists(self._database_directory + "/" + self._DOCUMENT_DATABASE_CONTENT):
-            os.makedirs(self._database_directory + "/" + self._DOCUMENT_DATABASE_CONTENT)
+        self.insert(key, metadata, content)
+        return True
+
+    def replace(self, key: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores a document in place of its current version if any, renewing its insertion time.
+        No other writer gets between the deletion and the insertion. The document is deleted and
+        inserted through this database, so every decorator in front of the store sees the change.
+
+        Args:
+            key (str): The unique identifier of the document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+        """
+        with self._write_lock:
+            if self.has(key):
+                self.delete(key)
+            self.insert(key, metadata, content)
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Removes a document from the persistence layer.
+        The stored content is released once no other document references it.
+
+        Args:
+            key (str): The unique identifier of the document.
+
+        Raises:
+            Exception: If the document identifier does not exist.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_inserted_time(self, key: str) -> float:
+        """
+        Retrieves the time a document was stored.
+
+        Args:
+            key (str): The unique identifier of the document.
+
+        Returns:
+            float: The time the document was inserted as a POSIX timestamp.
+
+        Raises:
+            Exception: If the document identifier does not exist.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_storage_information(self) -> Dict[str, Dict[str, any]]:
+        """
+        Describes how every document is stored, for housekeeping purposes.
+        This reads the whole index and the size of every content blob.
+
+        Returns:
+            Dict[str, Dict[str, any]]: The content file name (None for inline content), 
+            the insertion time and the stored content size in bytes of each document, keyed by identifier.
+        """
+        raise NotImplementedError
+
+    def remove_orphaned_content(self) -> int:
+        """
+        Deletes the content blobs no document references anymore, 
+        e.g. those left behind by interrupted inserts or older versions of the database.
+
+        Returns:
+            int: The number of blobs deleted.
+        """
+        with self._write_lock:
+            storage_information = self.get_storage_information()
+            referenced_file_names = {information[self._KEY_FILE_NAME] for information in storage_information.values()}
             
-        # Establish the connection to the internal storage handler
-        self._db = TinyDB(self._database_directory + "/" + self._DOCUMENT_DATABASE_FILE)
+            orphaned_file_names = [key for key in self._blob_store.list_keys() if key not in referenced_file_names]
+            for file_name in orphaned_file_names:
+                self._blob_store.delete(file_name)
 
-    def _get_database(self) -> TinyDB:
+        return len(orphaned_file_names)
+
+    def _get_fallback_inserted_time(self, file_name: str) -> float:
         """
-        Retrieves the internal storage handler.
+        Estimates the insertion time of documents stored before it was recorded.
+
+        Args:
+            file_name (str): The content file name of the document, None for inline content.
 
         Returns:
-            TinyDB: The active handle to the internal storage mechanism.
+            float: The time the content was written, or the current time if unknown.
         """
-        return self._db
+        if (file_name is not None) and self._blob_store.has(file_name):
+            return self._blob_store.get_modification_time(file_name)
+        
+        return time.time()
 
-    def _get_query_by_id(self, id: str) -> Query:
+    def has_many(self, keys: List[str]) -> Dict[str, bool]:
         """
-        Constructs a query object to locate a record by its unique ID.
+        Determines which of the given documents exist in the persistence layer.
 
         Args:
-            id (str): The unique identifier to filter by.
+            keys (List[str]): The unique identifiers of the documents.
 
         Returns:
-            Query: A configured query object targeting the specified ID.
+            Dict[str, bool]: The existence of each document, keyed by identifier.
         """
-        query = Query()
-        return query[self._KEY_ID]
+        return {key: self.has(key) for key in keys}
 
-    def has(self, id: str) -> bool:
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[Dict[str, any], str]]:
         """
-        Checks if the document identifier is currently stored.
+        Retrieves the metadata and raw content of several documents.
+        Identifiers which do not exist are left out of the result.
 
         Args:
-            id (str): The unique identifier of the document.
+            keys (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            Dict[str, Tuple[Dict[str, any], str]]: The metadata and content of each stored document, keyed by identifier.
+        """
+        return {key: self.get(key) for key in keys if self.has(key)}
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several documents at once.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+
+        Raises:
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
+        """
+        for key, metadata, content in documents:
+            self.insert(key, metadata, content)
+
+    def delete_many(self, keys: List[str]) -> None:
+        """
+        Removes several documents at once.
+
+        Args:
+            keys (List[str]): The unique identifiers of the documents.
+
+        Raises:
+            Exception: If any of the document identifiers does not exist.
+        """
+        for key in keys:
+            self.delete(key)
+
+    async def ahas(self, key: str) -> bool:
+        """
+        Determines if a document exists without blocking the event loop.
+
+        Args:
+            key (str): The unique identifier of the document.
 
         Returns:
             bool: True if the document exists, False otherwise.
         """
-        database = self._get_database()
-        query = self._get_query_by_id(id)
-        results = database.search(query == id)
-        
-        return len(results) != 0
+        return await asyncio.to_thread(self.has, key)
 
-    def get(self, id: str) -> Tuple[Dict[str, any], str]:
+    async def aget(self, key: str) -> Tuple[Dict[str, any], str]:
         """
-        Retrieves the stored document and its properties based on the identifier.
+        Retrieves a document's metadata and raw content without blocking the event loop.
 
         Args:
-            id (str): The unique identifier of the document.
+            key (str): The unique identifier of the document.
 
         Returns:
             Tuple[Dict[str, any], str]: A tuple containing the metadata dictionary and the raw content string.
-            
+
         Raises:
-            Exception: If the provided identifier matches no existing record.
+            Exception: If the document identifier does not exist.
         """
-        database = self._get_database()
-        query = self._get_query_by_id(id)
-        results = database.search(query == id)
-        
-        # Ensure the record exists before proceeding
-        if len(results) == 0:
-            raise Exception(f"Document is not in the database for id {id}")
-        
-        result = results[0]
-        file_name = result[self._KEY_FILE_NAME]
-        
-        # Retrieve the content associated with the record using the configured path
-        content = None
-        with open(self._database_directory + "/" + self._DOCUMENT_DATABASE_CONTENT + "/" + file_name, "r",  encoding='utf-8') as f:
-            content = f.read()
-        metadata = result[self._KEY_METADATA]
-        
-        return (metadata, content)
+        return await asyncio.to_thread(self.get, key)
 
-    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+    async def aget_many(self, keys: List[str]) -> Dict[str, Tuple[Dict[str, any], str]]:
         """
-        Stores the provided content and metadata, associating them with the 
-        given identifier for future retrieval.
+        Retrieves several documents without blocking the event loop.
 
         Args:
-            id (str): The unique identifier to assign to this document.
+            keys (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            Dict[str, Tuple[Dict[str, any], str]]: The metadata and content of each stored document, keyed by identifier.
+        """
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def ainsert(self, key: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores a new document and its metadata without blocking the event loop.
+
+        Args:
+            key (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Raises:
+            Exception: If the document identifier already exists.
+        """
+        await asyncio.to_thread(self.insert, key, metadata, content)
+
+    async def ainsert_if_absent(self, key: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores a new document unless the identifier is already registered, without blocking the event loop.
+
+        Args:
+            key (str): The unique identifier to assign to this document.
             metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
             content (str): The raw text content to be stored.
 
         Returns:
-            None
+            bool: True if the document was stored, False if the identifier already existed.
+        """
+        return await asyncio.to_thread(self.insert_if_absent, key, metadata, content)
+
+    async def ainsert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several new documents without blocking the event loop.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
 
         Raises:
-            Exception: If the provided identifier is already registered in the system.
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
         """
-        # Guard clause to prevent duplicate entries
-        if self.has(id):
-            raise Exception(f"Document is already in the database for id {id}")
-        
-        database = self._get_database()
-        # Generate a unique internal reference
-        file_name = str(uuid4())
-        
-        # Write the content to the configured storage path
-        with open(self._database_directory + "/" + self._DOCUMENT_DATABASE_CONTENT + "/" + file_name, "w", encoding="utf-8") as f:
-            f.write(content)
+        await asyncio.to_thread(self.insert_many, documents)
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, any]]:
+        """
+        Finds the passages of the stored documents best matching a query.
+        Only available when the database was opened with full-text search enabled.
+
+        Args:
+            query (str): The free text query.
+            k (int): The maximum number of passages returned.
+
+        Returns:
+            List[Dict[str, any]]: The best passages first, each with its document identifier ("id"),
+            its position in the document ("position"), its text ("passage") and its score ("score").
+
+        Raises:
+            Exception: If full-text search is not enabled for the database.
+        """
+        raise Exception(f"Full-text search is not enabled for the database at {self._database_directory}")
+
+    def find(self, terms: Dict[str, str] = None, time_ranges: Dict[str, Tuple[float, float]] = None) -> List[str]:
+        """
+        Finds the documents matching all the given conditions through the metadata indexes.
+        Only available when the database was opened with metadata indexes declared.
+
+        Args:
+            terms (Dict[str, str], optional): The term each document must have, keyed by metadata property.
+            time_ranges (Dict[str, Tuple[float, float]], optional): The range of POSIX timestamps,
+                start included and end excluded, each document must be in, keyed by metadata property.
+                Either bound may be None to leave the range open.
+
+        Returns:
+            List[str]: The unique identifiers of the matching documents, most recently inserted first.
+
+        Raises:
+            Exception: If no metadata index is declared for the database, or none of the required kind for a property.
+        """
+        raise Exception(f"No metadata index is declared for the database at {self._database_directory}")
+
+    def search_similar(self, queries: List[str], k: int = 5) -> List[List[Dict[str, any]]]:
+        """
+        Finds the chunks of the stored documents semantically closest to each of several queries.
+        Only available when the database was opened with an embedding function.
+
+        Args:
+            queries (List[str]): The free text queries, searched together in a single pass.
+            k (int): The maximum number of chunks returned per query.
+
+        Returns:
+            List[List[Dict[str, any]]]: For each query, the closest chunks first, each with its document identifier ("id"),
+            its position in the document ("position"), its text ("chunk") and its cosine similarity ("score").
+
+        Raises:
+            Exception: If no embedding function is configured for the database.
+        """
+        raise Exception(f"Vector search is not enabled for the database at {self._database_directory}")
+
+    def close(self) -> None:
+        """
+        Releases the resources held by the database, the instance must not be used afterwards.
+        """
+        pass
+
+    def _check_new_keys(self, keys: List[str]) -> None:
+        """
+        Ensures a batch of identifiers can be inserted.
+
+        Args:
+            keys (List[str]): The unique identifiers of the documents to insert.
+
+        Raises:
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
+        """
+        if len(set(keys)) != len(keys):
+            raise Exception("Documents are repeated in the batch")
+
+        existing_keys = [key for key, exists in self.has_many(keys).items() if exists]
+        if existing_keys:
+            raise Exception(f"Documents are already in the database for ids {existing_keys}")
+
+    def _put_blobs(self, contents: List[str]) -> List[str]:
+        """
+        Writes several contents to the blob store in parallel.
+
+        Args:
+            contents (List[str]): The contents to store.
+
+        Returns:
+            List[str]: The blob keys, in the order of the contents.
+        """
+        with ThreadPoolExecutor(max_workers=self._BLOB_WORKER_COUNT) as executor:
+            return list(executor.map(self._blob_store.put, contents))
+
+    def _get_blobs(self, file_names: List[str]) -> List[str]:
+        """
+        Reads several contents from the blob store in parallel.
+
+        Args:
+            file_names (List[str]): The blob keys to read.
+
+        Returns:
+            List[str]: The contents, in the order of the keys.
+        """
+        with ThreadPoolExecutor(max_workers=self._BLOB_WORKER_COUNT) as executor:
+            return list(executor.map(self._blob_store.get, file_names))
+
+    def _open_blob_store(self) -> BlobStore:
+        """
+        Ensures the database directory exists and opens the content blob store.
+
+        Returns:
+            BlobStore: The store holding the document content.
+        """
+        # Ensure the root database directory exists
+        if not os.path.exists(self._database_directory):
+            os.makedirs(self._database_directory)
         
-        document_record = {}
-        document_record[self._KEY_ID] = id
-        document_record[self._KEY_FILE_NAME] = file_name
+        return BlobStore(self._database_directory + "/" + self._DOCUMENT_DATABASE_CONTENT)
 
-        # Ensure metadata is a dictionary before storage
-        stored_metadata = metadata if metadata else {}
-        document_record[self._KEY_METADATA] = stored_metadata
+    def _open_write_lock(self) -> FileLock:
+        """
+        Creates the lock serializing writers across all the processes sharing the database directory.
+        Content blobs are shared between documents, so their reference counting must happen under this lock as well.
+
+        Returns:
+            FileLock: The inter-process write lock of the database.
+        """
+        return FileLock(self._database_directory + "/" + self._DOCUMENT_DATABASE_LOCK_FILE)
+
+    @staticmethod
+    def get_implementation(
+        database_directory: str, 
+        implementation: str = None, 
+        cache_size: int = None, 
+        retention_policy: 'RetentionPolicy' = None,
+        searchable: bool = False,
+        metadata_indexes: Dict[str, str] = None,
+        embedding_function: 'EmbeddingFunction' = None
+    ) -> 'DocumentDatabase':
+        """
+        Factory method to obtain the active database instance.
+
+        Unless explicitly requested, the implementation is selected by the DOCUMENT_DATABASE_IMPLEMENTATION 
+        environment variable ("tinydb" or "sqlite"), TinyDB being the default.
+        The database is wrapped in an in-memory read cache whose budget is set by the 
+        DOCUMENT_DATABASE_CACHE_SIZE environment variable (in bytes, 0 disables the cache)
+        and, when a retention policy is given, in the enforcement of that policy.
+        Searchable databases maintain a full-text index over their documents, queried through search.
+        Declared metadata indexes are maintained on insert and queried through find.
+        With an embedding function, chunks of the documents are embedded on insert and queried through search_similar.
+
+        Args:
+            database_directory (str): The filesystem path where documents and indices will be stored.
+            implementation (str, optional): The implementation to use instead of the configured one.
+            cache_size (int, optional): The read cache budget in bytes to use instead of the configured one.
+            retention_policy (RetentionPolicy, optional): The age and size limits applied to the stored documents.
+            searchable (bool): Whether the documents are indexed for full-text search.
+            metadata_indexes (Dict[str, str], optional): The kind of index ("term" or "time") of each indexed metadata property.
+            embedding_function (EmbeddingFunction, optional): The embedding of the chunks indexed for vector search.
+
+        Returns:
+            DocumentDatabase: An instance of the concrete database implementation.
+
+        Raises:
+            Exception: If the configured implementation is not known.
+        """
+        if implementation is None:
+            implementation = os.environ.get(
+                DocumentDatabase._IMPLEMENTATION_ENVIRONMENT_VARIABLE, 
+                DocumentDatabase._IMPLEMENTATION_TINYDB
+            )
+        implementation = implementation.strip().lower()
+
+        if cache_size is None:
+            cache_size = int(os.environ.get(
+                DocumentDatabase._CACHE_SIZE_ENVIRONMENT_VARIABLE, 
+                DocumentDatabase._DEFAULT_CACHE_SIZE
+            ))
+
+        if implementation == DocumentDatabase._IMPLEMENTATION_TINYDB:
+            document_database = _TinyDBDocumentDatabase(database_directory)
+        elif implementation == DocumentDatabase._IMPLEMENTATION_SQLITE:
+            inline_content = os.environ.get(
+                DocumentDatabase._SQLITE_INLINE_CONTENT_ENVIRONMENT_VARIABLE, "false"
+            ).strip().lower() in ("1", "true", "yes")
+            document_database = _SQLiteDocumentDatabase(database_directory, inline_content)
+        else:
+            raise Exception(f"Unknown document database implementation {implementation}")
+
+        # the indexes sit right above the storage so documents evicted by the retention leave them as well
+        if metadata_indexes:
+            import storage.indexed_document_database
+            document_database = storage.indexed_document_database.IndexedDocumentDatabase(document_database, metadata_indexes)
+
+        if searchable:
+            import storage.searchable_document_database
+            document_database = storage.searchable_document_database.SearchableDocumentDatabase(document_database)
+
+        if embedding_function is not None:
+            import storage.vector_document_database
+            document_database = storage.vector_document_database.VectorDocumentDatabase(document_database, embedding_function)
+
+        if cache_size > 0:
+            import storage.caching_document_database
+            document_database = storage.caching_document_database.CachingDocumentDatabase(document_database, cache_size)
+
+        if retention_policy is not None:
+            import storage.retention_document_database
+            document_database = storage.retention_document_database.RetentionDocumentDatabase(document_database, retention_policy)
+
+        return document_database
+
+
+    @staticmethod
+    def acquire(
+        database_directory: str, 
+        retention_policy: 'RetentionPolicy' = None, 
+        searchable: bool = False,
+        metadata_indexes: Dict[str, str] = None,
+        embedding_function: 'EmbeddingFunction' = None
+    ) -> 'DocumentDatabase':
+        """
+        Obtains the database instance shared by the whole process for the given directory, 
+        opening it on first use. The settings of the first acquisition apply to all the later ones.
+        Every acquisition must be paired with a call to release.
+
+        Args:
+            database_directory (str): The filesystem path where documents and indices are stored.
+            retention_policy (RetentionPolicy, optional): The age and size limits applied to the stored documents.
+            searchable (bool): Whether the documents are indexed for full-text search.
+            metadata_indexes (Dict[str, str], optional): The kind of index ("term" or "time") of each indexed metadata property.
+            embedding_function (EmbeddingFunction, optional): The embedding of the chunks indexed for vector search.
+
+        Returns:
+            DocumentDatabase: The shared database instance.
+        """
+        return _DOCUMENT_DATABASE_REGISTRY.acquire(
+            os.path.abspath(database_directory),
+            lambda: DocumentDatabase.get_implementation(
+                database_directory, 
+                retention_policy = retention_policy, 
+                searchable = searchable,
+                metadata_indexes = metadata_indexes,
+                embedding_function = embedding_function
+            )
+        )
+
+    @staticmethod
+    def release(document_database: 'DocumentDatabase') -> None:
+        """
+        Releases a shared database instance, which stays open for later acquisitions until the process exits.
+
+        Args:
+            document_database (DocumentDatabase): The instance obtained through acquire.
+        """
+        _DOCUMENT_DATABASE_REGISTRY.release(document_database)
+
+
+# The database instances shared by the whole process, keyed by their directory
+_DOCUMENT_DATABASE_REGISTRY = SharedInstanceRegistry()
+
+
+class _AtomicJSONStorage(Storage):
+    """
+    TinyDB storage writing the JSON index to a temporary file which then replaces the index, 
+    so concurrent readers never observe a partially written index.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the storage for the given index file.
+
+        Args:
+            path (str): The filesystem path of the JSON index.
+        """
+        super().__init__()
+        self._path = path
+
+    def read(self) -> Dict[str, Dict[str, any]]:
+        """
+        Reads the whole index.
+
+        Returns:
+            Dict[str, Dict[str, any]]: The stored tables, or None if the index is empty.
+        """
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+
+        return json.loads(content) if content else None
+
+    def write(self, data: Dict[str, Dict[str, any]]) -> None:
+        """
+        Atomically replaces the whole index.
+
+        Args:
+            data (Dict[str, Dict[str, any]]): The tables to store.
+        """
+        temporary_path = self._path + "." + str(uuid4()) + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, self._path)
+
+    
+class _TinyDBDocumentDatabase(DocumentDatabase) :
+    """
+    Concrete implementation of the DocumentDatabase interface.
+    """
+
+    def __init__(self, database_directory: str):
+        """
+        Initializes the persistence layer using the configured directory.
+        
+        Ensures the required directory structure exists and establishes 
+        a connection to the data index.
+
+        Args:
+            database_directory (str): The filesystem path where documents and indices will be stored.
+        """
+        super().__init__(database_directory)
+        self._blob_store = self._open_blob_store()
+        self._write_lock = self._open_write_lock()
+
+        # Establish the connection to the internal storage handler
+        # and build the in-memory hash index keyed on the document identifier
+        # together with the number of documents referencing each content blob,
+        # the maps being read and replaced under a lock shared by the threads using the instance
+        self._records_lock = threading.RLock()
+        self._db = None
+        self._index_signature = None
+        self._records = {}
+        self._document_ids = {}
+        self._references = Counter()
+        self._refresh()
+
+    def _get_database(self) -> TinyDB:
+        """
+        Retrieves the internal storage handler.
+
+        Returns:
+            TinyDB: The active handle to the internal storage mechanism.
+        """
+        return self._db
+
+    def _get_index_signature(self) -> Tuple[int, int, int]:
+        """
+        Identifies the current version of the persisted index.
+        The index is replaced on every write, so any write changes the signature.
+
+        Returns:
+            Tuple[int, int, int]: The inode, modification time and size of the index, or None if it does not exist.
+        """
+        try:
+            index_stat = os.stat(self._database_directory + "/" + self._DOCUMENT_DATABASE_FILE)
+        except FileNotFoundError:
+            return None
+        
+        return (index_stat.st_ino, index_stat.st_mtime_ns, index_stat.st_size)
+
+    def _refresh(self) -> None:
+        """
+        Reloads the in-memory index if another process has written the persisted index since it was loaded.
+        """
+        with self._records_lock:
+            index_signature = self._get_index_signature()
+            if (self._db is not None) and (index_signature == self._index_signature):
+                return
+
+            # a new handle is needed as TinyDB caches the next document id,
+            # the maps are built aside and swapped in together so readers never see them partially loaded
+            database = TinyDB(self._database_directory + "/" + self._DOCUMENT_DATABASE_FILE, storage=_AtomicJSONStorage)
+            records, document_ids, references = self._load_records(database)
+
+            self._db = database
+            self._records = records
+            self._document_ids = document_ids
+            self._references = references
+            self._index_signature = index_signature
+
+    def _load_records(self, database: TinyDB) -> Tuple[Dict[str, Dict[str, any]], Dict[str, int], Counter]:
+        """
+        Reads the persisted index once and maps every document identifier to its record.
+
+        Args:
+            database (TinyDB): The handle to the persisted index.
+
+        Returns:
+            Tuple[Dict[str, Dict[str, any]], Dict[str, int], Counter]: The record and the TinyDB document id
+            of each document identifier, and the number of documents referencing each content blob.
+        """
+        records = {}
+        document_ids = {}
+        references = Counter()
+        for record in database.all():
+            records[record[self._KEY_ID]] = dict(record)
+            document_ids[record[self._KEY_ID]] = record.doc_id
+            references[record[self._KEY_FILE_NAME]] += 1
+
+        return records, document_ids, references
+
+    def _get_record(self, id: str) -> Dict[str, any]:
+        """
+        Retrieves the up to date index record of a document.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Dict[str, any]: The record.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        with self._records_lock:
+            self._refresh()
+            result = self._records.get(id)
+
+        if result is None:
+            raise Exception(f"Document is not in the database for id {id}")
+
+        return result
+
+    def has(self, id: str) -> bool:
+        """
+        Checks if the document identifier is currently stored.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            bool: True if the document exists, False otherwise.
+        """
+        with self._records_lock:
+            self._refresh()
+            return id in self._records
+
+    def get(self, id: str) -> Tuple[Dict[str, any], str]:
+        """
+        Retrieves the stored document and its properties based on the identifier.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the metadata dictionary and the raw content string.
+            
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        # Ensure the record exists before proceeding
+        result = self._get_record(id)
+        
+        file_name = result[self._KEY_FILE_NAME]
+        
+        # Retrieve the content associated with the record from the blob store
+        content = self._blob_store.get(file_name)
+        # the records are shared by all the readers, callers get a copy of the metadata
+        metadata = copy.deepcopy(result[self._KEY_METADATA])
+        
+        return (metadata, content)
+
+    def get_metadata(self, id: str) -> Dict[str, any]:
+        """
+        Retrieves the stored properties of the document without reading its content.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Dict[str, any]: The metadata dictionary.
+            
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        return copy.deepcopy(self._get_record(id)[self._KEY_METADATA])
+
+    def get_stream(self, id: str) -> BinaryIO:
+        """
+        Opens the stored content of the document for streaming reads.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            BinaryIO: A binary file-like object yielding the UTF-8 encoded content.
+            
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        return self._blob_store.open(self._get_record(id)[self._KEY_FILE_NAME])
+
+    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores the provided content and metadata, associating them with the 
+        given identifier for future retrieval.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: If the provided identifier is already registered in the system.
+        """
+        with self._write_lock:
+            # Guard clause to prevent duplicate entries
+            if self.has(id):
+                raise Exception(f"Document is already in the database for id {id}")
+            
+            database = self._get_database()
+            # Identical content is stored only once
+            file_name = self._blob_store.put(content)
+            
+            document_record = {}
+            document_record[self._KEY_ID] = id
+            document_record[self._KEY_FILE_NAME] = file_name
+
+            # Ensure metadata is a dictionary before storage
+            stored_metadata = copy.deepcopy(metadata) if metadata else {}
+            document_record[self._KEY_METADATA] = stored_metadata
+            document_record[self._KEY_INSERTED_AT] = time.time()
+                
+            with self._records_lock:
+                self._document_ids[id] = database.insert(document_record)
+                self._records[id] = document_record
+                self._references[file_name] += 1
+                self._index_signature = self._get_index_signature()
+
+    def insert_if_absent(self, id: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores the provided content and metadata unless the identifier is already registered,
+        other processes being unable to insert the same identifier in between.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            bool: True if the document was stored, False if the identifier already existed.
+        """
+        with self._write_lock:
+            if self.has(id):
+                return False
+
+            self.insert(id, metadata, content)
+            return True
+
+    def get_many(self, ids: List[str]) -> Dict[str, Tuple[Dict[str, any], str]]:
+        """
+        Retrieves several stored documents, reading their content in parallel.
+        Identifiers which do not exist are left out of the result.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            Dict[str, Tuple[Dict[str, any], str]]: The metadata and content of each stored document, keyed by identifier.
+        """
+        with self._records_lock:
+            self._refresh()
+            results = [self._records[id] for id in dict.fromkeys(ids) if id in self._records]
+        contents = self._get_blobs([result[self._KEY_FILE_NAME] for result in results])
+
+        documents = {}
+        for result, content in zip(results, contents):
+            documents[result[self._KEY_ID]] = (copy.deepcopy(result[self._KEY_METADATA]), content)
+
+        return documents
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several documents, writing their content in parallel and the index only once.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+
+        Raises:
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
+        """
+        ids = [id for id, _, _ in documents]
+
+        with self._write_lock:
+            self._check_new_keys(ids)
+
+            file_names = self._put_blobs([content for _, _, content in documents])
+
+            inserted_at = time.time()
+            document_records = []
+            for (id, metadata, _), file_name in zip(documents, file_names):
+                document_records.append({
+                    self._KEY_ID: id,
+                    self._KEY_FILE_NAME: file_name,
+                    self._KEY_METADATA: copy.deepcopy(metadata) if metadata else {},
+                    self._KEY_INSERTED_AT: inserted_at
+                })
+
+            with self._records_lock:
+                database = self._get_database()
+                document_ids = database.insert_multiple(document_records)
+
+                for document_record, document_id in zip(document_records, document_ids):
+                    self._records[document_record[self._KEY_ID]] = document_record
+                    self._document_ids[document_record[self._KEY_ID]] = document_id
+                    self._references[document_record[self._KEY_FILE_NAME]] += 1
+                self._index_signature = self._get_index_signature()
+
+    def delete(self, id: str) -> None:
+        """
+        Removes the document, deleting its content once no other document references it.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        self.delete_many([id])
+
+    def delete_many(self, ids: List[str]) -> None:
+        """
+        Removes several documents, writing the index only once.
+        Their content is deleted once no other document references it.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Raises:
+            Exception: If any of the provided identifiers matches no existing record.
+        """
+        ids = list(dict.fromkeys(ids))
+
+        with self._write_lock, self._records_lock:
+            self._refresh()
+            missing_ids = [id for id in ids if id not in self._records]
+            if missing_ids:
+                raise Exception(f"Documents are not in the database for ids {missing_ids}")
+
+            database = self._get_database()
+            database.remove(doc_ids=[self._document_ids.pop(id) for id in ids])
+            self._index_signature = self._get_index_signature()
+
+            for id in ids:
+                record = self._records.pop(id)
+
+                file_name = record[self._KEY_FILE_NAME]
+                self._references[file_name] -= 1
+                if self._references[file_name] <= 0:
+                    del self._references[file_name]
+                    self._blob_store.delete(file_name)
+
+    def get_inserted_time(self, id: str) -> float:
+        """
+        Retrieves the time the document was stored.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            float: The time the document was inserted as a POSIX timestamp.
             
-        database.insert(document_record)
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        result = self._get_record(id)
+
+        inserted_at = result.get(self._KEY_INSERTED_AT)
+        if inserted_at is None:
+            inserted_at = self._get_fallback_inserted_time(result[self._KEY_FILE_NAME])
+        
+        return inserted_at
+
+    def get_storage_information(self) -> Dict[str, Dict[str, any]]:
+        """
+        Describes how every document is stored.
+
+        Returns:
+            Dict[str, Dict[str, any]]: The content file name, the insertion time 
+            and the stored content size in bytes of each document, keyed by identifier.
+        """
+        with self._records_lock:
+            self._refresh()
+            records = list(self._records.items())
+
+        storage_information = {}
+        for id, record in records:
+            file_name = record[self._KEY_FILE_NAME]
+            inserted_at = record.get(self._KEY_INSERTED_AT)
+            if inserted_at is None:
+                inserted_at = self._get_fallback_inserted_time(file_name)
+
+            storage_information[id] = {
+                self._KEY_FILE_NAME: file_name,
+                self._KEY_INSERTED_AT: inserted_at,
+                self._KEY_SIZE: self._blob_store.get_size(file_name) if self._blob_store.has(file_name) else 0
+            }
+
+        return storage_information
+
+    def close(self) -> None:
+        """
+        Closes the handle to the persisted index.
+        """
+        self._get_database().close()
+
+
+class _SQLiteDocumentDatabase(DocumentDatabase):
+    """
+    Concrete implementation of the DocumentDatabase interface backed by SQLite.
+
+    The index is kept in a WAL-mode SQLite file with the identifier as primary key,
+    so inserts and lookups do not depend on the number of stored documents.
+    The content is either kept inline in the index or written to the content subdirectory.
+    """
+
+    _TABLE_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            id TEXT PRIMARY KEY,
+            file_name TEXT,
+            content TEXT,
+            metadata TEXT NOT NULL CHECK (json_valid(metadata)),
+            inserted_at REAL
+        )
+    """
+
+    # Used to count the documents referencing a content blob
+    _FILE_NAME_INDEX_SCHEMA = """
+        CREATE INDEX IF NOT EXISTS documents_file_name ON documents (file_name)
+    """
+
+    # Stays below the default limit of SQLite host parameters per statement
+    _BATCH_PARAMETER_COUNT = 500
+
+    # Seconds to wait for other processes holding the database busy
+    _BUSY_TIMEOUT = 30
+
+    def __init__(self, database_directory: str, inline_content: bool = False):
+        """
+        Initializes the persistence layer using the configured directory.
+
+        Args:
+            database_directory (str): The filesystem path where documents and indices will be stored.
+            inline_content (bool): Whether new content is stored inside the index instead of separate files.
+        """
+        super().__init__(database_directory)
+        self._blob_store = self._open_blob_store()
+        self._inline_content = inline_content
+
+        self._write_lock = self._open_write_lock()
+
+        # A single connection is shared by the threads running the tools,
+        # other processes are waited for when they hold the database busy
+        self._connection_lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self._database_directory + "/" + self._DOCUMENT_DATABASE_SQLITE_FILE,
+            timeout=self._BUSY_TIMEOUT,
+            check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(self._TABLE_SCHEMA)
+            self._connection.execute(self._FILE_NAME_INDEX_SCHEMA)
+
+            # Indexes created before insertion times were recorded lack the column
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(documents)")]
+            if self._KEY_INSERTED_AT not in columns:
+                self._connection.execute("ALTER TABLE documents ADD COLUMN inserted_at REAL")
+
+    def _get_record(self, id: str) -> Tuple[str, str, str]:
+        """
+        Retrieves the stored row for the identifier.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Tuple[str, str, str]: The content file name, the inline content and the serialized metadata, or None.
+        """
+        with self._connection_lock:
+            cursor = self._connection.execute(
+                "SELECT file_name, content, metadata FROM documents WHERE id = ?", (id,)
+            )
+            return cursor.fetchone()
+
+    def has(self, id: str) -> bool:
+        """
+        Checks if the document identifier is currently stored.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            bool: True if the document exists, False otherwise.
+        """
+        with self._connection_lock:
+            cursor = self._connection.execute("SELECT 1 FROM documents WHERE id = ?", (id,))
+            return cursor.fetchone() is not None
+
+    def get(self, id: str) -> Tuple[Dict[str, any], str]:
+        """
+        Retrieves the stored document and its properties based on the identifier.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the metadata dictionary and the raw content string.
+            
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        record = self._get_record(id)
+        
+        # Ensure the record exists before proceeding
+        if record is None:
+            raise Exception(f"Document is not in the database for id {id}")
+
+        file_name, content, metadata = record
+        if file_name is not None:
+            content = self._blob_store.get(file_name)
+
+        return (json.loads(metadata), content)
+
+    def get_metadata(self, id: str) -> Dict[str, any]:
+        """
+        Retrieves the stored properties of the document without reading its content.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Dict[str, any]: The metadata dictionary.
+            
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        with self._connection_lock:
+            cursor = self._connection.execute("SELECT metadata FROM documents WHERE id = ?", (id,))
+            record = cursor.fetchone()
+
+        if record is None:
+            raise Exception(f"Document is not in the database for id {id}")
+
+        return json.loads(record[0])
+
+    def get_stream(self, id: str) -> BinaryIO:
+        """
+        Opens the stored content of the document for streaming reads.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            BinaryIO: A binary file-like object yielding the UTF-8 encoded content.
+            
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        with self._connection_lock:
+            cursor = self._connection.execute("SELECT file_name, content FROM documents WHERE id = ?", (id,))
+            record = cursor.fetchone()
+
+        if record is None:
+            raise Exception(f"Document is not in the database for id {id}")
+
+        file_name, content = record
+        if file_name is not None:
+            return self._blob_store.open(file_name)
+
+        # inline content is already in memory as part of the row
+        return io.BytesIO(content.encode("utf-8"))
+
+    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores the provided content and metadata, associating them with the 
+        given identifier for future retrieval.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: If the provided identifier is already registered in the system.
+        """
+        with self._write_lock:
+            # Guard clause to prevent duplicate entries
+            if self.has(id):
+                raise Exception(f"Document is already in the database for id {id}")
+
+            file_name = None
+            stored_content = content
+            if not self._inline_content:
+                # Identical content is stored only once
+                file_name = self._blob_store.put(content)
+                stored_content = None
+
+            # Ensure metadata is a dictionary before storage
+            stored_metadata = metadata if metadata else {}
+
+            with self._connection_lock, self._connection:
+                self._connection.execute(
+                    "INSERT INTO documents (id, file_name, content, metadata, inserted_at) VALUES (?, ?, ?, ?, ?)",
+                    (id, file_name, stored_content, json.dumps(stored_metadata), time.time())
+                )
+
+    def insert_if_absent(self, id: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores the provided content and metadata unless the identifier is already registered,
+        other processes being unable to insert the same identifier in between.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            bool: True if the document was stored, False if the identifier already existed.
+        """
+        with self._write_lock:
+            if self.has(id):
+                return False
+
+            self.insert(id, metadata, content)
+            return True
+
+    def delete(self, id: str) -> None:
+        """
+        Removes the document, deleting its content once no other document references it.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        self.delete_many([id])
+
+    def delete_many(self, ids: List[str]) -> None:
+        """
+        Removes several documents in a single transaction.
+        Their content is deleted once no other document references it.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Raises:
+            Exception: If any of the provided identifiers matches no existing record.
+        """
+        ids = list(dict.fromkeys(ids))
+
+        with self._write_lock:
+            records = self._get_records(ids)
+            if len(records) != len(ids):
+                stored_ids = {record[0] for record in records}
+                raise Exception(f"Documents are not in the database for ids {[id for id in ids if id not in stored_ids]}")
+
+            file_names = {record[1] for record in records if record[1] is not None}
+            unreferenced_file_names = []
+
+            with self._connection_lock, self._connection:
+                self._connection.executemany("DELETE FROM documents WHERE id = ?", [(id,) for id in ids])
+                for file_name in file_names:
+                    cursor = self._connection.execute("SELECT COUNT(*) FROM documents WHERE file_name = ?", (file_name,))
+                    if cursor.fetchone()[0] == 0:
+                        unreferenced_file_names.append(file_name)
+
+            for file_name in unreferenced_file_names:
+                self._blob_store.delete(file_name)
+
+    def get_inserted_time(self, id: str) -> float:
+        """
+        Retrieves the time the document was stored.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            float: The time the document was inserted as a POSIX timestamp.
+            
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        with self._connection_lock:
+            cursor = self._connection.execute("SELECT file_name, inserted_at FROM documents WHERE id = ?", (id,))
+            record = cursor.fetchone()
+
+        if record is None:
+            raise Exception(f"Document is not in the database for id {id}")
+
+        file_name, inserted_at = record
+        if inserted_at is None:
+            inserted_at = self._get_fallback_inserted_time(file_name)
+
+        return inserted_at
+
+    def get_storage_information(self) -> Dict[str, Dict[str, any]]:
+        """
+        Describes how every document is stored.
+
+        Returns:
+            Dict[str, Dict[str, any]]: The content file name (None for inline content), the insertion time 
+            and the stored content size in bytes of each document, keyed by identifier.
+        """
+        with self._connection_lock:
+            cursor = self._connection.execute(
+                "SELECT id, file_name, inserted_at, length(CAST(content AS BLOB)) FROM documents"
+            )
+            records = cursor.fetchall()
+
+        storage_information = {}
+        for id, file_name, inserted_at, inline_size in records:
+            if inserted_at is None:
+                inserted_at = self._get_fallback_inserted_time(file_name)
+
+            size = inline_size
+            if file_name is not None:
+                size = self._blob_store.get_size(file_name) if self._blob_store.has(file_name) else 0
+
+            storage_information[id] = {
+                self._KEY_FILE_NAME: file_name,
+                self._KEY_INSERTED_AT: inserted_at,
+                self._KEY_SIZE: size
+            }
+
+        return storage_information
+
+    def _get_records(self, ids: List[str]) -> List[Tuple[str, str, str, str]]:
+        """
+        Retrieves the stored rows for several identifiers, one query per batch of parameters.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            List[Tuple[str, str, str, str]]: The identifier, content file name, inline content and serialized metadata of the stored documents.
+        """
+        ids = list(dict.fromkeys(ids))
+        records = []
+
+        with self._connection_lock:
+            for start in range(0, len(ids), self._BATCH_PARAMETER_COUNT):
+                batch = ids[start:start + self._BATCH_PARAMETER_COUNT]
+                placeholders = ", ".join("?" * len(batch))
+                cursor = self._connection.execute(
+                    f"SELECT id, file_name, content, metadata FROM documents WHERE id IN ({placeholders})", batch
+                )
+                records.extend(cursor.fetchall())
+
+        return records
+
+    def has_many(self, ids: List[str]) -> Dict[str, bool]:
+        """
+        Determines which of the given documents are stored.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            Dict[str, bool]: The existence of each document, keyed by identifier.
+        """
+        existing_ids = set()
+        ids = list(dict.fromkeys(ids))
+
+        with self._connection_lock:
+            for start in range(0, len(ids), self._BATCH_PARAMETER_COUNT):
+                batch = ids[start:start + self._BATCH_PARAMETER_COUNT]
+                placeholders = ", ".join("?" * len(batch))
+                cursor = self._connection.execute(f"SELECT id FROM documents WHERE id IN ({placeholders})", batch)
+                existing_ids.update(row[0] for row in cursor.fetchall())
+
+        return {id: id in existing_ids for id in ids}
+
+    def get_many(self, ids: List[str]) -> Dict[str, Tuple[Dict[str, any], str]]:
+        """
+        Retrieves several stored documents, reading their content in parallel.
+        Identifiers which do not exist are left out of the result.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            Dict[str, Tuple[Dict[str, any], str]]: The metadata and content of each stored document, keyed by identifier.
+        """
+        records = self._get_records(ids)
+        stored_records = [record for record in records if record[1] is not None]
+        stored_contents = self._get_blobs([record[1] for record in stored_records])
+        contents = {record[0]: content for record, content in zip(stored_records, stored_contents)}
+
+        documents = {}
+        for id, file_name, content, metadata in records:
+            documents[id] = (json.loads(metadata), contents[id] if file_name is not None else content)
+
+        return documents
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several documents, writing their content in parallel and committing the index once.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+
+        Raises:
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
+        """
+        ids = [id for id, _, _ in documents]
+
+        with self._write_lock:
+            self._check_new_keys(ids)
+
+            contents = [content for _, _, content in documents]
+            file_names = [None] * len(documents)
+            if not self._inline_content:
+                file_names = self._put_blobs(contents)
+                contents = [None] * len(documents)
+
+            inserted_at = time.time()
+            rows = []
+            for (id, metadata, _), file_name, content in zip(documents, file_names, contents):
+                rows.append((id, file_name, content, json.dumps(metadata if metadata else {}), inserted_at))
+
+            with self._connection_lock, self._connection:
+                self._connection.executemany(
+                    "INSERT INTO documents (id, file_name, content, metadata, inserted_at) VALUES (?, ?, ?, ?, ?)", rows
+                )
+
+    def import_record(self, id: str, file_name: str, metadata: Dict[str, any]) -> bool:
+        """
+        Registers a document whose content already exists in the content subdirectory.
+        Used when migrating existing stores, the content file is reused as it is unless content is kept inline.
+
+        Args:
+            id (str): The unique identifier of the document.
+            file_name (str): The internal reference of the existing content file.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+
+        Returns:
+            bool: True if the document was imported, False if the identifier was already present.
+        """
+        content = None
+        if self._inline_content:
+            content = self._blob_store.get(file_name)
+            file_name = None
+
+        with self._write_lock, self._connection_lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO documents (id, file_name, content, metadata) VALUES (?, ?, ?, ?)",
+                (id, file_name, content, json.dumps(metadata if metadata else {}))
+            )
+            return cursor.rowcount == 1
+
+    def close(self) -> None:
+        """
+        Closes the connection to the SQLite index.
+        """
+        with self._connection_lock:
+            self._connection.close()
@@ -0,0 +1,278 @@
+import gzip
+import hashlib
+import os
+import time
+
+from typing import BinaryIO, List
+from uuid import uuid4
+
+# zstandard is optional, gzip from the standard library is used when it is missing
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class BlobStore:
+    """
+    Content-addressed storage for document content.
+
+    Every blob is identified by the SHA-256 hash of its content and compressed on disk, 
+    so identical content reached through different identifiers is stored only once.
+    Blobs written before content addressing was introduced (plain files named by a UUID)
+    remain readable through the same interface.
+    """
+
+    _ENCODING = "utf-8"
+
+    _SUFFIX_ZSTANDARD = ".zst"
+    _SUFFIX_GZIP = ".gz"
+
+    _SUFFIX_TEMPORARY = ".tmp"
+
+    _GZIP_COMPRESSION_LEVEL = 6
+    _ZSTANDARD_COMPRESSION_LEVEL = 10
+
+    # Temporary files older than this many seconds belong to interrupted writes
+    _TEMPORARY_FILE_MAX_AGE = 60 * 60
+
+    def __init__(self, blob_directory: str):
+        """
+        Initializes the blob store in the given directory.
+
+        Args:
+            blob_directory (str): The filesystem path where the blobs are stored.
+        """
+        self._blob_directory = blob_directory
+
+        if not os.path.exists(self._blob_directory):
+            os.makedirs(self._blob_directory)
+
+    def _get_path(self, key: str) -> str:
+        """
+        Resolves the filesystem path of a blob.
+
+        Args:
+            key (str): The key of the blob.
+
+        Returns:
+            str: The filesystem path of the blob.
+        """
+        return self._blob_directory + "/" + key
+
+    def _get_keys_for_hash(self, content_hash: str) -> List[str]:
+        """
+        Lists the keys under which content with the given hash may be stored, preferred codec first.
+
+        Args:
+            content_hash (str): The SHA-256 hash of the content.
+
+        Returns:
+            List[str]: The candidate keys for the hash.
+        """
+        prefix = content_hash[:2] + "/" + content_hash
+        suffixes = [self._SUFFIX_ZSTANDARD, self._SUFFIX_GZIP] if zstandard else [self._SUFFIX_GZIP, self._SUFFIX_ZSTANDARD]
+        
+        return [prefix + suffix for suffix in suffixes]
+
+    def _compress(self, data: bytes, key: str) -> bytes:
+        """
+        Compresses the data with the codec designated by the key suffix.
+
+        Args:
+            data (bytes): The uncompressed data.
+            key (str): The key of the blob.
+
+        Returns:
+            bytes: The compressed data.
+        """
+        if key.endswith(self._SUFFIX_ZSTANDARD):
+            return zstandard.ZstdCompressor(level=self._ZSTANDARD_COMPRESSION_LEVEL).compress(data)
+        
+        return gzip.compress(data, compresslevel=self._GZIP_COMPRESSION_LEVEL)
+
+    def _decompress(self, data: bytes, key: str) -> bytes:
+        """
+        Decompresses the data with the codec designated by the key suffix.
+
+        Args:
+            data (bytes): The data as stored on disk.
+            key (str): The key of the blob.
+
+        Returns:
+            bytes: The uncompressed data.
+        """
+        if key.endswith(self._SUFFIX_ZSTANDARD):
+            if zstandard is None:
+                raise Exception(f"The zstandard package is required to read the blob {key}")
+            return zstandard.ZstdDecompressor().decompress(data)
+        
+        if key.endswith(self._SUFFIX_GZIP):
+            return gzip.decompress(data)
+        
+        # blobs without a codec suffix are stored uncompressed
+        return data
+
+    @staticmethod
+    def get_hash(content: str) -> str:
+        """
+        Computes the content address of the given content.
+
+        Args:
+            content (str): The content to hash.
+
+        Returns:
+            str: The hexadecimal SHA-256 hash of the content.
+        """
+        return hashlib.sha256(content.encode(BlobStore._ENCODING)).hexdigest()
+
+    def has(self, key: str) -> bool:
+        """
+        Checks if a blob is stored under the given key.
+
+        Args:
+            key (str): The key of the blob.
+
+        Returns:
+            bool: True if the blob exists, False otherwise.
+        """
+        return os.path.exists(self._get_path(key))
+
+    def put(self, content: str) -> str:
+        """
+        Stores the content unless identical content is already stored.
+
+        Args:
+            content (str): The content to store.
+
+        Returns:
+            str: The key under which the content can be retrieved.
+        """
+        data = content.encode(self._ENCODING)
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        # reuse any existing blob holding the same content
+        keys = self._get_keys_for_hash(content_hash)
+        for key in keys:
+            if self.has(key):
+                return key
+
+        key = keys[0]
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # write to a temporary file first so a blob is never observed half written
+        temporary_path = path + "." + str(uuid4()) + self._SUFFIX_TEMPORARY
+        with open(temporary_path, "wb") as f:
+            f.write(self._compress(data, key))
+        os.replace(temporary_path, path)
+
+        return key
+
+    def get(self, key: str) -> str:
+        """
+        Retrieves the content stored under the given key.
+
+        Args:
+            key (str): The key of the blob.
+
+        Returns:
+            str: The uncompressed content.
+
+        Raises:
+            Exception: If no blob is stored under the key.
+        """
+        if not self.has(key):
+            raise Exception(f"Blob is not in the store for key {key}")
+
+        with open(self._get_path(key), "rb") as f:
+            data = f.read()
+
+        return self._decompress(data, key).decode(self._ENCODING)
+
+    def open(self, key: str) -> BinaryIO:
+        """
+        Opens the blob stored under the given key for streaming reads.
+        The content is decompressed incrementally, it is never loaded into memory as a whole.
+
+        Args:
+            key (str): The key of the blob.
+
+        Returns:
+            BinaryIO: A binary file-like object yielding the uncompressed content, to be closed by the caller.
+
+        Raises:
+            Exception: If no blob is stored under the key.
+        """
+        if not self.has(key):
+            raise Exception(f"Blob is not in the store for key {key}")
+
+        path = self._get_path(key)
+
+        if key.endswith(self._SUFFIX_ZSTANDARD):
+            if zstandard is None:
+                raise Exception(f"The zstandard package is required to read the blob {key}")
+            return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        
+        if key.endswith(self._SUFFIX_GZIP):
+            return gzip.open(path, "rb")
+        
+        return open(path, "rb")
+
+    def delete(self, key: str) -> None:
+        """
+        Removes the blob stored under the given key.
+        The caller is responsible for ensuring no document references it anymore.
+
+        Args:
+            key (str): The key of the blob.
+        """
+        if self.has(key):
+            os.remove(self._get_path(key))
+
+    def get_size(self, key: str) -> int:
+        """
+        Retrieves the space taken on disk by a blob.
+
+        Args:
+            key (str): The key of the blob.
+
+        Returns:
+            int: The size of the stored, possibly compressed, blob in bytes.
+        """
+        return os.path.getsize(self._get_path(key))
+
+    def get_modification_time(self, key: str) -> float:
+        """
+        Retrieves the time a blob was last written.
+
+        Args:
+            key (str): The key of the blob.
+
+        Returns:
+            float: The modification time of the blob as a POSIX timestamp.
+        """
+        return os.path.getmtime(self._get_path(key))
+
+    def list_keys(self) -> List[str]:
+        """
+        Lists the keys of all the stored blobs.
+        Temporary files left behind by interrupted writes are removed along the way.
+
+        Returns:
+            List[str]: The keys of the stored blobs.
+        """
+        keys = []
+        now = time.time()
+
+        for directory, _, file_names in os.walk(self._blob_directory):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+
+                if file_name.endswith(self._SUFFIX_TEMPORARY):
+                    if now - os.path.getmtime(path) > self._TEMPORARY_FILE_MAX_AGE:
+                        os.remove(path)
+                    continue
+
+                keys.append(os.path.relpath(path, self._blob_directory).replace(os.sep, "/"))
+
+        return keys
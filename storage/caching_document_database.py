@@ -0,0 +1,349 @@
+import copy
+import io
+import sys
+import threading
+
+from collections import OrderedDict
+from typing import BinaryIO, Dict, List, Tuple
+
+from document_database import DocumentDatabase
+from storage.delegating_document_database import DelegatingDocumentDatabase
+
+class CachingDocumentDatabase(DelegatingDocumentDatabase):
+    """
+    Decorator keeping recently read documents of another DocumentDatabase in memory.
+
+    The cache is bounded by the memory taken by the cached content and evicts the
+    least recently used documents first. Documents are invalidated when they are
+    inserted or deleted through this instance, and every read checks the insertion time
+    of the document in the database, so documents replaced or deleted through other
+    instances or processes are not served from memory. Callers get copies of the cached metadata,
+    so changing them leaves the cache untouched.
+    """
+
+    def __init__(self, document_database: DocumentDatabase, cache_size: int):
+        """
+        Initializes the cache in front of the given database.
+
+        Args:
+            document_database (DocumentDatabase): The database whose reads are cached.
+            cache_size (int): The maximum number of bytes taken by the cached content.
+        """
+        super().__init__(document_database)
+        self._cache_size = cache_size
+
+        self._lock = threading.Lock()
+        self._documents = OrderedDict()
+        self._cached_size = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _get_inserted_time(self, id: str) -> float:
+        """
+        Reads the insertion time of a document from the database, which changes whenever the document is replaced.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            float: The POSIX timestamp of the insertion, or None if the document is not stored.
+        """
+        try:
+            return self._document_database.get_inserted_time(id)
+        except Exception:
+            return None
+
+    def _get_cached(self, id: str, inserted_time: float) -> Tuple[Dict[str, any], str, int, float]:
+        """
+        Retrieves a cached document still current in the database, discarding it otherwise.
+        The caller must hold the cache lock.
+
+        Args:
+            id (str): The unique identifier of the document.
+            inserted_time (float): The insertion time of the document in the database, None if it is not stored.
+
+        Returns:
+            Tuple[Dict[str, any], str, int, float]: The cached metadata, content, size and insertion time, or None.
+        """
+        document = self._documents.get(id)
+        if (document is not None) and (document[3] != inserted_time):
+            self._discard(id)
+            return None
+
+        return document
+
+    def _lookup(self, id: str, inserted_time: float) -> Tuple[Dict[str, any], str]:
+        """
+        Retrieves a cached document, marking it as the most recently used one.
+
+        Args:
+            id (str): The unique identifier of the document.
+            inserted_time (float): The insertion time of the document in the database, None if it is not stored.
+
+        Returns:
+            Tuple[Dict[str, any], str]: The cached metadata and content, or None if the document is not cached or outdated.
+        """
+        with self._lock:
+            document = self._get_cached(id, inserted_time)
+            if document is None:
+                self._misses = self._misses + 1
+                return None
+
+            self._documents.move_to_end(id)
+            self._hits = self._hits + 1
+
+            return copy.deepcopy(document[0]), document[1]
+
+    def _store(self, id: str, metadata: Dict[str, any], content: str, inserted_time: float) -> None:
+        """
+        Caches a document, evicting the least recently used ones to stay within the budget.
+
+        Args:
+            id (str): The unique identifier of the document.
+            metadata (Dict[str, any]): The metadata of the document.
+            content (str): The content of the document.
+            inserted_time (float): The insertion time of the document, read before the document itself.
+        """
+        size = sys.getsizeof(content)
+
+        # documents larger than the whole budget are never cached
+        if size > self._cache_size:
+            return
+
+        with self._lock:
+            self._discard(id)
+            self._documents[id] = (copy.deepcopy(metadata), content, size, inserted_time)
+            self._cached_size = self._cached_size + size
+
+            while self._cached_size > self._cache_size:
+                _, (_, _, evicted_size, _) = self._documents.popitem(last=False)
+                self._cached_size = self._cached_size - evicted_size
+                self._evictions = self._evictions + 1
+
+    def _discard(self, id: str) -> None:
+        """
+        Removes a document from the cache, the caller must hold the cache lock.
+
+        Args:
+            id (str): The unique identifier of the document.
+        """
+        document = self._documents.pop(id, None)
+        if document is not None:
+            self._cached_size = self._cached_size - document[2]
+
+    def invalidate(self, id: str = None) -> None:
+        """
+        Removes a document, or all the documents, from the cache.
+
+        Args:
+            id (str, optional): The unique identifier of the document, all documents are removed if omitted.
+        """
+        with self._lock:
+            if id is None:
+                self._documents.clear()
+                self._cached_size = 0
+            else:
+                self._discard(id)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Reports the cache usage since its creation.
+
+        Returns:
+            Dict[str, int]: The hit, miss and eviction counters, the cached documents and their size in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "documents": len(self._documents),
+                "size": self._cached_size
+            }
+
+    def has(self, id: str) -> bool:
+        """
+        Checks if the document identifier is currently stored.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            bool: True if the document exists, False otherwise.
+        """
+        # the document may have been deleted through another instance, only the database knows
+        return self._document_database.has(id)
+
+    def get(self, id: str) -> Tuple[Dict[str, any], str]:
+        """
+        Retrieves the document from memory, reading it from the database on a miss.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the metadata dictionary and the raw content string.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        # a document replaced meanwhile is cached with the older time, so it is read again next time
+        inserted_time = self._get_inserted_time(id)
+        document = self._lookup(id, inserted_time)
+        if document is not None:
+            return document
+
+        metadata, content = self._document_database.get(id)
+        self._store(id, metadata, content, inserted_time)
+
+        return (metadata, content)
+
+    def get_metadata(self, id: str) -> Dict[str, any]:
+        """
+        Retrieves the metadata of the document, from memory when it is cached.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Dict[str, any]: The metadata dictionary.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        inserted_time = self._get_inserted_time(id)
+        with self._lock:
+            document = self._get_cached(id, inserted_time)
+            if document is not None:
+                return copy.deepcopy(document[0])
+
+        return self._document_database.get_metadata(id)
+
+    def get_stream(self, id: str) -> BinaryIO:
+        """
+        Opens the content of the document for streaming reads, from memory when it is cached.
+        Streamed documents are not added to the cache.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            BinaryIO: A binary file-like object yielding the UTF-8 encoded content.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        inserted_time = self._get_inserted_time(id)
+        with self._lock:
+            document = self._get_cached(id, inserted_time)
+            if document is not None:
+                return io.BytesIO(document[1].encode("utf-8"))
+
+        return self._document_database.get_stream(id)
+
+    def get_many(self, ids: List[str]) -> Dict[str, Tuple[Dict[str, any], str]]:
+        """
+        Retrieves several documents, reading only the ones missing from memory from the database.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            Dict[str, Tuple[Dict[str, any], str]]: The metadata and content of each stored document, keyed by identifier.
+        """
+        documents = {}
+        missing_ids = []
+        inserted_times = {}
+        for id in dict.fromkeys(ids):
+            inserted_times[id] = self._get_inserted_time(id)
+            document = self._lookup(id, inserted_times[id])
+            if document is None:
+                missing_ids.append(id)
+            else:
+                documents[id] = document
+
+        for id, (metadata, content) in self._document_database.get_many(missing_ids).items():
+            self._store(id, metadata, content, inserted_times[id])
+            documents[id] = (metadata, content)
+
+        return documents
+
+    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores the document in the database and invalidates its cached version.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Raises:
+            Exception: If the provided identifier is already registered in the system.
+        """
+        self.invalidate(id)
+        self._document_database.insert(id, metadata, content)
+
+    def insert_if_absent(self, id: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores the document unless the identifier is already registered, invalidating its cached version.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            bool: True if the document was stored, False if the identifier already existed.
+        """
+        self.invalidate(id)
+        return self._document_database.insert_if_absent(id, metadata, content)
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several documents in the database and invalidates their cached versions.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+
+        Raises:
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
+        """
+        for id, _, _ in documents:
+            self.invalidate(id)
+        self._document_database.insert_many(documents)
+
+    def delete(self, id: str) -> None:
+        """
+        Removes the document from the database and from memory.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        self.invalidate(id)
+        self._document_database.delete(id)
+
+    def delete_many(self, ids: List[str]) -> None:
+        """
+        Removes several documents from the database and from memory.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Raises:
+            Exception: If any of the provided identifiers matches no existing record.
+        """
+        for id in ids:
+            self.invalidate(id)
+        self._document_database.delete_many(ids)
+
+    def close(self) -> None:
+        """
+        Drops the cached documents and closes the underlying database.
+        """
+        self.invalidate()
+        self._document_database.close()
@@ -0,0 +1,78 @@
+from typing import BinaryIO, Dict, List, Tuple
+
+from document_database import DocumentDatabase
+
+class DelegatingDocumentDatabase(DocumentDatabase):
+    """
+    Base of the decorators of a DocumentDatabase, forwarding every operation to the wrapped database.
+    Decorators only override the operations they change, a new operation of the interface
+    is forwarded here once for all of them. Operations built on the others, like replace,
+    are not forwarded, so they go through every decorator.
+    """
+
+    def __init__(self, document_database: DocumentDatabase):
+        """
+        Initializes the decorator in front of the given database.
+
+        Args:
+            document_database (DocumentDatabase): The wrapped database.
+        """
+        super().__init__(document_database._database_directory)
+        self._document_database = document_database
+
+        # a second lock on the same file would block this process on itself, the decorators share the one of the database
+        self._write_lock = document_database._write_lock
+
+    def has(self, id: str) -> bool:
+        return self._document_database.has(id)
+
+    def get(self, id: str) -> Tuple[Dict[str, any], str]:
+        return self._document_database.get(id)
+
+    def get_metadata(self, id: str) -> Dict[str, any]:
+        return self._document_database.get_metadata(id)
+
+    def get_stream(self, id: str) -> BinaryIO:
+        return self._document_database.get_stream(id)
+
+    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+        self._document_database.insert(id, metadata, content)
+
+    def insert_if_absent(self, id: str, metadata: Dict[str, any], content: str) -> bool:
+        return self._document_database.insert_if_absent(id, metadata, content)
+
+    def delete(self, id: str) -> None:
+        self._document_database.delete(id)
+
+    def get_inserted_time(self, id: str) -> float:
+        return self._document_database.get_inserted_time(id)
+
+    def get_storage_information(self) -> Dict[str, Dict[str, any]]:
+        return self._document_database.get_storage_information()
+
+    def remove_orphaned_content(self) -> int:
+        return self._document_database.remove_orphaned_content()
+
+    def has_many(self, ids: List[str]) -> Dict[str, bool]:
+        return self._document_database.has_many(ids)
+
+    def get_many(self, ids: List[str]) -> Dict[str, Tuple[Dict[str, any], str]]:
+        return self._document_database.get_many(ids)
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        self._document_database.insert_many(documents)
+
+    def delete_many(self, ids: List[str]) -> None:
+        self._document_database.delete_many(ids)
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, any]]:
+        return self._document_database.search(query, k)
+
+    def find(self, terms: Dict[str, str] = None, time_ranges: Dict[str, Tuple[float, float]] = None) -> List[str]:
+        return self._document_database.find(terms, time_ranges)
+
+    def search_similar(self, queries: List[str], k: int = 5) -> List[List[Dict[str, any]]]:
+        return self._document_database.search_similar(queries, k)
+
+    def close(self) -> None:
+        self._document_database.close()
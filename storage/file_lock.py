@@ -0,0 +1,96 @@
+import threading
+
+# the locking primitive depends on the platform, the project supports both Windows and POSIX
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    """
+    An exclusive lock shared by all the processes and threads using the same lock file.
+
+    The lock is reentrant within a thread, so operations holding it may call each other.
+    """
+
+    def __init__(self, lock_path: str):
+        """
+        Initializes the lock, the lock file is created on first use.
+
+        Args:
+            lock_path (str): The filesystem path of the lock file.
+        """
+        self._lock_path = lock_path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def _lock_file(self) -> None:
+        """
+        Blocks until the operating system lock on the lock file is obtained.
+        """
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            return
+
+        # msvcrt gives up after a few seconds, keep trying until the holder releases the lock
+        self._file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock_file(self) -> None:
+        """
+        Releases the operating system lock on the lock file.
+        """
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            return
+
+        self._file.seek(0)
+        msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def acquire(self) -> None:
+        """
+        Blocks until the lock is held by the calling thread.
+        """
+        self._thread_lock.acquire()
+
+        if self._depth == 0:
+            try:
+                self._file = open(self._lock_path, "a+b")
+                self._lock_file()
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+
+        self._depth = self._depth + 1
+
+    def release(self) -> None:
+        """
+        Releases the lock held by the calling thread.
+        """
+        self._depth = self._depth - 1
+
+        if self._depth == 0:
+            try:
+                self._unlock_file()
+            finally:
+                self._file.close()
+                self._file = None
+
+        self._thread_lock.release()
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.release()
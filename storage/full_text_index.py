@@ -0,0 +1,242 @@
+import heapq
+import math
+import sqlite3
+import threading
+
+from typing import Dict, List, Set, Tuple
+
+from tools.library.passages import tokenize
+
+class FullTextIndex:
+    """
+    Inverted index over the passages of documents, ranking them with BM25.
+
+    Passages and their term postings are kept in a WAL-mode SQLite file, so the index
+    is updated one document at a time and shared by all the processes using the same file.
+    """
+
+    _SCHEMAS = [
+        """
+        CREATE TABLE IF NOT EXISTS passages (
+            passage_id INTEGER PRIMARY KEY,
+            document_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            text TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS passages_document_id ON passages (document_id)",
+        """
+        CREATE TABLE IF NOT EXISTS postings (
+            term TEXT NOT NULL,
+            passage_id INTEGER NOT NULL,
+            frequency INTEGER NOT NULL,
+            PRIMARY KEY (term, passage_id)
+        ) WITHOUT ROWID
+        """,
+        # Used to remove the postings of a deleted passage
+        "CREATE INDEX IF NOT EXISTS postings_passage_id ON postings (passage_id)",
+        # The number of passages and the sum of their lengths, kept up to date for the BM25 normalization
+        """
+        CREATE TABLE IF NOT EXISTS statistics (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            passage_count INTEGER NOT NULL,
+            total_length INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO statistics (id, passage_count, total_length) VALUES (0, 0, 0)"
+    ]
+
+    # The BM25 term frequency saturation and length normalization parameters
+    _K1 = 1.2
+    _B = 0.75
+
+    # Stays below the default limit of SQLite host parameters per statement
+    _BATCH_PARAMETER_COUNT = 500
+
+    # Seconds to wait for other processes holding the index busy
+    _BUSY_TIMEOUT = 30
+
+    def __init__(self, index_path: str):
+        """
+        Opens the index, creating it if needed.
+
+        Args:
+            index_path (str): The filesystem path of the SQLite file holding the index.
+        """
+        self._connection_lock = threading.Lock()
+        self._connection = sqlite3.connect(index_path, timeout=self._BUSY_TIMEOUT, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for schema in self._SCHEMAS:
+                self._connection.execute(schema)
+
+    def _remove_documents(self, document_ids: List[str]) -> None:
+        """
+        Removes the passages of documents, the caller must hold the connection lock inside a transaction.
+
+        Args:
+            document_ids (List[str]): The unique identifiers of the documents.
+        """
+        for document_id in document_ids:
+            rows = self._connection.execute(
+                "SELECT passage_id, length FROM passages WHERE document_id = ?", (document_id,)
+            ).fetchall()
+            if not rows:
+                continue
+
+            self._connection.executemany("DELETE FROM postings WHERE passage_id = ?", [(row[0],) for row in rows])
+            self._connection.execute("DELETE FROM passages WHERE document_id = ?", (document_id,))
+            self._connection.execute(
+                "UPDATE statistics SET passage_count = passage_count - ?, total_length = total_length - ? WHERE id = 0",
+                (len(rows), sum(row[1] for row in rows))
+            )
+
+    def add_many(self, documents: List[Tuple[str, List[str]]]) -> None:
+        """
+        Indexes the passages of several documents in a single transaction,
+        replacing the passages previously indexed for the same documents.
+
+        Args:
+            documents (List[Tuple[str, List[str]]]): The identifier and the passages of each document.
+        """
+        with self._connection_lock, self._connection:
+            self._remove_documents([document_id for document_id, _ in documents])
+
+            passage_count = 0
+            total_length = 0
+            for document_id, passages in documents:
+                for position, passage in enumerate(passages):
+                    terms = tokenize(passage)
+
+                    cursor = self._connection.execute(
+                        "INSERT INTO passages (document_id, position, length, text) VALUES (?, ?, ?, ?)",
+                        (document_id, position, len(terms), passage)
+                    )
+                    passage_id = cursor.lastrowid
+
+                    frequencies = {}
+                    for term in terms:
+                        frequencies[term] = frequencies.get(term, 0) + 1
+                    self._connection.executemany(
+                        "INSERT INTO postings (term, passage_id, frequency) VALUES (?, ?, ?)",
+                        [(term, passage_id, frequency) for term, frequency in frequencies.items()]
+                    )
+
+                    passage_count = passage_count + 1
+                    total_length = total_length + len(terms)
+
+            self._connection.execute(
+                "UPDATE statistics SET passage_count = passage_count + ?, total_length = total_length + ? WHERE id = 0",
+                (passage_count, total_length)
+            )
+
+    def add(self, document_id: str, passages: List[str]) -> None:
+        """
+        Indexes the passages of a document, replacing the passages previously indexed for it.
+
+        Args:
+            document_id (str): The unique identifier of the document.
+            passages (List[str]): The passages of the document.
+        """
+        self.add_many([(document_id, passages)])
+
+    def remove_many(self, document_ids: List[str]) -> None:
+        """
+        Removes several documents from the index, documents not indexed are ignored.
+
+        Args:
+            document_ids (List[str]): The unique identifiers of the documents.
+        """
+        with self._connection_lock, self._connection:
+            self._remove_documents(document_ids)
+
+    def get_document_ids(self) -> Set[str]:
+        """
+        Lists the indexed documents.
+
+        Returns:
+            Set[str]: The unique identifiers of the indexed documents.
+        """
+        with self._connection_lock:
+            return {row[0] for row in self._connection.execute("SELECT DISTINCT document_id FROM passages")}
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, any]]:
+        """
+        Ranks the indexed passages against a query with BM25.
+
+        Args:
+            query (str): The free text query.
+            k (int): The maximum number of passages returned.
+
+        Returns:
+            List[Dict[str, any]]: The best passages first, each with its document identifier ("id"),
+            its position in the document ("position"), its text ("passage") and its BM25 score ("score").
+        """
+        terms = list(dict.fromkeys(tokenize(query)))[:self._BATCH_PARAMETER_COUNT]
+        k = min(k, self._BATCH_PARAMETER_COUNT)
+        if (not terms) or (k <= 0):
+            return []
+
+        placeholders = ", ".join("?" * len(terms))
+
+        with self._connection_lock:
+            passage_count, total_length = self._connection.execute(
+                "SELECT passage_count, total_length FROM statistics WHERE id = 0"
+            ).fetchone()
+            if passage_count == 0:
+                return []
+
+            document_frequencies = dict(self._connection.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+            ).fetchall())
+
+            postings = self._connection.execute(
+                f"""
+                SELECT postings.term, postings.passage_id, postings.frequency, passages.length
+                FROM postings JOIN passages ON passages.passage_id = postings.passage_id
+                WHERE postings.term IN ({placeholders})
+                """,
+                terms
+            ).fetchall()
+
+        average_length = total_length / passage_count
+        inverse_document_frequencies = {
+            term: math.log(1 + (passage_count - document_frequency + 0.5) / (document_frequency + 0.5))
+            for term, document_frequency in document_frequencies.items()
+        }
+
+        scores = {}
+        for term, passage_id, frequency, length in postings:
+            normalization = self._K1 * (1 - self._B + self._B * length / average_length)
+            score = inverse_document_frequencies[term] * frequency * (self._K1 + 1) / (frequency + normalization)
+            scores[passage_id] = scores.get(passage_id, 0) + score
+
+        best_passages = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        if not best_passages:
+            return []
+
+        with self._connection_lock:
+            rows = self._connection.execute(
+                f"SELECT passage_id, document_id, position, text FROM passages WHERE passage_id IN ({', '.join('?' * len(best_passages))})",
+                [passage_id for passage_id, _ in best_passages]
+            ).fetchall()
+        passages = {row[0]: row[1:] for row in rows}
+
+        results = []
+        for passage_id, score in best_passages:
+            # passages removed by another thread since they were scored are skipped
+            if passage_id not in passages:
+                continue
+            document_id, position, text = passages[passage_id]
+            results.append({"id": document_id, "position": position, "passage": text, "score": score})
+
+        return results
+
+    def close(self) -> None:
+        """
+        Closes the connection to the SQLite index.
+        """
+        with self._connection_lock:
+            self._connection.close()
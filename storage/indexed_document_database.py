@@ -0,0 +1,166 @@
+import logging
+
+from typing import Dict, List, Tuple
+
+from document_database import DocumentDatabase
+from storage.delegating_document_database import DelegatingDocumentDatabase
+from storage.metadata_index import MetadataIndex
+
+class IndexedDocumentDatabase(DelegatingDocumentDatabase):
+    """
+    Decorator maintaining secondary indexes over declared metadata properties of another DocumentDatabase.
+
+    Documents are indexed as they are inserted and removed from the indexes when deleted, 
+    so they can be found by keyword, author or time range without reading every document.
+    Documents stored or deleted without going through this decorator are reconciled when it is opened.
+    """
+
+    _INDEX_FILE = "metadata.sqlite"
+
+    def __init__(self, document_database: DocumentDatabase, metadata_indexes: Dict[str, str]):
+        """
+        Opens the indexes of the given database and brings them up to date.
+
+        Args:
+            document_database (DocumentDatabase): The database whose documents are indexed.
+            metadata_indexes (Dict[str, str]): The kind of index ("term" or "time") of each indexed metadata property.
+        """
+        super().__init__(document_database)
+        self._metadata_index = MetadataIndex(self._database_directory + "/" + self._INDEX_FILE, metadata_indexes)
+
+        self.reconcile()
+
+    def _index(self, ids: List[str], metadatas: List[Dict[str, any]]) -> None:
+        """
+        Indexes stored documents together with their insertion time.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+            metadatas (List[Dict[str, any]]): The metadata of each document.
+        """
+        self._metadata_index.add_many([
+            (id, metadata, self._document_database.get_inserted_time(id)) for id, metadata in zip(ids, metadatas)
+        ])
+
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Indexes the stored documents missing from the indexes and removes the deleted ones from them.
+
+        Returns:
+            Dict[str, int]: The number of documents indexed and removed.
+        """
+        # the indexes are read first, documents indexed meanwhile by other processes are then already stored
+        indexed_ids = self._metadata_index.get_document_ids()
+        storage_information = self._document_database.get_storage_information()
+
+        removed_ids = list(indexed_ids - set(storage_information))
+        if removed_ids:
+            self._metadata_index.remove_many(removed_ids)
+
+        missing_ids = [id for id in storage_information if id not in indexed_ids]
+        if missing_ids:
+            self._metadata_index.add_many([
+                (id, self._document_database.get_metadata(id), storage_information[id][self._KEY_INSERTED_AT]) 
+                for id in missing_ids
+            ])
+
+        reconciliation_result = {"indexed": len(missing_ids), "removed": len(removed_ids)}
+        if missing_ids or removed_ids:
+            logging.info(f"Reconciled the metadata indexes of {self._database_directory}: {reconciliation_result}")
+
+        return reconciliation_result
+
+    def find(self, terms: Dict[str, str] = None, time_ranges: Dict[str, Tuple[float, float]] = None) -> List[str]:
+        """
+        Finds the documents matching all the given conditions through the metadata indexes.
+
+        Args:
+            terms (Dict[str, str], optional): The term each document must have, keyed by metadata property.
+            time_ranges (Dict[str, Tuple[float, float]], optional): The range of POSIX timestamps,
+                start included and end excluded, each document must be in, keyed by metadata property.
+
+        Returns:
+            List[str]: The unique identifiers of the matching documents, most recently inserted first.
+
+        Raises:
+            Exception: If a property has no index of the required kind.
+        """
+        return self._metadata_index.find(terms, time_ranges)
+
+    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores the document and indexes its metadata.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Raises:
+            Exception: If the provided identifier is already registered in the system.
+        """
+        self._document_database.insert(id, metadata, content)
+        self._index([id], [metadata])
+
+    def insert_if_absent(self, id: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores the document and indexes its metadata unless the identifier is already registered.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            bool: True if the document was stored, False if the identifier already existed.
+        """
+        inserted = self._document_database.insert_if_absent(id, metadata, content)
+        if inserted:
+            self._index([id], [metadata])
+
+        return inserted
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several documents and indexes their metadata in a single index transaction.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+
+        Raises:
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
+        """
+        self._document_database.insert_many(documents)
+        self._index([id for id, _, _ in documents], [metadata for _, metadata, _ in documents])
+
+    def delete(self, id: str) -> None:
+        """
+        Removes the document from the database and from the indexes.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        self.delete_many([id])
+
+    def delete_many(self, ids: List[str]) -> None:
+        """
+        Removes several documents from the database and from the indexes.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Raises:
+            Exception: If any of the provided identifiers matches no existing record.
+        """
+        self._document_database.delete_many(ids)
+        self._metadata_index.remove_many(ids)
+
+    def close(self) -> None:
+        """
+        Closes the indexes and the underlying database.
+        """
+        self._metadata_index.close()
+        self._document_database.close()
@@ -0,0 +1,279 @@
+import re
+import sqlite3
+import threading
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Set, Tuple
+
+class MetadataIndex:
+    """
+    Secondary indexes over declared metadata properties of documents.
+
+    Term indexes map each normalized value of a property (a keyword, an author) to the documents having it,
+    time indexes keep the documents ordered by a date property so time ranges are read without a scan.
+    The insertion time of every document is always indexed under "inserted_at".
+    The indexes are kept in a WAL-mode SQLite file shared by all the processes using the same file.
+    """
+
+    KIND_TERM = "term"
+    KIND_TIME = "time"
+
+    KEY_INSERTED_AT = "inserted_at"
+
+    _SCHEMAS = [
+        "CREATE TABLE IF NOT EXISTS definitions (key TEXT PRIMARY KEY, kind TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS documents (document_id TEXT PRIMARY KEY)",
+        """
+        CREATE TABLE IF NOT EXISTS terms (
+            key TEXT NOT NULL,
+            term TEXT NOT NULL,
+            document_id TEXT NOT NULL,
+            PRIMARY KEY (key, term, document_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS terms_document_id ON terms (document_id)",
+        """
+        CREATE TABLE IF NOT EXISTS times (
+            key TEXT NOT NULL,
+            time REAL NOT NULL,
+            document_id TEXT NOT NULL,
+            PRIMARY KEY (key, time, document_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS times_document_id ON times (document_id)"
+    ]
+
+    # Separators between the values listed in a single string property, e.g. "Ukraine, NATO, sanctions"
+    _TERM_SEPARATOR_PATTERN = re.compile(r"[,;]")
+    _WHITESPACE_PATTERN = re.compile(r"\s+")
+
+    # Seconds to wait for other processes holding the index busy
+    _BUSY_TIMEOUT = 30
+
+    def __init__(self, index_path: str, definitions: Dict[str, str]):
+        """
+        Opens the indexes, creating them if needed.
+        Indexes built for other definitions are emptied, so the documents are indexed again.
+
+        Args:
+            index_path (str): The filesystem path of the SQLite file holding the indexes.
+            definitions (Dict[str, str]): The kind of index ("term" or "time") of each indexed metadata property.
+
+        Raises:
+            Exception: If an index kind is not known.
+        """
+        for key, kind in definitions.items():
+            if kind not in (MetadataIndex.KIND_TERM, MetadataIndex.KIND_TIME):
+                raise Exception(f"Unknown metadata index kind {kind} for {key}")
+
+        self._definitions = dict(definitions)
+        self._definitions[self.KEY_INSERTED_AT] = self.KIND_TIME
+
+        self._connection_lock = threading.Lock()
+        self._connection = sqlite3.connect(index_path, timeout=self._BUSY_TIMEOUT, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for schema in self._SCHEMAS:
+                self._connection.execute(schema)
+
+            stored_definitions = dict(self._connection.execute("SELECT key, kind FROM definitions").fetchall())
+            if stored_definitions != self._definitions:
+                for table in ("definitions", "documents", "terms", "times"):
+                    self._connection.execute(f"DELETE FROM {table}")
+                self._connection.executemany(
+                    "INSERT INTO definitions (key, kind) VALUES (?, ?)", list(self._definitions.items())
+                )
+
+    def _normalize_term(self, term: str) -> str:
+        """
+        Normalizes a term so that the indexed and the queried values match regardless of case and spacing.
+
+        Args:
+            term (str): The term to normalize.
+
+        Returns:
+            str: The normalized term.
+        """
+        return self._WHITESPACE_PATTERN.sub(" ", term).strip().lower()
+
+    def _get_terms(self, value: any) -> Set[str]:
+        """
+        Extracts the normalized terms of a metadata value.
+
+        Args:
+            value (any): A list of values or a string listing values separated by commas.
+
+        Returns:
+            Set[str]: The normalized terms.
+        """
+        values = value if isinstance(value, list) else [value]
+
+        terms = set()
+        for value in values:
+            if not isinstance(value, str):
+                continue
+            for term in self._TERM_SEPARATOR_PATTERN.split(value):
+                term = self._normalize_term(term)
+                if term:
+                    terms.add(term)
+
+        return terms
+
+    def _remove_documents(self, document_ids: List[str]) -> None:
+        """
+        Removes documents from the indexes, the caller must hold the connection lock inside a transaction.
+
+        Args:
+            document_ids (List[str]): The unique identifiers of the documents.
+        """
+        rows = [(document_id,) for document_id in document_ids]
+        self._connection.executemany("DELETE FROM terms WHERE document_id = ?", rows)
+        self._connection.executemany("DELETE FROM times WHERE document_id = ?", rows)
+        self._connection.executemany("DELETE FROM documents WHERE document_id = ?", rows)
+
+    def add_many(self, documents: List[Tuple[str, Dict[str, any], float]]) -> None:
+        """
+        Indexes several documents in a single transaction, replacing their previous entries.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], float]]): The identifier, metadata and insertion time of each document.
+        """
+        term_rows = []
+        time_rows = []
+        for document_id, metadata, inserted_at in documents:
+            metadata = dict(metadata or {})
+            metadata[self.KEY_INSERTED_AT] = inserted_at
+
+            for key, kind in self._definitions.items():
+                if key not in metadata:
+                    continue
+
+                if kind == self.KIND_TERM:
+                    term_rows.extend((key, term, document_id) for term in self._get_terms(metadata[key]))
+                else:
+                    time = parse_time(metadata[key])
+                    if time is not None:
+                        time_rows.append((key, time, document_id))
+
+        with self._connection_lock, self._connection:
+            self._remove_documents([document_id for document_id, _, _ in documents])
+            self._connection.executemany(
+                "INSERT INTO documents (document_id) VALUES (?)", [(document_id,) for document_id, _, _ in documents]
+            )
+            self._connection.executemany("INSERT OR IGNORE INTO terms (key, term, document_id) VALUES (?, ?, ?)", term_rows)
+            self._connection.executemany("INSERT OR IGNORE INTO times (key, time, document_id) VALUES (?, ?, ?)", time_rows)
+
+    def remove_many(self, document_ids: List[str]) -> None:
+        """
+        Removes several documents from the indexes, documents not indexed are ignored.
+
+        Args:
+            document_ids (List[str]): The unique identifiers of the documents.
+        """
+        with self._connection_lock, self._connection:
+            self._remove_documents(document_ids)
+
+    def get_document_ids(self) -> Set[str]:
+        """
+        Lists the indexed documents.
+
+        Returns:
+            Set[str]: The unique identifiers of the indexed documents.
+        """
+        with self._connection_lock:
+            return {row[0] for row in self._connection.execute("SELECT document_id FROM documents")}
+
+    def find(self, terms: Dict[str, str] = None, time_ranges: Dict[str, Tuple[float, float]] = None) -> List[str]:
+        """
+        Finds the documents matching all the given conditions.
+
+        Args:
+            terms (Dict[str, str], optional): The term each document must have, keyed by metadata property.
+            time_ranges (Dict[str, Tuple[float, float]], optional): The range of POSIX timestamps,
+                start included and end excluded, each document must be in, keyed by metadata property.
+                Either bound may be None to leave the range open.
+
+        Returns:
+            List[str]: The unique identifiers of the matching documents, most recently inserted first.
+
+        Raises:
+            Exception: If a property has no index of the required kind.
+        """
+        queries = []
+        parameters = []
+
+        for key, term in (terms or {}).items():
+            if self._definitions.get(key) != self.KIND_TERM:
+                raise Exception(f"No term index is declared for {key}")
+            queries.append("SELECT document_id FROM terms WHERE key = ? AND term = ?")
+            parameters.extend([key, self._normalize_term(term)])
+
+        for key, (start, end) in (time_ranges or {}).items():
+            if self._definitions.get(key) != self.KIND_TIME:
+                raise Exception(f"No time index is declared for {key}")
+            query = "SELECT document_id FROM times WHERE key = ?"
+            parameters.append(key)
+            if start is not None:
+                query = query + " AND time >= ?"
+                parameters.append(start)
+            if end is not None:
+                query = query + " AND time < ?"
+                parameters.append(end)
+            queries.append(query)
+
+        if not queries:
+            queries.append("SELECT document_id FROM documents")
+
+        with self._connection_lock:
+            rows = self._connection.execute(
+                f"""
+                SELECT matches.document_id FROM ({" INTERSECT ".join(queries)}) AS matches
+                LEFT JOIN times ON times.key = ? AND times.document_id = matches.document_id
+                ORDER BY times.time DESC
+                """,
+                parameters + [self.KEY_INSERTED_AT]
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """
+        Closes the connection to the SQLite index.
+        """
+        with self._connection_lock:
+            self._connection.close()
+
+
+def parse_time(value: any) -> float:
+    """
+    Converts a date stored in metadata to a POSIX timestamp.
+    Numbers are taken as timestamps, strings may be ISO 8601 or HTTP (RFC 2822) dates,
+    dates without time zone are taken as UTC.
+
+    Args:
+        value (any): The date to convert.
+
+    Returns:
+        float: The POSIX timestamp, or None if the value is not a recognized date.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+
+    if not isinstance(value, str):
+        return None
+
+    value = value.strip()
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+
+    return moment.timestamp()
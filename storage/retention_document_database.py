@@ -0,0 +1,522 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from typing import BinaryIO, Dict, List, Tuple
+from uuid import uuid4
+
+from document_database import DocumentDatabase
+from storage.delegating_document_database import DelegatingDocumentDatabase
+
+class RetentionPolicy:
+    """
+    Describes how long documents stay in a document store and how large the store may grow.
+    Every limit is optional, a policy without limits keeps documents forever.
+    """
+
+    EVICTION_LRU = "lru"
+    EVICTION_LFU = "lfu"
+
+    def __init__(
+        self,
+        max_age: float = None,
+        max_size: int = None,
+        max_entries: int = None,
+        eviction: str = EVICTION_LRU,
+        compaction_interval: float = 60 * 60
+    ):
+        """
+        Initializes the retention policy.
+
+        Args:
+            max_age (float, optional): The number of seconds after which a stored document is stale.
+            max_size (int, optional): The maximum number of bytes taken on disk by the stored content.
+            max_entries (int, optional): The maximum number of stored documents.
+            eviction (str): The order in which documents are evicted when a limit is exceeded,
+                "lru" (least recently used first) or "lfu" (least frequently used first).
+            compaction_interval (float): The minimum number of seconds between two compactions run when the store is opened.
+        """
+        if eviction not in (RetentionPolicy.EVICTION_LRU, RetentionPolicy.EVICTION_LFU):
+            raise Exception(f"Unknown eviction policy {eviction}")
+
+        self.max_age = max_age
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.eviction = eviction
+        self.compaction_interval = compaction_interval
+
+
+class RetentionDocumentDatabase(DelegatingDocumentDatabase):
+    """
+    Decorator applying a retention policy to another DocumentDatabase.
+
+    Stale documents are reported as missing and replaced on the next insert.
+    The store is compacted when it is opened and by the inserts, at most once per compaction interval,
+    so an instance kept open by a long-running process keeps the store within its limits:
+    stale documents are deleted, documents are evicted until the store fits its limits
+    and content blobs no document references are removed.
+    Deletions happen under the write lock of the database, so processes sharing the store
+    never delete documents another one has already deleted or just inserted.
+    The document usage needed by the eviction is tracked in memory and saved during compaction.
+    """
+
+    _USAGE_FILE = "usage.json"
+
+    _KEY_COMPACTED_AT = "compacted_at"
+    _KEY_DOCUMENTS = "documents"
+
+    def __init__(self, document_database: DocumentDatabase, retention_policy: RetentionPolicy):
+        """
+        Initializes the retention in front of the given database, compacting it if it is due.
+
+        Args:
+            document_database (DocumentDatabase): The database whose documents are retained.
+            retention_policy (RetentionPolicy): The limits applied to the database.
+        """
+        super().__init__(document_database)
+        self._retention_policy = retention_policy
+
+        # the usage recorded since the last save, the last access time and access count of each document
+        self._lock = threading.Lock()
+        self._usage = {}
+
+        # the time the next compaction is due at, checked against the usage file once reached
+        self._next_compaction_at = 0
+        self._compact_if_due()
+
+    def _get_usage_path(self) -> str:
+        """
+        Resolves the path of the file holding the document usage.
+
+        Returns:
+            str: The filesystem path of the usage file.
+        """
+        return self._database_directory + "/" + self._USAGE_FILE
+
+    def _read_usage(self) -> Dict[str, any]:
+        """
+        Reads the saved document usage.
+
+        Returns:
+            Dict[str, any]: The time of the last compaction and the last access time and access count of each document.
+        """
+        try:
+            with open(self._get_usage_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {self._KEY_COMPACTED_AT: 0, self._KEY_DOCUMENTS: {}}
+
+    def _write_usage(self, usage: Dict[str, any]) -> None:
+        """
+        Atomically replaces the saved document usage.
+
+        Args:
+            usage (Dict[str, any]): The time of the last compaction and the usage of each document.
+        """
+        temporary_path = self._get_usage_path() + "." + str(uuid4()) + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(usage, f)
+        os.replace(temporary_path, self._get_usage_path())
+
+    def _merge_usage(self, usage: Dict[str, any]) -> None:
+        """
+        Adds the usage recorded in memory to the saved usage and forgets it.
+
+        Args:
+            usage (Dict[str, any]): The saved usage, updated in place.
+        """
+        with self._lock:
+            recorded_usage = self._usage
+            self._usage = {}
+
+        documents_usage = usage.setdefault(self._KEY_DOCUMENTS, {})
+        for id, (accessed_at, access_count) in recorded_usage.items():
+            saved_accessed_at, saved_access_count = documents_usage.get(id, (0, 0))
+            documents_usage[id] = (max(accessed_at, saved_accessed_at), access_count + saved_access_count)
+
+    def _record_access(self, ids: List[str]) -> None:
+        """
+        Records that documents have been read.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents read.
+        """
+        now = time.time()
+        with self._lock:
+            for id in ids:
+                _, access_count = self._usage.get(id, (now, 0))
+                self._usage[id] = (now, access_count + 1)
+
+    def _compact_if_due(self) -> None:
+        """
+        Compacts the store if no process has compacted it for the compaction interval.
+        """
+        if time.time() < self._next_compaction_at:
+            return
+
+        compacted_at = self._read_usage().get(self._KEY_COMPACTED_AT, 0)
+        if time.time() - compacted_at >= self._retention_policy.compaction_interval:
+            self.compact()
+        else:
+            self._next_compaction_at = compacted_at + self._retention_policy.compaction_interval
+
+    def _is_stale(self, id: str) -> bool:
+        """
+        Checks if a stored document is older than the maximum age.
+
+        Args:
+            id (str): The unique identifier of a stored document.
+
+        Returns:
+            bool: True if the document is stale, False otherwise.
+        """
+        if self._retention_policy.max_age is None:
+            return False
+
+        return time.time() - self._document_database.get_inserted_time(id) > self._retention_policy.max_age
+
+    def _ensure_fresh(self, id: str) -> None:
+        """
+        Ensures a document is stored and not stale.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Raises:
+            Exception: If the document is not stored or is stale.
+        """
+        if not self.has(id):
+            raise Exception(f"Document is not in the database for id {id}")
+
+    def _delete_stale(self, ids: List[str]) -> None:
+        """
+        Deletes the stale documents among the given ones, so they can be inserted again.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents about to be inserted.
+        """
+        with self._write_lock:
+            stored_ids = [id for id, exists in self._document_database.has_many(ids).items() if exists]
+            stale_ids = [id for id in stored_ids if self._is_stale(id)]
+            if stale_ids:
+                self._document_database.delete_many(stale_ids)
+
+    def _select_evicted(self, storage_information: Dict[str, Dict[str, any]], documents_usage: Dict[str, any]) -> List[str]:
+        """
+        Selects the documents to evict so the store fits the maximum size and number of entries.
+
+        Args:
+            storage_information (Dict[str, Dict[str, any]]): How each remaining document is stored.
+            documents_usage (Dict[str, any]): The last access time and access count of each document.
+
+        Returns:
+            List[str]: The unique identifiers of the documents to evict.
+        """
+        # content shared by several documents only counts once
+        references = {}
+        size = 0
+        for information in storage_information.values():
+            file_name = information[self._KEY_FILE_NAME]
+            if (file_name is None) or (file_name not in references):
+                size = size + information[self._KEY_SIZE]
+            if file_name is not None:
+                references[file_name] = references.get(file_name, 0) + 1
+
+        def get_eviction_order(id: str) -> Tuple[float, float]:
+            accessed_at, access_count = documents_usage.get(id, (storage_information[id][self._KEY_INSERTED_AT], 0))
+            if self._retention_policy.eviction == RetentionPolicy.EVICTION_LFU:
+                return (access_count, accessed_at)
+            return (accessed_at, access_count)
+
+        max_entries = self._retention_policy.max_entries
+        max_size = self._retention_policy.max_size
+        entries = len(storage_information)
+
+        evicted_ids = []
+        for id in sorted(storage_information, key=get_eviction_order):
+            if ((max_entries is None) or (entries <= max_entries)) and ((max_size is None) or (size <= max_size)):
+                break
+
+            evicted_ids.append(id)
+            entries = entries - 1
+
+            file_name = storage_information[id][self._KEY_FILE_NAME]
+            if file_name is not None:
+                references[file_name] = references[file_name] - 1
+            if (file_name is None) or (references[file_name] == 0):
+                size = size - storage_information[id][self._KEY_SIZE]
+
+        return evicted_ids
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Deletes the stale documents, evicts documents until the store fits its limits
+        and removes the content blobs no document references.
+
+        Returns:
+            Dict[str, int]: The number of stale documents, evicted documents and orphaned blobs removed.
+        """
+        # the documents are selected and deleted under the write lock, so they are still the ones stored
+        with self._write_lock:
+            usage = self._read_usage()
+            self._merge_usage(usage)
+
+            storage_information = self._document_database.get_storage_information()
+
+            stale_ids = []
+            if self._retention_policy.max_age is not None:
+                oldest_inserted_at = time.time() - self._retention_policy.max_age
+                stale_ids = [id for id, information in storage_information.items() if information[self._KEY_INSERTED_AT] < oldest_inserted_at]
+            for id in stale_ids:
+                del storage_information[id]
+
+            documents_usage = usage[self._KEY_DOCUMENTS]
+            evicted_ids = self._select_evicted(storage_information, documents_usage)
+
+            # documents deleted meanwhile through another handle are already gone
+            deleted_ids = [id for id, exists in self._document_database.has_many(stale_ids + evicted_ids).items() if exists]
+            if deleted_ids:
+                self._document_database.delete_many(deleted_ids)
+
+            orphaned_count = self._document_database.remove_orphaned_content()
+
+            # the usage of deleted documents is no longer needed
+            for id in list(documents_usage):
+                if (id not in storage_information) or (id in evicted_ids):
+                    del documents_usage[id]
+            usage[self._KEY_COMPACTED_AT] = time.time()
+            self._write_usage(usage)
+            self._next_compaction_at = usage[self._KEY_COMPACTED_AT] + self._retention_policy.compaction_interval
+
+        compaction_result = {
+            "stale": len(stale_ids),
+            "evicted": len(evicted_ids),
+            "orphaned": orphaned_count
+        }
+        logging.info(f"Compacted the document database at {self._database_directory}: {compaction_result}")
+
+        return compaction_result
+
+    def save_usage(self) -> None:
+        """
+        Saves the document usage recorded in memory, so it is considered by later compactions.
+        """
+        with self._write_lock:
+            usage = self._read_usage()
+            self._merge_usage(usage)
+            self._write_usage(usage)
+
+    def has(self, id: str) -> bool:
+        """
+        Checks if the document identifier is stored and not stale.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            bool: True if the document exists and is fresh, False otherwise.
+        """
+        return self._document_database.has(id) and not self._is_stale(id)
+
+    def get(self, id: str) -> Tuple[Dict[str, any], str]:
+        """
+        Retrieves the document unless it is stale.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Tuple[Dict[str, any], str]: A tuple containing the metadata dictionary and the raw content string.
+
+        Raises:
+            Exception: If the document is not stored or is stale.
+        """
+        self._ensure_fresh(id)
+        self._record_access([id])
+
+        return self._document_database.get(id)
+
+    def get_metadata(self, id: str) -> Dict[str, any]:
+        """
+        Retrieves the metadata of the document unless it is stale.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            Dict[str, any]: The metadata dictionary.
+
+        Raises:
+            Exception: If the document is not stored or is stale.
+        """
+        self._ensure_fresh(id)
+
+        return self._document_database.get_metadata(id)
+
+    def get_stream(self, id: str) -> BinaryIO:
+        """
+        Opens the content of the document for streaming reads unless it is stale.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Returns:
+            BinaryIO: A binary file-like object yielding the UTF-8 encoded content.
+
+        Raises:
+            Exception: If the document is not stored or is stale.
+        """
+        self._ensure_fresh(id)
+        self._record_access([id])
+
+        return self._document_database.get_stream(id)
+
+    def has_many(self, ids: List[str]) -> Dict[str, bool]:
+        """
+        Determines which of the given documents are stored and not stale.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            Dict[str, bool]: The existence of each fresh document, keyed by identifier.
+        """
+        existence = self._document_database.has_many(ids)
+
+        return {id: exists and not self._is_stale(id) for id, exists in existence.items()}
+
+    def get_many(self, ids: List[str]) -> Dict[str, Tuple[Dict[str, any], str]]:
+        """
+        Retrieves several documents, leaving out the missing and stale ones.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Returns:
+            Dict[str, Tuple[Dict[str, any], str]]: The metadata and content of each fresh document, keyed by identifier.
+        """
+        fresh_ids = [id for id, exists in self.has_many(ids).items() if exists]
+        self._record_access(fresh_ids)
+
+        return self._document_database.get_many(fresh_ids)
+
+    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores the document, replacing its stale version if any.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Raises:
+            Exception: If the provided identifier is already registered and fresh.
+        """
+        self._delete_stale([id])
+        self._document_database.insert(id, metadata, content)
+        self._compact_if_due()
+
+    def insert_if_absent(self, id: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores the document unless a fresh version is already registered, replacing its stale version if any.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            bool: True if the document was stored, False if a fresh version already existed.
+        """
+        self._delete_stale([id])
+        inserted = self._document_database.insert_if_absent(id, metadata, content)
+        if inserted:
+            self._compact_if_due()
+
+        return inserted
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several documents, replacing their stale versions if any.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+
+        Raises:
+            Exception: If any of the document identifiers is already registered and fresh, or is repeated in the batch.
+        """
+        self._delete_stale([id for id, _, _ in documents])
+        self._document_database.insert_many(documents)
+        self._compact_if_due()
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, any]]:
+        """
+        Finds the passages of the fresh documents best matching a query.
+
+        Args:
+            query (str): The free text query.
+            k (int): The maximum number of passages returned.
+
+        Returns:
+            List[Dict[str, any]]: The best passages first, with their document identifier, position, text and score.
+
+        Raises:
+            Exception: If full-text search is not enabled for the database.
+        """
+        results = self._document_database.search(query, k)
+        
+        # passages of stale documents are left out
+        fresh_ids = self.has_many(list({result[self._KEY_ID] for result in results}))
+
+        return [result for result in results if fresh_ids[result[self._KEY_ID]]]
+
+    def find(self, terms: Dict[str, str] = None, time_ranges: Dict[str, Tuple[float, float]] = None) -> List[str]:
+        """
+        Finds the fresh documents matching all the given conditions through the metadata indexes.
+
+        Args:
+            terms (Dict[str, str], optional): The term each document must have, keyed by metadata property.
+            time_ranges (Dict[str, Tuple[float, float]], optional): The range of POSIX timestamps each document must be in, keyed by metadata property.
+
+        Returns:
+            List[str]: The unique identifiers of the matching documents, most recently inserted first.
+
+        Raises:
+            Exception: If the metadata indexes do not cover the conditions.
+        """
+        ids = self._document_database.find(terms, time_ranges)
+
+        # stale documents are left out
+        fresh_ids = self.has_many(ids)
+
+        return [id for id in ids if fresh_ids[id]]
+
+    def search_similar(self, queries: List[str], k: int = 5) -> List[List[Dict[str, any]]]:
+        """
+        Finds the chunks of the fresh documents semantically closest to each of several queries.
+
+        Args:
+            queries (List[str]): The free text queries, searched together in a single pass.
+            k (int): The maximum number of chunks returned per query.
+
+        Returns:
+            List[List[Dict[str, any]]]: For each query, the closest chunks first, with their document identifier, position, text and score.
+
+        Raises:
+            Exception: If no embedding function is configured for the database.
+        """
+        results = self._document_database.search_similar(queries, k)
+
+        # chunks of stale documents are left out
+        fresh_ids = self.has_many(list({result[self._KEY_ID] for query_results in results for result in query_results}))
+
+        return [[result for result in query_results if fresh_ids[result[self._KEY_ID]]] for query_results in results]
+
+    def close(self) -> None:
+        """
+        Saves the recorded document usage and closes the underlying database.
+        """
+        self.save_usage()
+        self._document_database.close()
@@ -0,0 +1,182 @@
+import logging
+
+from typing import Dict, List, Tuple
+
+from document_database import DocumentDatabase
+from storage.delegating_document_database import DelegatingDocumentDatabase
+from storage.full_text_index import FullTextIndex
+from tools.library.passages import split_passages
+
+class SearchableDocumentDatabase(DelegatingDocumentDatabase):
+    """
+    Decorator maintaining a full-text index over the documents of another DocumentDatabase.
+
+    The content of each document is split into passages which are indexed together with
+    the text of its metadata as they are inserted, and removed from the index when deleted.
+    Documents stored or deleted without going through this decorator are reconciled when it is opened.
+    """
+
+    _INDEX_FILE = "search.sqlite"
+
+    # The number of documents read at once when reconciling the index
+    _RECONCILIATION_BATCH_SIZE = 100
+
+    def __init__(self, document_database: DocumentDatabase):
+        """
+        Opens the index of the given database and brings it up to date.
+
+        Args:
+            document_database (DocumentDatabase): The database whose documents are indexed.
+        """
+        super().__init__(document_database)
+        self._full_text_index = FullTextIndex(self._database_directory + "/" + self._INDEX_FILE)
+
+        self.reconcile()
+
+    def _get_passages(self, metadata: Dict[str, any], content: str) -> List[str]:
+        """
+        Splits a document into the passages to index.
+
+        Args:
+            metadata (Dict[str, any]): The metadata of the document.
+            content (str): The content of the document.
+
+        Returns:
+            List[str]: The text of the metadata, if any, followed by the passages of the content.
+        """
+        metadata_texts = []
+        for value in (metadata or {}).values():
+            if isinstance(value, str):
+                metadata_texts.append(value)
+            elif isinstance(value, list):
+                metadata_texts.append(", ".join(str(item) for item in value))
+
+        passages = split_passages(content)
+
+        metadata_text = "\n\n".join(text for text in metadata_texts if text.strip())
+        if metadata_text:
+            passages.insert(0, metadata_text)
+
+        return passages
+
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Indexes the stored documents missing from the index and removes the deleted ones from it.
+
+        Returns:
+            Dict[str, int]: The number of documents indexed and removed.
+        """
+        # the index is read first, documents indexed meanwhile by other processes are then already stored
+        indexed_ids = self._full_text_index.get_document_ids()
+        stored_ids = set(self._document_database.get_storage_information())
+
+        removed_ids = list(indexed_ids - stored_ids)
+        if removed_ids:
+            self._full_text_index.remove_many(removed_ids)
+
+        missing_ids = list(stored_ids - indexed_ids)
+        for index in range(0, len(missing_ids), self._RECONCILIATION_BATCH_SIZE):
+            documents = self._document_database.get_many(missing_ids[index:index + self._RECONCILIATION_BATCH_SIZE])
+            self._full_text_index.add_many([
+                (id, self._get_passages(metadata, content)) for id, (metadata, content) in documents.items()
+            ])
+
+        reconciliation_result = {"indexed": len(missing_ids), "removed": len(removed_ids)}
+        if missing_ids or removed_ids:
+            logging.info(f"Reconciled the full-text index of {self._database_directory}: {reconciliation_result}")
+
+        return reconciliation_result
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, any]]:
+        """
+        Finds the passages of the stored documents best matching a query, ranked with BM25.
+
+        Args:
+            query (str): The free text query.
+            k (int): The maximum number of passages returned.
+
+        Returns:
+            List[Dict[str, any]]: The best passages first, each with its document identifier ("id"),
+            its position in the document ("position"), its text ("passage") and its score ("score").
+        """
+        return self._full_text_index.search(query, k)
+
+    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores the document and indexes its passages.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Raises:
+            Exception: If the provided identifier is already registered in the system.
+        """
+        self._document_database.insert(id, metadata, content)
+        self._full_text_index.add(id, self._get_passages(metadata, content))
+
+    def insert_if_absent(self, id: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores the document and indexes its passages unless the identifier is already registered.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            bool: True if the document was stored, False if the identifier already existed.
+        """
+        inserted = self._document_database.insert_if_absent(id, metadata, content)
+        if inserted:
+            self._full_text_index.add(id, self._get_passages(metadata, content))
+
+        return inserted
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several documents and indexes their passages in a single index transaction.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+
+        Raises:
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
+        """
+        self._document_database.insert_many(documents)
+        self._full_text_index.add_many([
+            (id, self._get_passages(metadata, content)) for id, metadata, content in documents
+        ])
+
+    def delete(self, id: str) -> None:
+        """
+        Removes the document from the database and from the index.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        self.delete_many([id])
+
+    def delete_many(self, ids: List[str]) -> None:
+        """
+        Removes several documents from the database and from the index.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Raises:
+            Exception: If any of the provided identifiers matches no existing record.
+        """
+        self._document_database.delete_many(ids)
+        self._full_text_index.remove_many(ids)
+
+    def close(self) -> None:
+        """
+        Closes the index and the underlying database.
+        """
+        self._full_text_index.close()
+        self._document_database.close()
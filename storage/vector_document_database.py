@@ -0,0 +1,211 @@
+import logging
+
+from typing import Dict, List, Tuple
+
+from document_database import DocumentDatabase
+from storage.delegating_document_database import DelegatingDocumentDatabase
+from storage.vector_index import VectorIndex
+from tools.library.embeddings import EmbeddingFunction
+from tools.library.passages import split_passages
+
+class VectorDocumentDatabase(DelegatingDocumentDatabase):
+    """
+    Decorator maintaining a vector index over chunks of the documents of another DocumentDatabase.
+
+    The content of each document is split into chunks which are embedded and indexed as the document
+    is inserted, and removed from the index when it is deleted, so the chunks semantically close to
+    a query can be retrieved without reading the documents.
+    Documents stored or deleted without going through this decorator are reconciled when it is opened.
+    """
+
+    _INDEX_FILE = "vectors.sqlite"
+    _MATRIX_FILE = "vectors.f32"
+
+    # Chunks are kept shorter than the full-text passages so a chunk covers a single idea
+    _CHUNK_WORD_COUNT = 120
+
+    # The number of documents read at once when reconciling the index
+    _RECONCILIATION_BATCH_SIZE = 100
+
+    def __init__(self, document_database: DocumentDatabase, embedding_function: EmbeddingFunction):
+        """
+        Opens the index of the given database and brings it up to date.
+
+        Args:
+            document_database (DocumentDatabase): The database whose documents are indexed.
+            embedding_function (EmbeddingFunction): The embedding computing the vectors of the chunks and queries.
+        """
+        super().__init__(document_database)
+        self._embedding_function = embedding_function
+        self._vector_index = VectorIndex(
+            self._database_directory + "/" + self._INDEX_FILE,
+            self._database_directory + "/" + self._MATRIX_FILE,
+            embedding_function.get_name(),
+            embedding_function.get_dimension()
+        )
+
+        self.reconcile()
+
+    def _index(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Splits documents into chunks, embeds them in a single batch and indexes them.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+        """
+        document_chunks = []
+        texts = []
+        for id, metadata, content in documents:
+            chunks = split_passages(content, self._CHUNK_WORD_COUNT)
+            document_chunks.append((id, chunks))
+
+            # the title situates each chunk within its document
+            title = (metadata or {}).get("title")
+            texts.extend([f"{title}\n\n{chunk}" if title else chunk for chunk in chunks])
+
+        vectors = self._embedding_function.embed(texts)
+
+        indexed_documents = []
+        row = 0
+        for id, chunks in document_chunks:
+            indexed_documents.append((id, chunks, vectors[row:row + len(chunks)]))
+            row = row + len(chunks)
+
+        self._vector_index.add_many(indexed_documents)
+
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Indexes the stored documents missing from the index and removes the deleted ones from it.
+
+        Returns:
+            Dict[str, int]: The number of documents indexed and removed.
+        """
+        # the index is read first, documents indexed meanwhile by other processes are then already stored
+        indexed_ids = self._vector_index.get_document_ids()
+        stored_ids = set(self._document_database.get_storage_information())
+
+        removed_ids = list(indexed_ids - stored_ids)
+        if removed_ids:
+            self._vector_index.remove_many(removed_ids)
+
+        missing_ids = list(stored_ids - indexed_ids)
+        for index in range(0, len(missing_ids), self._RECONCILIATION_BATCH_SIZE):
+            documents = self._document_database.get_many(missing_ids[index:index + self._RECONCILIATION_BATCH_SIZE])
+            self._index([(id, metadata, content) for id, (metadata, content) in documents.items()])
+
+        reconciliation_result = {"indexed": len(missing_ids), "removed": len(removed_ids)}
+        if missing_ids or removed_ids:
+            logging.info(f"Reconciled the vector index of {self._database_directory}: {reconciliation_result}")
+
+        return reconciliation_result
+
+    def search_similar(self, queries: List[str], k: int = 5) -> List[List[Dict[str, any]]]:
+        """
+        Finds the chunks of the stored documents semantically closest to each of several queries.
+
+        Args:
+            queries (List[str]): The free text queries, searched together in a single pass.
+            k (int): The maximum number of chunks returned per query.
+
+        Returns:
+            List[List[Dict[str, any]]]: For each query, the closest chunks first, each with its document identifier ("id"),
+            its position in the document ("position"), its text ("chunk") and its cosine similarity ("score").
+        """
+        if not queries:
+            return []
+
+        return self._vector_index.search(self._embedding_function.embed(queries), k)
+
+    def remove_orphaned_content(self) -> int:
+        """
+        Deletes the content blobs no document references anymore,
+        and compacts the vector matrix once the rows of deleted documents take a large part of it.
+
+        Returns:
+            int: The number of blobs deleted.
+        """
+        orphaned_count = self._document_database.remove_orphaned_content()
+
+        removed_row_count = self._vector_index.compact()
+        if removed_row_count:
+            logging.info(f"Compacted the vector index of {self._database_directory}: {removed_row_count} rows removed")
+
+        return orphaned_count
+
+    def insert(self, id: str, metadata: Dict[str, any], content: str) -> None:
+        """
+        Stores the document and indexes the vectors of its chunks.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Raises:
+            Exception: If the provided identifier is already registered in the system.
+        """
+        self._document_database.insert(id, metadata, content)
+        self._index([(id, metadata, content)])
+
+    def insert_if_absent(self, id: str, metadata: Dict[str, any], content: str) -> bool:
+        """
+        Stores the document and indexes the vectors of its chunks unless the identifier is already registered.
+
+        Args:
+            id (str): The unique identifier to assign to this document.
+            metadata (Dict[str, any]): A dictionary of additional properties associated with the document.
+            content (str): The raw text content to be stored.
+
+        Returns:
+            bool: True if the document was stored, False if the identifier already existed.
+        """
+        inserted = self._document_database.insert_if_absent(id, metadata, content)
+        if inserted:
+            self._index([(id, metadata, content)])
+
+        return inserted
+
+    def insert_many(self, documents: List[Tuple[str, Dict[str, any], str]]) -> None:
+        """
+        Stores several documents and indexes the vectors of their chunks, embedded in a single batch.
+
+        Args:
+            documents (List[Tuple[str, Dict[str, any], str]]): The identifier, metadata and content of each document.
+
+        Raises:
+            Exception: If any of the document identifiers already exists or is repeated in the batch.
+        """
+        self._document_database.insert_many(documents)
+        self._index(documents)
+
+    def delete(self, id: str) -> None:
+        """
+        Removes the document from the database and from the index.
+
+        Args:
+            id (str): The unique identifier of the document.
+
+        Raises:
+            Exception: If the provided identifier matches no existing record.
+        """
+        self.delete_many([id])
+
+    def delete_many(self, ids: List[str]) -> None:
+        """
+        Removes several documents from the database and from the index.
+
+        Args:
+            ids (List[str]): The unique identifiers of the documents.
+
+        Raises:
+            Exception: If any of the provided identifiers matches no existing record.
+        """
+        self._document_database.delete_many(ids)
+        self._vector_index.remove_many(ids)
+
+    def close(self) -> None:
+        """
+        Closes the index and the underlying database.
+        """
+        self._vector_index.close()
+        self._document_database.close()
@@ -0,0 +1,370 @@
+import os
+import sqlite3
+import threading
+
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+class VectorIndex:
+    """
+    Index of the unit-length vectors of document chunks, searched by cosine similarity.
+
+    The vectors are rows of a float32 matrix stored in a raw file which is memory-mapped for searches,
+    so the matrix does not need to fit in memory. The chunks behind the rows, and the number of rows in use,
+    are kept in a WAL-mode SQLite file shared by all the processes using the index.
+    Rows of deleted documents are masked out of searches, the matrix is rewritten without them
+    when it is compacted, into a new file so searches running meanwhile keep reading the previous one.
+    """
+
+    _SCHEMAS = [
+        """
+        CREATE TABLE IF NOT EXISTS configuration (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            embedding TEXT NOT NULL,
+            dimension INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            matrix_version INTEGER NOT NULL,
+            removal_count INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS chunks (
+            row INTEGER PRIMARY KEY,
+            document_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            text TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS chunks_document_id ON chunks (document_id)"
+    ]
+
+    # The number of matrix rows scored at once, bounding the memory taken by a search
+    _SEARCH_BLOCK_ROWS = 65_536
+
+    # Stays below the default limit of SQLite host parameters per statement
+    _BATCH_PARAMETER_COUNT = 500
+
+    # Seconds to wait for other processes holding the index busy
+    _BUSY_TIMEOUT = 30
+
+    # The part of the matrix rows of deleted documents take before compacting it is worth rewriting it
+    _COMPACTION_DEAD_ROW_RATIO = 0.25
+
+    # The number of times a search maps the matrix again after a compaction deleted the one it was about to map
+    _SEARCH_ATTEMPTS = 3
+
+    def __init__(self, index_path: str, matrix_path: str, embedding_name: str, dimension: int):
+        """
+        Opens the index, creating it if needed.
+        An index built with another embedding is emptied, so the documents are embedded again.
+
+        Args:
+            index_path (str): The filesystem path of the SQLite file holding the chunks.
+            matrix_path (str): The filesystem path of the raw file holding the vectors.
+            embedding_name (str): The name of the embedding computing the vectors.
+            dimension (int): The dimension of the vectors.
+        """
+        self._matrix_path = matrix_path
+        self._dimension = dimension
+
+        # the memory map of the matrix and the mask of its rows in use, recreated when the rows change
+        self._matrix = None
+        self._live_rows = None
+        self._matrix_state = None
+
+        self._connection_lock = threading.Lock()
+        self._connection = sqlite3.connect(index_path, timeout=self._BUSY_TIMEOUT, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            # indexes created before the matrix could be compacted are rebuilt
+            columns = {column[1] for column in self._connection.execute("PRAGMA table_info(configuration)")}
+            if columns and ("matrix_version" not in columns):
+                self._connection.execute("DROP TABLE configuration")
+
+            for schema in self._SCHEMAS:
+                self._connection.execute(schema)
+
+            configuration = self._connection.execute(
+                "SELECT embedding, dimension, matrix_version FROM configuration WHERE id = 0"
+            ).fetchone()
+            if (configuration is None) or (configuration[:2] != (embedding_name, dimension)):
+                self._connection.execute("DELETE FROM chunks")
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO configuration (id, embedding, dimension, row_count, matrix_version, removal_count) "
+                    "VALUES (0, ?, ?, 0, 0, 0)",
+                    (embedding_name, dimension)
+                )
+                with open(self._matrix_path, "wb"):
+                    pass
+                if configuration is not None:
+                    self._delete_matrix(configuration[2])
+
+    def _get_matrix_path(self, matrix_version: int) -> str:
+        """
+        Resolves the path of the raw file holding a version of the matrix.
+
+        Args:
+            matrix_version (int): The number of compactions the matrix went through.
+
+        Returns:
+            str: The filesystem path of the raw file.
+        """
+        if matrix_version == 0:
+            return self._matrix_path
+
+        return f"{self._matrix_path}.{matrix_version}"
+
+    def _delete_matrix(self, matrix_version: int) -> None:
+        """
+        Deletes a version of the matrix no longer in use, processes having it mapped keep reading it.
+
+        Args:
+            matrix_version (int): The number of compactions the matrix went through.
+        """
+        try:
+            os.remove(self._get_matrix_path(matrix_version))
+        except OSError:
+            pass
+
+    def _remove_documents(self, document_ids: List[str]) -> None:
+        """
+        Removes the chunks of documents, the caller must hold the connection lock inside a transaction.
+
+        Args:
+            document_ids (List[str]): The unique identifiers of the documents.
+        """
+        cursor = self._connection.executemany(
+            "DELETE FROM chunks WHERE document_id = ?", [(document_id,) for document_id in document_ids]
+        )
+
+        # the searches of all the processes mask the rows removed
+        if cursor.rowcount > 0:
+            self._connection.execute("UPDATE configuration SET removal_count = removal_count + 1 WHERE id = 0")
+
+    def add_many(self, documents: List[Tuple[str, List[str], np.ndarray]]) -> None:
+        """
+        Indexes the chunks of several documents in a single transaction,
+        replacing the chunks previously indexed for the same documents.
+
+        Args:
+            documents (List[Tuple[str, List[str], np.ndarray]]): The identifier, the chunks
+                and the matrix of the chunk vectors, one row per chunk, of each document.
+        """
+        rows = []
+        vectors = []
+        for document_id, chunks, chunk_vectors in documents:
+            for position, chunk in enumerate(chunks):
+                rows.append((document_id, position, chunk))
+            vectors.append(np.asarray(chunk_vectors, dtype=np.float32).reshape(len(chunks), self._dimension))
+
+        with self._connection_lock, self._connection:
+            self._remove_documents([document_id for document_id, _, _ in documents])
+
+            # reserving the rows first takes the write lock, so other processes reserve the following ones
+            self._connection.execute("UPDATE configuration SET row_count = row_count + ? WHERE id = 0", (len(rows),))
+            row_count, matrix_version = self._connection.execute(
+                "SELECT row_count, matrix_version FROM configuration WHERE id = 0"
+            ).fetchone()
+            first_row = row_count - len(rows)
+
+            if rows:
+                with open(self._get_matrix_path(matrix_version), "r+b") as f:
+                    f.seek(first_row * self._dimension * 4)
+                    f.write(np.concatenate(vectors).tobytes())
+
+            self._connection.executemany(
+                "INSERT INTO chunks (row, document_id, position, text) VALUES (?, ?, ?, ?)",
+                [(first_row + index,) + row for index, row in enumerate(rows)]
+            )
+
+    def remove_many(self, document_ids: List[str]) -> None:
+        """
+        Removes several documents from the index, documents not indexed are ignored.
+
+        Args:
+            document_ids (List[str]): The unique identifiers of the documents.
+        """
+        with self._connection_lock, self._connection:
+            self._remove_documents(document_ids)
+
+    def get_document_ids(self) -> Set[str]:
+        """
+        Lists the indexed documents.
+
+        Returns:
+            Set[str]: The unique identifiers of the indexed documents.
+        """
+        with self._connection_lock:
+            return {row[0] for row in self._connection.execute("SELECT DISTINCT document_id FROM chunks")}
+
+    def _get_matrix(self) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Maps the rows of the matrix in use into memory, with the mask of the rows of documents still indexed.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, int]: The read-only matrix of the vectors, one row per chunk indexed
+            since the last compaction, the mask of the rows in use, both None when no row is in use,
+            and the version of the matrix the rows are numbered in.
+        """
+        with self._connection_lock:
+            # the configuration and the rows in use are read from the same snapshot
+            self._connection.execute("BEGIN")
+            try:
+                state = self._connection.execute(
+                    "SELECT row_count, matrix_version, removal_count FROM configuration WHERE id = 0"
+                ).fetchone()
+
+                if state != self._matrix_state:
+                    row_count, matrix_version, _ = state
+
+                    self._matrix = None
+                    self._live_rows = None
+                    if row_count > 0:
+                        self._matrix = np.memmap(
+                            self._get_matrix_path(matrix_version), dtype=np.float32, mode="r", shape=(row_count, self._dimension)
+                        )
+                        live_rows = [row for (row,) in self._connection.execute("SELECT row FROM chunks WHERE row < ?", (row_count,))]
+                        self._live_rows = np.zeros(row_count, dtype=bool)
+                        self._live_rows[np.asarray(live_rows, dtype=np.int64)] = True
+                    self._matrix_state = state
+            finally:
+                self._connection.commit()
+
+            return self._matrix, self._live_rows, self._matrix_state[1]
+
+    def search(self, query_vectors: np.ndarray, k: int = 5) -> List[List[Dict[str, any]]]:
+        """
+        Finds the chunks most similar to each of several query vectors in a single pass over the matrix.
+
+        Args:
+            query_vectors (np.ndarray): The unit-length query vectors, one row per query.
+            k (int): The maximum number of chunks returned per query.
+
+        Returns:
+            List[List[Dict[str, any]]]: For each query, the most similar chunks first, each with its document
+            identifier ("id"), its position in the document ("position"), its text ("chunk") and its cosine similarity ("score").
+        """
+        query_vectors = np.asarray(query_vectors, dtype=np.float32).reshape(-1, self._dimension)
+        query_count = query_vectors.shape[0]
+
+        # a compaction renumbering the rows during the search makes it start over on the new matrix
+        missing_matrix_count = 0
+        while True:
+            try:
+                matrix, live_rows, matrix_version = self._get_matrix()
+            except FileNotFoundError:
+                # the matrix was deleted by a compaction committed after the configuration was read
+                missing_matrix_count = missing_matrix_count + 1
+                if missing_matrix_count >= self._SEARCH_ATTEMPTS:
+                    raise
+                continue
+
+            if (matrix is None) or (k <= 0):
+                return [[] for _ in range(query_count)]
+
+            candidate_count = min(k, self._BATCH_PARAMETER_COUNT)
+
+            candidate_rows = []
+            candidate_scores = []
+            for start in range(0, matrix.shape[0], self._SEARCH_BLOCK_ROWS):
+                scores = query_vectors @ np.asarray(matrix[start:start + self._SEARCH_BLOCK_ROWS]).T
+
+                # rows of deleted documents never take the place of live ones
+                scores[:, ~live_rows[start:start + self._SEARCH_BLOCK_ROWS]] = -np.inf
+
+                block_candidate_count = min(candidate_count, scores.shape[1])
+                block_rows = np.argpartition(-scores, block_candidate_count - 1, axis=1)[:, :block_candidate_count]
+                candidate_rows.append(block_rows + start)
+                candidate_scores.append(np.take_along_axis(scores, block_rows, axis=1))
+
+            candidate_rows = np.concatenate(candidate_rows, axis=1)
+            candidate_scores = np.concatenate(candidate_scores, axis=1)
+            order = np.argsort(-candidate_scores, axis=1)[:, :candidate_count]
+            candidate_rows = np.take_along_axis(candidate_rows, order, axis=1)
+            candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+            rows = list({int(row) for row in candidate_rows.flatten()})
+            chunks = {}
+            with self._connection_lock:
+                self._connection.execute("BEGIN")
+                try:
+                    current_matrix_version = self._connection.execute(
+                        "SELECT matrix_version FROM configuration WHERE id = 0"
+                    ).fetchone()[0]
+                    for index in range(0, len(rows), self._BATCH_PARAMETER_COUNT):
+                        batch = rows[index:index + self._BATCH_PARAMETER_COUNT]
+                        cursor = self._connection.execute(
+                            f"SELECT row, document_id, position, text FROM chunks WHERE row IN ({', '.join('?' * len(batch))})", batch
+                        )
+                        for row, document_id, position, text in cursor:
+                            chunks[row] = (document_id, position, text)
+                finally:
+                    self._connection.commit()
+
+            if current_matrix_version == matrix_version:
+                break
+
+        results = []
+        for query_rows, query_scores in zip(candidate_rows, candidate_scores):
+            query_results = []
+            for row, score in zip(query_rows, query_scores):
+                # rows of documents deleted since the mask was read are missing from the chunks
+                if (int(row) not in chunks) or (score <= 0):
+                    continue
+
+                document_id, position, text = chunks[int(row)]
+                query_results.append({"id": document_id, "position": position, "chunk": text, "score": float(score)})
+                if len(query_results) == k:
+                    break
+
+            results.append(query_results)
+
+        return results
+
+    def compact(self) -> int:
+        """
+        Rewrites the matrix without the rows of deleted documents, once they take a large part of it.
+        The rows in use are copied in order to a new version of the matrix, renumbered and the previous version is deleted.
+
+        Returns:
+            int: The number of rows removed from the matrix, 0 if compacting it was not worth it.
+        """
+        with self._connection_lock, self._connection:
+            # counting the compaction first takes the write lock, so no rows are reserved meanwhile
+            self._connection.execute("UPDATE configuration SET matrix_version = matrix_version + 1 WHERE id = 0")
+            row_count, matrix_version = self._connection.execute(
+                "SELECT row_count, matrix_version FROM configuration WHERE id = 0"
+            ).fetchone()
+            rows = [row for (row,) in self._connection.execute("SELECT row FROM chunks ORDER BY row")]
+
+            dead_row_count = row_count - len(rows)
+            if (dead_row_count == 0) or (dead_row_count < row_count * self._COMPACTION_DEAD_ROW_RATIO):
+                self._connection.rollback()
+                return 0
+
+            matrix = np.memmap(self._get_matrix_path(matrix_version - 1), dtype=np.float32, mode="r", shape=(row_count, self._dimension))
+            with open(self._get_matrix_path(matrix_version), "wb") as f:
+                for index in range(0, len(rows), self._SEARCH_BLOCK_ROWS):
+                    f.write(np.asarray(matrix[rows[index:index + self._SEARCH_BLOCK_ROWS]]).tobytes())
+            del matrix
+
+            # rows only move down, in ascending order each one lands on a row already freed
+            self._connection.executemany(
+                "UPDATE chunks SET row = ? WHERE row = ?",
+                [(new_row, row) for new_row, row in enumerate(rows) if new_row != row]
+            )
+            self._connection.execute("UPDATE configuration SET row_count = ? WHERE id = 0", (len(rows),))
+
+        self._delete_matrix(matrix_version - 1)
+
+        return dead_row_count
+
+    def close(self) -> None:
+        """
+        Releases the memory map and closes the connection to the SQLite index.
+        """
+        with self._connection_lock:
+            self._matrix = None
+            self._connection.close()
@@ -0,0 +1,52 @@
+import os
+import uuid
+
+import pytest
+
+from document_database import DocumentDatabase
+from storage.blob_store import BlobStore
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    blob_store = BlobStore(str(tmp_path))
+
+    key = blob_store.put("same content")
+
+    assert blob_store.put("same content") == key
+    assert blob_store.put("other content") != key
+    assert len(blob_store.list_keys()) == 2
+    assert blob_store.get(key) == "same content"
+    assert key.split("/")[1].startswith(BlobStore.get_hash("same content"))
+
+
+def test_legacy_uncompressed_blobs_are_readable(tmp_path):
+    # blobs written before content addressing are plain files named by a UUID
+    key = str(uuid.uuid4())
+    with open(os.path.join(str(tmp_path), key), "wb") as f:
+        f.write("légacy content".encode("utf-8"))
+
+    blob_store = BlobStore(str(tmp_path))
+
+    assert blob_store.get(key) == "légacy content"
+    with blob_store.open(key) as stream:
+        assert stream.read().decode("utf-8") == "légacy content"
+    assert key in blob_store.list_keys()
+
+
+@pytest.mark.parametrize("implementation", ["tinydb", "sqlite"])
+def test_shared_blobs_are_deleted_with_their_last_document(tmp_path, implementation):
+    database = DocumentDatabase.get_implementation(str(tmp_path), implementation = implementation, cache_size = 0)
+    blob_store = BlobStore(str(tmp_path / DocumentDatabase._DOCUMENT_DATABASE_CONTENT))
+
+    database.insert("first", {}, "shared content")
+    database.insert("second", {}, "shared content")
+    assert len(blob_store.list_keys()) == 1
+
+    database.delete("first")
+    assert database.get("second") == ({}, "shared content")
+    assert len(blob_store.list_keys()) == 1
+
+    database.delete("second")
+    assert blob_store.list_keys() == []
+
+    database.close()
@@ -0,0 +1,35 @@
+from document_database import DocumentDatabase, _TinyDBDocumentDatabase
+from storage.caching_document_database import CachingDocumentDatabase
+
+
+def test_documents_replaced_or_deleted_through_another_handle_are_not_served(tmp_path):
+    cached_database = CachingDocumentDatabase(_TinyDBDocumentDatabase(str(tmp_path)), 1024 * 1024)
+    other_database = DocumentDatabase.get_implementation(str(tmp_path))
+
+    other_database.insert("id", {"version": 1}, "content 1")
+    assert cached_database.get("id") == ({"version": 1}, "content 1")
+
+    other_database.delete("id")
+    other_database.insert("id", {"version": 2}, "content 2")
+    assert cached_database.get("id") == ({"version": 2}, "content 2")
+    assert cached_database.get_metadata("id") == {"version": 2}
+
+    other_database.delete("id")
+    assert not cached_database.has("id")
+    assert cached_database.get_many(["id"]) == {}
+
+    cached_database.close()
+    other_database.close()
+
+
+def test_cached_metadata_is_copied(tmp_path):
+    cached_database = CachingDocumentDatabase(_TinyDBDocumentDatabase(str(tmp_path)), 1024 * 1024)
+    cached_database.insert("id", {"tags": ["first"]}, "content")
+
+    cached_database.get("id")[0]["tags"].append("second")
+    cached_database.get_metadata("id")["tags"].append("third")
+
+    assert cached_database.get("id")[0] == {"tags": ["first"]}
+    assert cached_database.get_statistics()["hits"] > 0
+
+    cached_database.close()
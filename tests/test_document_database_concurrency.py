@@ -0,0 +1,51 @@
+import threading
+
+from document_database import _TinyDBDocumentDatabase
+
+# the number of threads reading through the shared instance
+_READER_COUNT = 4
+
+# the number of documents written through the other instance while the readers run
+_WRITE_COUNT = 30
+
+
+def test_readers_see_stored_documents_while_another_instance_writes(tmp_path):
+    # the workers of a process share one instance, another process writes to the same directory
+    shared_database = _TinyDBDocumentDatabase(str(tmp_path))
+    writing_database = _TinyDBDocumentDatabase(str(tmp_path))
+
+    for index in range(10):
+        writing_database.insert(f"id{index}", {"index": index}, f"content {index}")
+
+    stop = threading.Event()
+    missing_counts = [0] * _READER_COUNT
+    errors = []
+
+    def read(reader: int) -> None:
+        while not stop.is_set():
+            if not shared_database.has("id5"):
+                missing_counts[reader] += 1
+            try:
+                if shared_database.get("id5") != ({"index": 5}, "content 5"):
+                    errors.append("unexpected document")
+            except Exception as e:
+                errors.append(str(e))
+
+    readers = [threading.Thread(target=read, args=(reader,)) for reader in range(_READER_COUNT)]
+    for reader in readers:
+        reader.start()
+
+    try:
+        for index in range(10, 10 + _WRITE_COUNT):
+            writing_database.insert(f"id{index}", {"index": index}, f"content {index}")
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert missing_counts == [0] * _READER_COUNT
+    assert errors == []
+    assert all(shared_database.has_many([f"id{index}" for index in range(10 + _WRITE_COUNT)]).values())
+
+    shared_database.close()
+    writing_database.close()
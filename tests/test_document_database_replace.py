@@ -0,0 +1,32 @@
+from document_database import DocumentDatabase
+from storage.retention_document_database import RetentionPolicy
+from tools.library.embeddings import HashingEmbeddingFunction
+
+
+def test_replaced_documents_are_seen_by_every_layer_and_handle(tmp_path):
+    database = DocumentDatabase.get_implementation(
+        str(tmp_path),
+        retention_policy = RetentionPolicy(max_age = 60 * 60),
+        searchable = True,
+        embedding_function = HashingEmbeddingFunction()
+    )
+    other_database = DocumentDatabase.get_implementation(str(tmp_path))
+
+    database.insert("page", {"version": 1}, "the old text about rivers")
+    assert other_database.get("page") == ({"version": 1}, "the old text about rivers")
+    inserted_time = database.get_inserted_time("page")
+
+    database.replace("page", {"version": 2}, "the new text about mountains")
+
+    assert database.get_inserted_time("page") > inserted_time
+    assert other_database.get("page") == ({"version": 2}, "the new text about mountains")
+    assert [result["id"] for result in database.search("mountains")] == ["page"]
+    assert database.search("rivers") == []
+    assert database.search_similar(["mountains"], 5)[0][0]["chunk"] == "the new text about mountains"
+
+    # a document not stored yet is inserted
+    database.replace("other", {}, "content")
+    assert database.has("other")
+
+    database.close()
+    other_database.close()
@@ -0,0 +1,73 @@
+import pytest
+
+from tools.library.document_properties import MIN_CONFIDENCE, extract_authors, extract_title
+
+
+def test_headline_repeated_in_the_page_title_is_certain():
+    metadata = {"headline": "Navy announces harbour blockade", "title": "Navy announces harbour blockade | Daily Record"}
+
+    assert extract_title(metadata) == ("Navy announces harbour blockade", 1.0)
+
+
+def test_headline_not_in_the_page_title_is_likely():
+    metadata = {"headline": "Navy announces harbour blockade", "title": "Daily Record"}
+
+    assert extract_title(metadata) == ("Navy announces harbour blockade", 0.9)
+
+
+@pytest.mark.parametrize("title, site_name, expected_title", [
+    ("Harbour blockade announced | Daily Record", "Daily Record", "Harbour blockade announced"),
+    ("DAILY RECORD - Harbour blockade announced", "Daily Record", "Harbour blockade announced"),
+    ("Harbour blockade announced – Daily Record", "daily record ", "Harbour blockade announced")
+])
+def test_site_name_is_stripped_from_the_page_title(title, site_name, expected_title):
+    assert extract_title({"title": title, "site_name": site_name}) == (expected_title, 0.8)
+
+
+def test_separated_title_without_known_site_name_is_left_to_the_agents():
+    title, confidence = extract_title({"title": "Harbour blockade announced | Daily Record"})
+
+    assert title == "Harbour blockade announced | Daily Record"
+    assert confidence == 0.6 < MIN_CONFIDENCE
+
+
+def test_ambiguous_headline_is_less_certain():
+    metadata = {"headline": "Ports | Harbour blockade announced", "site_name": "Daily Record"}
+
+    assert extract_title(metadata) == ("Ports | Harbour blockade announced", pytest.approx(0.7))
+
+
+@pytest.mark.parametrize("metadata", [
+    {},
+    {"title": "Home"},
+    {"title": "Untitled | Daily Record", "site_name": "Daily Record"},
+    {"headline": "News", "title": "Blockade"}
+])
+def test_generic_or_missing_titles_are_not_found(metadata):
+    assert extract_title(metadata) == (None, 0.0)
+
+
+def test_generic_headline_falls_back_to_the_page_title():
+    metadata = {"headline": "Article", "title": "Harbour blockade announced | Daily Record", "site_name": "Daily Record"}
+
+    assert extract_title(metadata) == ("Harbour blockade announced", 0.8)
+
+
+def test_authors_are_joined():
+    assert extract_authors({"authors": ["Jane Doe", "John Roe"]}) == ("Jane Doe, John Roe", 0.9)
+
+
+@pytest.mark.parametrize("authors", [
+    None,
+    [],
+    [""],
+    ["Jane Doe is a correspondent covering defence and maritime affairs"]
+])
+def test_missing_authors_or_descriptions_are_left_to_the_agents(authors):
+    assert extract_authors({"authors": authors}) == (None, 0.0)
+
+
+def test_descriptions_are_left_out_of_the_authors():
+    metadata = {"authors": ["Jane Doe", "Jane Doe is a correspondent covering defence and maritime affairs"]}
+
+    assert extract_authors(metadata) == ("Jane Doe", 0.9)
@@ -0,0 +1,77 @@
+import math
+
+from document_database import DocumentDatabase
+from storage.full_text_index import FullTextIndex
+
+
+def test_passages_are_ranked_with_bm25(tmp_path):
+    index = FullTextIndex(str(tmp_path / "index.sqlite"))
+    index.add_many([
+        ("frequent", ["sanctions on oil exports, sanctions on banks"]),
+        ("once", ["sanction on oil exports"]),
+        ("unrelated", ["weather report for the harbour"])
+    ])
+
+    results = index.search("sanctions")
+
+    # plurals match their singular, the passage repeating the term ranks first
+    assert [result["id"] for result in results] == ["frequent", "once"]
+    assert results[0]["score"] > results[1]["score"] > 0
+
+    # a term found in a single passage weighs more than a term found in most
+    assert index.search("banks oil", k = 1)[0]["id"] == "frequent"
+
+    index.close()
+
+
+def test_score_follows_the_bm25_formula(tmp_path):
+    index = FullTextIndex(str(tmp_path / "index.sqlite"))
+    index.add("first", ["harbour blockade"])
+    index.add("second", ["naval exercise near the coast"])
+
+    # two passages of two and four terms, the query term appears once in the first one
+    inverse_document_frequency = math.log(1 + (2 - 1 + 0.5) / (1 + 0.5))
+    normalization = 1.2 * (1 - 0.75 + 0.75 * 2 / 3)
+    expected_score = inverse_document_frequency * 2.2 / (1 + normalization)
+
+    result = index.search("blockade")[0]
+    assert (result["id"], result["position"], result["passage"]) == ("first", 0, "harbour blockade")
+    assert math.isclose(result["score"], expected_score)
+
+    index.close()
+
+
+def test_index_follows_the_documents_replaced_and_deleted(tmp_path):
+    index = FullTextIndex(str(tmp_path / "index.sqlite"))
+    index.add("id", ["blockade of the harbour"])
+    index.add("id", ["ceasefire agreement"])
+
+    assert index.search("blockade") == []
+    assert [result["id"] for result in index.search("ceasefire")] == ["id"]
+
+    index.remove_many(["id", "never indexed"])
+    assert index.search("ceasefire") == []
+    assert index.get_document_ids() == set()
+
+    index.close()
+
+
+def test_searchable_database_keeps_its_index_in_sync(tmp_path):
+    database = DocumentDatabase.get_implementation(str(tmp_path), searchable = True)
+    database.insert("kept", {"title": "Harbour blockade"}, "The navy blockades the harbour.")
+    database.insert("deleted", {}, "A blockade was announced.")
+    database.insert("deleted through another handle", {}, "The blockade is lifted.")
+
+    database.delete("deleted")
+    assert {result["id"] for result in database.search("blockade")} == {"kept", "deleted through another handle"}
+
+    # documents deleted without the index are removed from it once it is opened again
+    other_database = DocumentDatabase.get_implementation(str(tmp_path))
+    other_database.delete("deleted through another handle")
+    other_database.close()
+    database.close()
+
+    database = DocumentDatabase.get_implementation(str(tmp_path), searchable = True)
+    assert {result["id"] for result in database.search("blockade")} == {"kept"}
+
+    database.close()
@@ -0,0 +1,69 @@
+import os
+
+from tools.library.html_metadata import HtmlMetadataParser, extract_html_metadata
+
+_FIXTURE_DIRECTORY = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _read_fixture(file_name: str) -> str:
+    with open(os.path.join(_FIXTURE_DIRECTORY, file_name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_news_article_properties():
+    metadata = extract_html_metadata(_read_fixture("news_article.html"))
+
+    assert metadata == {
+        # the title of the page, not the one of the logo
+        "title": "Navy announces harbour blockade | The Daily Record",
+        "headline": "Navy announces blockade of the northern harbour",
+        "description": "The navy announced a blockade of the northern harbour on Monday.",
+        "site_name": "The Daily Record",
+        "language": "en-GB",
+        "published_time": "2024-03-04T08:30:00Z",
+        "modified_time": "2024-03-04T12:00:00Z",
+        "canonical_url": "https://example.com/news/harbour-blockade",
+        # people only, without bylines, profile links or repetitions
+        "authors": ["Jane Doe", "John Roe"],
+        "keywords": ["Navy", "Blockade", "harbour", "Ports"]
+    }
+
+
+def test_page_fed_in_pieces_gives_the_same_properties():
+    content = _read_fixture("news_article.html")
+
+    parser = HtmlMetadataParser()
+    for start in range(0, len(content), 7):
+        parser.feed(content[start:start + 7])
+    parser.close()
+
+    assert parser.get_metadata() == extract_html_metadata(content)
+
+
+def test_structured_data_fills_the_missing_meta_tags():
+    metadata = extract_html_metadata("""
+        <html><head><title> Report
+            on ports </title></head>
+        <body>
+            <script type="application/ld+json">{ not json }</script>
+            <script type="application/ld+json">
+                [{"@type": ["Report"], "headline": "Ports report", "datePublished": "2024-01-15",
+                  "author": "Jane Doe", "keywords": "ports, shipping",
+                  "publisher": {"@type": "Organization", "name": "Ports Authority"}}]
+            </script>
+        </body></html>
+    """)
+
+    assert metadata == {
+        "title": "Report on ports",
+        "headline": "Ports report",
+        "site_name": "Ports Authority",
+        "published_time": "2024-01-15",
+        "authors": ["Jane Doe"],
+        "keywords": ["ports", "shipping"]
+    }
+
+
+def test_page_without_head_or_properties():
+    assert extract_html_metadata("<p>Just a paragraph</p>") == {}
+    assert extract_html_metadata('<meta name="author" content="Jane Doe"><p>Text</p>') == {"authors": ["Jane Doe"]}
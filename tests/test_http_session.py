@@ -0,0 +1,24 @@
+from urllib3 import HTTPResponse
+
+from content.http_session import HttpSessionConfiguration, create_http_session, get_retry_delay
+
+
+def test_session_retries_wait_at_most_the_maximum_delay():
+    session = create_http_session(HttpSessionConfiguration())
+    retry = session.get_adapter("https://example.com").max_retries
+
+    assert retry.get_retry_after(HTTPResponse(headers={"Retry-After": "3600"})) == 120
+    assert retry.get_retry_after(HTTPResponse(headers={"Retry-After": "5"})) == 5
+    assert retry.get_retry_after(HTTPResponse()) is None
+
+    # the copies made at each retry keep the cap
+    assert retry.increment(method="GET", url="/").get_retry_after(HTTPResponse(headers={"Retry-After": "3600"})) == 120
+
+    session.close()
+
+
+def test_async_retry_delay_is_capped_like_the_session_one():
+    configuration = HttpSessionConfiguration()
+
+    assert get_retry_delay(configuration, 0, {"Retry-After": "3600"}) == 120
+    assert get_retry_delay(configuration, 2, {}) == configuration.retry_backoff * 4
@@ -0,0 +1,55 @@
+import os
+
+from tools.library.main_content import extract_main_content
+
+_FIXTURE_DIRECTORY = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _read_fixture(file_name: str) -> str:
+    with open(os.path.join(_FIXTURE_DIRECTORY, file_name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_news_article_is_kept_without_the_page_chrome():
+    markdown, _ = extract_main_content(_read_fixture("news_article.html"))
+
+    assert markdown == (
+        "Navy announces harbour blockade | The Daily Record\n\n"
+        "# Navy announces blockade of the northern harbour\n\n"
+        "The navy announced on Monday a blockade of the northern harbour, citing repeated incidents near the coast, "
+        "according to officials speaking at a press conference.\n\n"
+        "Merchant ships already at anchor will be allowed to leave, while new arrivals will be redirected to the southern ports, "
+        "a decision expected to delay deliveries for several weeks.\n\n"
+        "## Reactions\n\n"
+        "Shipping companies criticised the decision, saying the notice given to crews, insurers and port authorities "
+        "was far too short to reorganise their routes."
+    )
+
+
+def test_article_split_over_sections_is_taken_whole():
+    markdown, _ = extract_main_content(_read_fixture("report_sections.html"))
+
+    assert markdown.startswith("Energy security report\n\n## Summary\n\nGas reserves")
+    assert "## Sources" in markdown
+    assert markdown.endswith("published again in the annex.")
+
+    # links citing sources within a paragraph are kept
+    assert "[national energy agency](https://example.com/agency)" in markdown
+
+    # navigation, menus, hidden elements, sidebars and styles are left out
+    for removed_text in ["Home", "Reports archive", "Draft paragraph", "Screen readers", "Popular", "color"]:
+        assert removed_text not in markdown
+
+
+def test_title_is_not_repeated_and_statistics_are_given():
+    html = "<html><head><title>Short note</title></head><body><h1>Short note</h1><p>A single short line.</p></body></html>"
+
+    markdown, statistics = extract_main_content(html)
+
+    assert markdown == "# Short note\n\nA single short line."
+    assert statistics == {
+        "html_characters": len(html),
+        "html_tokens": len(html) // 4,
+        "markdown_characters": len(markdown),
+        "markdown_tokens": len(markdown) // 4
+    }
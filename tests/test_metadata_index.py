@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from document_database import DocumentDatabase
+from storage.metadata_index import MetadataIndex, parse_time
+
+_DEFINITIONS = {"keywords": MetadataIndex.KIND_TERM, "authors": MetadataIndex.KIND_TERM, "time": MetadataIndex.KIND_TIME}
+
+_JANUARY = datetime(2024, 1, 15, tzinfo=timezone.utc).timestamp()
+_MARCH = datetime(2024, 3, 15, tzinfo=timezone.utc).timestamp()
+
+
+def _open_index(tmp_path) -> MetadataIndex:
+    index = MetadataIndex(str(tmp_path / "metadata.sqlite"), _DEFINITIONS)
+    index.add_many([
+        ("first", {"keywords": "Ukraine, NATO;  Sanctions", "authors": ["Jane Doe"], "time": "2024-01-15"}, 1),
+        ("second", {"keywords": ["sanctions", "energy"], "authors": ["John Roe"], "time": "Fri, 15 Mar 2024 00:00:00 GMT"}, 2),
+        ("third", {"keywords": ["energy"]}, 3)
+    ])
+    return index
+
+
+def test_terms_match_regardless_of_case_spacing_and_separators(tmp_path):
+    index = _open_index(tmp_path)
+
+    # the most recently inserted documents come first
+    assert index.find({"keywords": " SANCTIONS "}) == ["second", "first"]
+    assert index.find({"keywords": "nato"}) == ["first"]
+    assert index.find({"keywords": "energy", "authors": "john roe"}) == ["second"]
+    assert index.find({"keywords": "unknown"}) == []
+
+    index.close()
+
+
+def test_time_ranges_include_their_start_and_exclude_their_end(tmp_path):
+    index = _open_index(tmp_path)
+
+    assert index.find(time_ranges = {"time": (_JANUARY, _MARCH)}) == ["first"]
+    assert index.find(time_ranges = {"time": (_JANUARY, None)}) == ["second", "first"]
+    assert index.find(time_ranges = {"time": (None, _JANUARY)}) == []
+    assert index.find({"keywords": "sanctions"}, {"time": (_MARCH, None)}) == ["second"]
+    assert index.find(time_ranges = {MetadataIndex.KEY_INSERTED_AT: (2, None)}) == ["third", "second"]
+
+    # without conditions every document is found
+    assert index.find() == ["third", "second", "first"]
+
+    index.close()
+
+
+def test_queries_need_an_index_of_the_right_kind(tmp_path):
+    index = _open_index(tmp_path)
+
+    with pytest.raises(Exception):
+        index.find({"time": "2024"})
+    with pytest.raises(Exception):
+        index.find(time_ranges = {"keywords": (0, None)})
+    with pytest.raises(Exception):
+        index.find({"title": "report"})
+
+    index.close()
+
+
+def test_indexes_built_for_other_definitions_are_emptied(tmp_path):
+    _open_index(tmp_path).close()
+
+    index = MetadataIndex(str(tmp_path / "metadata.sqlite"), {"keywords": MetadataIndex.KIND_TERM})
+    assert index.get_document_ids() == set()
+
+    index.close()
+
+
+def test_indexed_database_follows_deletions(tmp_path):
+    database = DocumentDatabase.get_implementation(str(tmp_path), metadata_indexes = {"keywords": "term"})
+    database.insert("first", {"keywords": ["energy"]}, "content")
+    database.insert("second", {"keywords": ["energy"]}, "other content")
+
+    database.delete("first")
+    assert database.find({"keywords": "energy"}) == ["second"]
+
+    database.close()
+
+
+def test_parse_time():
+    assert parse_time(1700000000) == 1700000000.0
+    assert parse_time(True) is None
+    assert parse_time(None) is None
+    assert parse_time("not a date") is None
+
+    # dates without time zone are taken as UTC
+    assert parse_time("2024-01-15") == _JANUARY
+    assert parse_time(" 2024-01-15T00:00:00 ") == _JANUARY
+    assert parse_time("2024-01-15T02:00:00+02:00") == _JANUARY
+    assert parse_time("Fri, 15 Mar 2024 00:00:00 GMT") == _MARCH
@@ -0,0 +1,67 @@
+from tools.library.passages import split_chunks
+
+_MAX_CHARACTERS = 400
+
+
+def _get_paragraph(index: int, word_count: int = 12) -> str:
+    return " ".join(f"word{index}x{position}" for position in range(word_count))
+
+
+def _get_section(index: int, paragraph_count: int = 3) -> str:
+    return "\n\n".join([f"## Section {index}"] + [_get_paragraph(index * 10 + position) for position in range(paragraph_count)])
+
+
+def test_empty_text_has_no_chunk():
+    assert split_chunks("") == []
+    assert split_chunks("\n\n  \n\n") == []
+
+
+def test_paragraphs_are_grouped_within_the_size_limit():
+    paragraphs = [_get_paragraph(index, index % 7 + 3) for index in range(40)]
+
+    chunks = split_chunks("\n\n\n".join(paragraphs), _MAX_CHARACTERS)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= _MAX_CHARACTERS for chunk in chunks)
+    # paragraphs are never cut when they fit a chunk, nor reordered
+    assert "\n\n".join(chunks).split("\n\n") == paragraphs
+
+
+def test_headings_start_a_chunk_once_it_is_a_quarter_full():
+    text = "\n\n".join(["# Title", "Short introduction."] + [_get_section(index) for index in range(3)])
+
+    chunks = split_chunks(text, _MAX_CHARACTERS)
+
+    # the introduction is too short to stand alone, the first section joins it
+    assert chunks[0].startswith("# Title\n\nShort introduction.\n\n## Section 0")
+    assert [chunk.split("\n\n")[0] for chunk in chunks[1:]] == ["## Section 1", "## Section 2"]
+
+
+def test_an_edit_only_moves_the_chunks_of_its_section():
+    sections = [_get_section(index) for index in range(4)]
+    edited_sections = list(sections)
+    edited_sections[1] = edited_sections[1] + "\n\n" + _get_paragraph(99, 30)
+
+    chunks = split_chunks("\n\n".join(sections), _MAX_CHARACTERS)
+    edited_chunks = split_chunks("\n\n".join(edited_sections), _MAX_CHARACTERS)
+
+    assert len(edited_chunks) == len(chunks) + 1
+    assert edited_chunks[0] == chunks[0]
+    assert edited_chunks[-2:] == chunks[-2:]
+
+
+def test_long_paragraphs_are_cut_at_word_boundaries():
+    paragraph = _get_paragraph(1, 100)
+
+    chunks = split_chunks("Introduction.\n\n" + paragraph, _MAX_CHARACTERS)
+
+    assert all(len(chunk) <= _MAX_CHARACTERS for chunk in chunks)
+    # the current chunk is filled first, then no word is split
+    assert chunks[0].startswith("Introduction.\n\nword1x0 ")
+    assert " ".join(chunks).split() == ["Introduction."] + paragraph.split()
+
+
+def test_words_longer_than_a_chunk_are_cut():
+    chunks = split_chunks("Introduction.\n\n" + "x" * 1000, _MAX_CHARACTERS)
+
+    assert chunks == ["Introduction.", "x" * 400, "x" * 400, "x" * 200]
@@ -0,0 +1,109 @@
+import json
+import time
+
+import pytest
+
+from document_database import DocumentDatabase
+from storage.retention_document_database import RetentionPolicy
+
+
+def test_inserts_evict_documents_once_the_compaction_is_due(tmp_path):
+    # a long-running process keeps the store open, the inserts compact it
+    database = DocumentDatabase.get_implementation(
+        str(tmp_path), retention_policy = RetentionPolicy(max_entries = 3, compaction_interval = 0)
+    )
+
+    for index in range(6):
+        database.insert(f"id{index}", {}, f"content {index}")
+
+    assert len(database.get_storage_information()) == 3
+    assert [database.has(f"id{index}") for index in range(6)] == [False, False, False, True, True, True]
+
+    database.close()
+
+
+def test_inserts_do_not_compact_before_the_interval(tmp_path):
+    database = DocumentDatabase.get_implementation(
+        str(tmp_path), retention_policy = RetentionPolicy(max_entries = 3, compaction_interval = 60 * 60)
+    )
+
+    for index in range(6):
+        database.insert(f"id{index}", {}, f"content {index}")
+
+    assert len(database.get_storage_information()) == 6
+
+    database.close()
+
+
+def _open(path, **policy) -> DocumentDatabase:
+    # compactions only run when the tests ask for them
+    return DocumentDatabase.get_implementation(
+        str(path), cache_size = 0, retention_policy = RetentionPolicy(compaction_interval = 60 * 60, **policy)
+    )
+
+
+def test_least_recently_used_documents_are_evicted_first(tmp_path):
+    database = _open(tmp_path, max_entries = 2, eviction = RetentionPolicy.EVICTION_LRU)
+    for id in ["a", "b", "c", "d"]:
+        database.insert(id, {}, f"content {id}")
+    database.get("a")
+
+    assert database.compact()["evicted"] == 2
+    assert [database.has(id) for id in ["a", "b", "c", "d"]] == [True, False, False, True]
+
+    database.close()
+
+
+def test_least_frequently_used_documents_are_evicted_first(tmp_path):
+    database = _open(tmp_path, max_entries = 2, eviction = RetentionPolicy.EVICTION_LFU)
+    for id in ["a", "b", "c", "d"]:
+        database.insert(id, {}, f"content {id}")
+    for id, access_count in [("a", 3), ("b", 2), ("c", 1)]:
+        for _ in range(access_count):
+            database.get(id)
+
+    database.compact()
+    assert [database.has(id) for id in ["a", "b", "c", "d"]] == [True, True, False, False]
+
+    database.close()
+
+
+def test_stale_documents_are_reported_missing_and_replaced(tmp_path, monkeypatch):
+    database = _open(tmp_path, max_age = 60)
+    database.insert("id", {"version": 1}, "content 1")
+    assert database.has("id")
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+
+    assert not database.has("id")
+    assert database.has_many(["id"]) == {"id": False}
+    assert database.get_many(["id"]) == {}
+    with pytest.raises(Exception):
+        database.get("id")
+
+    # the stale version makes room for the new one
+    database.insert("id", {"version": 2}, "content 2")
+    assert database.get("id") == ({"version": 2}, "content 2")
+
+    database.close()
+
+
+def test_usage_is_saved_for_the_compactions_of_other_handles(tmp_path):
+    database = _open(tmp_path, eviction = RetentionPolicy.EVICTION_LFU)
+    for id in ["a", "b", "c"]:
+        database.insert(id, {}, f"content {id}")
+    database.get("a")
+    database.get("a")
+    database.save_usage()
+    database.close()
+
+    with open(tmp_path / "usage.json", "r", encoding="utf-8") as f:
+        assert json.load(f)["documents"]["a"][1] == 2
+
+    # without the saved usage the oldest document would be evicted first
+    other_database = _open(tmp_path, max_entries = 2, eviction = RetentionPolicy.EVICTION_LFU)
+    other_database.compact()
+    assert [other_database.has(id) for id in ["a", "b", "c"]] == [True, False, True]
+
+    other_database.close()
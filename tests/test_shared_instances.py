@@ -0,0 +1,72 @@
+import threading
+import time
+
+from tools.library.shared_instances import SharedInstanceRegistry
+
+# the number of threads acquiring the same instance at once
+_ACQUIRER_COUNT = 8
+
+
+class _Instance:
+    def __init__(self):
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_slow_creation_is_shared_and_does_not_block_other_keys():
+    registry = SharedInstanceRegistry()
+    creation_count = 0
+    creation_started = threading.Event()
+
+    def create_slowly() -> _Instance:
+        nonlocal creation_count
+        creation_count += 1
+        creation_started.set()
+        time.sleep(0.5)
+        return _Instance()
+
+    instances = []
+    threads = [threading.Thread(target=lambda: instances.append(registry.acquire("slow", create_slowly))) for _ in range(_ACQUIRER_COUNT)]
+    for thread in threads:
+        thread.start()
+
+    # another key is served while the slow instance is being created
+    creation_started.wait()
+    start = time.perf_counter()
+    other_instance = registry.acquire("other", _Instance)
+    assert time.perf_counter() - start < 0.25
+
+    for thread in threads:
+        thread.join()
+
+    assert creation_count == 1
+    assert len(instances) == _ACQUIRER_COUNT
+    assert all(instance is instances[0] for instance in instances)
+
+    # every acquisition is counted, the instance is only unused once all of them are released
+    for instance in instances[1:]:
+        registry.release(instance)
+    registry.release(other_instance)
+    registry.close_unused()
+    assert other_instance.closed and not instances[0].closed
+
+    registry.release(instances[0])
+    registry.close_unused()
+    assert instances[0].closed
+
+
+def test_factory_may_acquire_other_instances():
+    registry = SharedInstanceRegistry()
+
+    def create_outer() -> _Instance:
+        instance = _Instance()
+        instance.inner = registry.acquire("inner", _Instance)
+        return instance
+
+    outer = registry.acquire("outer", create_outer)
+
+    assert registry.acquire("inner", _Instance) is outer.inner
+
+    registry.close_all()
@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+
+from document_database import DocumentDatabase
+from storage.vector_index import VectorIndex
+from tools.library.embeddings import HashingEmbeddingFunction
+
+_DIMENSION = 4
+
+
+def _vector(*components) -> np.ndarray:
+    vector = np.asarray(components, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _open_index(tmp_path, embedding_name: str = "test") -> VectorIndex:
+    return VectorIndex(str(tmp_path / "vectors.sqlite"), str(tmp_path / "vectors.f32"), embedding_name, _DIMENSION)
+
+
+def _get_ids(results):
+    return [[(result["id"], result["position"]) for result in query_results] for query_results in results]
+
+
+def test_nearest_chunks_are_found_for_each_query(tmp_path):
+    index = _open_index(tmp_path)
+    index.add_many([
+        ("a", ["first", "second"], np.stack([_vector(1, 0, 0, 0), _vector(0, 1, 0, 0)])),
+        ("b", ["third"], np.stack([_vector(1, 0, 1, 0)])),
+        ("c", ["fourth"], np.stack([_vector(0, 0, 0, 1)]))
+    ])
+
+    results = index.search(np.stack([_vector(1, 0, 0, 0), _vector(0, 1, 0, 0)]), k = 3)
+
+    # chunks without any similarity are left out
+    assert _get_ids(results) == [[("a", 0), ("b", 0)], [("a", 1)]]
+    assert results[0][0]["chunk"] == "first"
+    assert np.isclose(results[0][0]["score"], 1) and np.isclose(results[0][1]["score"], np.sqrt(0.5))
+
+    assert _get_ids(index.search(_vector(1, 0, 0, 0), k = 1)) == [[("a", 0)]]
+
+    index.close()
+
+
+def test_chunks_of_deleted_documents_are_hidden(tmp_path):
+    index = _open_index(tmp_path)
+    index.add_many([
+        ("deleted", [f"chunk {position}" for position in range(8)], np.stack([_vector(1, 0, 0, 0)] * 8)),
+        ("kept", ["kept chunk"], np.stack([_vector(1, 1, 0, 0)]))
+    ])
+    index.search(_vector(1, 0, 0, 0))
+
+    # the closest rows are masked before the best ones are selected, so fewer results are never returned
+    index.remove_many(["deleted"])
+    assert _get_ids(index.search(_vector(1, 0, 0, 0), k = 1)) == [[("kept", 0)]]
+
+    # a document indexed again only keeps its new chunks
+    index.add_many([("kept", ["new chunk"], np.stack([_vector(0, 0, 1, 0)]))])
+    assert _get_ids(index.search(_vector(1, 0, 0, 0))) == [[]]
+    assert index.get_document_ids() == {"kept"}
+
+    index.close()
+
+
+def test_compaction_rewrites_the_matrix_without_dead_rows(tmp_path):
+    index = _open_index(tmp_path)
+    other_index = _open_index(tmp_path)
+    index.add_many([
+        (str(document), ["chunk"], np.stack([_vector(*np.eye(_DIMENSION)[document])])) for document in range(_DIMENSION)
+    ])
+    assert other_index.search(_vector(0, 0, 0, 1), k = 1)[0][0]["id"] == "3"
+
+    index.remove_many(["0", "1"])
+    assert index.compact() == 2
+    assert not os.path.exists(tmp_path / "vectors.f32")
+    assert os.path.getsize(tmp_path / "vectors.f32.1") == 2 * _DIMENSION * 4
+
+    # the rows kept are renumbered, handles opened before the compaction map the new matrix
+    for search_index in (index, other_index):
+        assert _get_ids(search_index.search(np.stack([_vector(0, 0, 1, 0), _vector(0, 0, 0, 1)]), k = 1)) == [[("2", 0)], [("3", 0)]]
+
+    # compacting is not worth it until enough rows are dead
+    index.add_many([("4", ["chunk"], np.stack([_vector(1, 0, 0, 0)]))])
+    assert index.compact() == 0
+    assert _get_ids(index.search(_vector(1, 0, 0, 0), k = 1)) == [[("4", 0)]]
+
+    index.close()
+    other_index.close()
+
+
+def test_index_built_with_another_embedding_is_emptied(tmp_path):
+    index = _open_index(tmp_path)
+    index.add_many([("a", ["chunk"], np.stack([_vector(1, 0, 0, 0)]))])
+    index.close()
+
+    index = _open_index(tmp_path, "other")
+    assert index.get_document_ids() == set()
+    assert index.search(_vector(1, 0, 0, 0)) == [[]]
+
+    index.close()
+
+
+def test_vector_database_finds_the_chunks_of_its_documents(tmp_path):
+    database = DocumentDatabase.get_implementation(str(tmp_path), embedding_function = HashingEmbeddingFunction())
+    database.insert("blockade", {"title": "Harbour"}, "The navy announced a blockade of the harbour.")
+    database.insert("election", {}, "The parliament election results were published.")
+    database.insert("deleted", {}, "Another blockade was announced.")
+    database.delete("deleted")
+
+    results = database.search_similar(["harbour blockade", "election results"], k = 1)
+    assert [[result["id"] for result in query_results] for query_results in results] == [["blockade"], ["election"]]
+
+    database.close()
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import content.web_content_provider as web_content_provider_module
+
+from content.web_content_provider import WebContentProvider
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"<html><body><p>Page</p></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_async_clients_are_closed_with_the_block_or_the_request(tmp_path, monkeypatch):
+    monkeypatch.setattr(WebContentProvider, "_DOCUMENT_STORAGE", str(tmp_path / "raw"))
+    monkeypatch.setattr(WebContentProvider, "_MAIN_CONTENT_STORAGE", str(tmp_path / "main_content"))
+
+    clients = []
+    create_async_http_client = web_content_provider_module.create_async_http_client
+    def create_recorded_client(configuration):
+        clients.append(create_async_http_client(configuration))
+        return clients[-1]
+    monkeypatch.setattr(web_content_provider_module, "create_async_http_client", create_recorded_client)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    provider = WebContentProvider()
+    try:
+        async def fetch_in_block():
+            async with provider.async_http_client():
+                await provider._afetch(url)
+                await provider._afetch(url)
+                assert not clients[0].is_closed
+
+        # the fetches awaited in the block share its client
+        asyncio.run(fetch_in_block())
+        assert len(clients) == 1
+
+        # a fetch outside of a block gets a client of its own, closed before its event loop ends
+        status_code, _, content = asyncio.run(provider._afetch(url))
+        assert status_code == 200 and "Page" in content
+        assert len(clients) == 2
+
+        assert all(client.is_closed for client in clients)
+    finally:
+        provider.close()
+        server.shutdown()
@@ -1,26 +1,32 @@
-from typing import Tuple, Dict, Any
-from markdownify import markdownify
+import asyncio
 
-def retrieve_metadata_and_content_from_url(url: str) -> Tuple[Dict[str, Any], str]:
+from typing import Tuple, Dict, Any, List
+
+def retrieve_metadata_and_content_from_url(url: str, refresh: bool = False) -> Tuple[Dict[str, Any], str]:
     """
     Fetches a webpage and returns its metadata together with the main content converted to Markdown.
     This can be used as a tool.
     
     Args:
         url (str): The URL to retrieve.
+        refresh (bool): Whether a cached page is checked with the server, and fetched again only if it changed.
 
     Returns:
         Tuple[Dict[str, Any], str]: 
             - Dictionary containing page metadata (title, description, etc.)
             - Page content converted to Markdown (ATX-style headings)
     """
+    from content.provider import ContentProvider
     from content.web_content_provider import WebContentProvider
 
-    web_content_provider = WebContentProvider()
-    # retrieve raw HTML and extracted metadata from the webpage
-    metadata, content = web_content_provider.retrieve(url)
-    # convert the retrieved HTML content to clean Markdown using ATX-style headings
-    markdownified_content = markdownify(content, heading_style="ATX")
+    # the provider and its cache are shared by all the tool calls of the process
+    web_content_provider = ContentProvider.acquire(WebContentProvider)
+    try:
+        # retrieve the extracted metadata and the main content of the webpage, converted to clean Markdown 
+        # using ATX-style headings, the conversion being cached along with the raw HTML
+        metadata, markdownified_content = web_content_provider.retrieve_main_content(url, refresh)
+    finally:
+        ContentProvider.release(web_content_provider)
     
     return metadata, markdownified_content
 
@@ -41,25 +47,30 @@ def retrieve_content_from_url(url: str) -> str:
     return content
 
 
-def retrieve_curated_metadata_and_content_from_url(url: str) -> Tuple[Dict[str, Any], str]:
+def retrieve_curated_metadata_and_content_from_url(url: str, refresh: bool = False) -> Tuple[Dict[str, Any], str]:
     """
     Retrieves metadata and cleaned content from a curated source.
     This can be used as a tool.
     
     Args:
         url (str): The URL of the curated page.
+        refresh (bool): Whether the source page is checked with the server, and curated again only if it changed.
 
     Returns:
         Tuple[Dict[str, Any], str]:
             - Dictionary with page metadata
             - Cleaned text content (typically already structured)
     """
+    from content.provider import ContentProvider
     from content.curated_content_provider import CuratedContentProvider
 
-    curated_content_provider = CuratedContentProvider()
-    
-    # curated sources provide pre-cleaned content and structured metadata
-    metadata, content = curated_content_provider.retrieve(url)
+    # the provider and its cache are shared by all the tool calls of the process
+    curated_content_provider = ContentProvider.acquire(CuratedContentProvider)
+    try:
+        # curated sources provide pre-cleaned content and structured metadata
+        metadata, content = curated_content_provider.retrieve(url, refresh)
+    finally:
+        ContentProvider.release(curated_content_provider)
     
     return metadata, content
 
@@ -97,7 +108,22 @@ def retrieve_curated_document_content_from_url(url: str) -> str:
     
     # fetch both metadata and cleaned content from the curated source
     metadata, content = retrieve_curated_metadata_and_content_from_url(url)
-    
+
+    return _format_curated_document(url, metadata, content)
+
+
+def _format_curated_document(url: str, metadata: Dict[str, Any], content: str) -> str:
+    """
+    Formats a curated page as a self-contained Markdown document.
+
+    Args:
+        url (str): The URL of the curated document.
+        metadata (Dict[str, Any]): The metadata of the curated document.
+        content (str): The cleaned content of the curated document.
+
+    Returns:
+        str: Complete Markdown document with header information and content.
+    """
     # extract key fields for the document header
     title = metadata["title"]
     keywords = metadata["keywords"]
@@ -121,4 +147,257 @@ def retrieve_curated_document_content_from_url(url: str) -> str:
 """
 
     # return the complete document (leading/trailing newlines are intentional for clean rendering)
-    return document_content.strip() + "\n"
\ No newline at end of file
+    return document_content.strip() + "\n"
+
+
+def search_curated_documents(query: str, k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Searches the already curated documents for the passages best matching a query.
+    Only the matching passages are returned, not the whole documents.
+    This can be used as a tool.
+
+    Args:
+        query (str): The keywords or the question to search for.
+        k (int): The maximum number of passages to return.
+
+    Returns:
+        List[Dict[str, Any]]: The best matching passages first, each with:
+            - url: the URL of the curated document
+            - title: the title of the curated document
+            - passage: the text of the passage
+            - score: the relevance of the passage to the query
+    """
+    from content.provider import ContentProvider
+    from content.curated_content_provider import CuratedContentProvider
+
+    curated_content_provider = ContentProvider.acquire(CuratedContentProvider)
+    try:
+        passages = curated_content_provider.search(query, k)
+    finally:
+        ContentProvider.release(curated_content_provider)
+
+    for passage in passages:
+        passage["score"] = round(passage["score"], 3)
+
+    return passages
+
+
+def find_curated_documents(keyword: str = "", author: str = "", curated_after: str = "") -> List[Dict[str, Any]]:
+    """
+    Lists the already curated documents matching all the given conditions, without their content.
+    Empty conditions are ignored.
+    This can be used as a tool.
+
+    Args:
+        keyword (str): A keyword the documents must have, e.g. "NATO".
+        author (str): An author the documents must have, e.g. "Frank Gardner".
+        curated_after (str): An ISO 8601 date, e.g. "2025-11-01", after which the documents must have been curated.
+
+    Returns:
+        List[Dict[str, Any]]: The URL, title, authors, keywords and summary of each matching document, most recently curated first.
+    """
+    from content.provider import ContentProvider
+    from content.curated_content_provider import CuratedContentProvider
+    from storage.metadata_index import parse_time
+
+    curated_after_time = None
+    if curated_after:
+        curated_after_time = parse_time(curated_after)
+        if curated_after_time is None:
+            raise Exception(f"Invalid date {curated_after}")
+
+    curated_content_provider = ContentProvider.acquire(CuratedContentProvider)
+    try:
+        return curated_content_provider.find(keyword, author, curated_after_time)
+    finally:
+        ContentProvider.release(curated_content_provider)
+
+
+def retrieve_passages_for_hypotheses(hypotheses: List[str], k: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Retrieves, for each hypothesis, the passages of the already curated documents closest to it.
+    Passages are matched on their meaning when a sentence embedding model is installed, otherwise on their words,
+    so phrase each hypothesis with the terms the sources would use.
+    Only the relevant passages are returned, not the whole documents.
+    This can be used as a tool.
+
+    Args:
+        hypotheses (List[str]): The statements of the hypotheses.
+        k (int): The maximum number of passages to return per hypothesis.
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: The closest passages first, keyed by hypothesis, each with:
+            - url: the URL of the curated document
+            - title: the title of the curated document
+            - passage: the text of the passage
+            - score: the similarity of the passage to the hypothesis
+    """
+    from content.provider import ContentProvider
+    from content.curated_content_provider import CuratedContentProvider
+
+    curated_content_provider = ContentProvider.acquire(CuratedContentProvider)
+    try:
+        results = curated_content_provider.search_similar(hypotheses, k)
+    finally:
+        ContentProvider.release(curated_content_provider)
+
+    hypotheses_passages = {}
+    for hypothesis, passages in zip(hypotheses, results):
+        for passage in passages:
+            passage["score"] = round(passage["score"], 3)
+        hypotheses_passages[hypothesis] = passages
+
+    return hypotheses_passages
+
+
+async def aretrieve_metadata_and_content_from_url(url: str, refresh: bool = False) -> Tuple[Dict[str, Any], str]:
+    """
+    Fetches a webpage and returns its metadata together with the main content converted to Markdown.
+    The page is fetched without blocking, so several calls can be in flight at once.
+    This can be used as a tool.
+    
+    Args:
+        url (str): The URL to retrieve.
+        refresh (bool): Whether a cached page is checked with the server, and fetched again only if it changed.
+
+    Returns:
+        Tuple[Dict[str, Any], str]: 
+            - Dictionary containing page metadata (title, description, etc.)
+            - Page content converted to Markdown (ATX-style headings)
+    """
+    from content.provider import ContentProvider
+    from content.web_content_provider import WebContentProvider
+
+    # the provider and its cache are shared by all the tool calls of the process
+    web_content_provider = ContentProvider.acquire(WebContentProvider)
+    try:
+        # retrieve the extracted metadata and the main content of the webpage, converted to clean Markdown
+        # in a worker thread to keep the event loop responsive, the conversion being cached along with the raw HTML
+        metadata, markdownified_content = await web_content_provider.aretrieve_main_content(url, refresh)
+    finally:
+        ContentProvider.release(web_content_provider)
+    
+    return metadata, markdownified_content
+
+
+async def aretrieve_content_from_url(url: str) -> str:
+    """
+    Retrieves the content from a URL as clean Markdown.
+    The page is fetched without blocking, so several calls can be in flight at once.
+    This can be used as a tool.
+
+    Args:
+        url (str): The URL to retrieve content from.
+
+    Returns:
+        str: Webpage content in Markdown format.
+    """
+    # call the full retrieval function but keep only the Markdown content
+    _, content = await aretrieve_metadata_and_content_from_url(url)
+    return content
+
+
+async def aretrieve_curated_metadata_and_content_from_url(url: str, refresh: bool = False) -> Tuple[Dict[str, Any], str]:
+    """
+    Retrieves metadata and cleaned content from a curated source.
+    The source is curated without blocking, so several calls can be in flight at once.
+    This can be used as a tool.
+    
+    Args:
+        url (str): The URL of the curated page.
+        refresh (bool): Whether the source page is checked with the server, and curated again only if it changed.
+
+    Returns:
+        Tuple[Dict[str, Any], str]:
+            - Dictionary with page metadata
+            - Cleaned text content (typically already structured)
+    """
+    from content.provider import ContentProvider
+    from content.curated_content_provider import CuratedContentProvider
+
+    # the provider and its cache are shared by all the tool calls of the process
+    curated_content_provider = ContentProvider.acquire(CuratedContentProvider)
+    try:
+        # curated sources provide pre-cleaned content and structured metadata
+        metadata, content = await curated_content_provider.aretrieve(url, refresh)
+    finally:
+        ContentProvider.release(curated_content_provider)
+    
+    return metadata, content
+
+
+async def aretrieve_curated_content_from_url(url: str) -> str:
+    """
+    Retrieves cleaned content from a curated source (metadata is discarded).
+    The source is curated without blocking, so several calls can be in flight at once.
+    This can be used as a tool.
+    
+    Args:
+        url (str): The URL to retrieve curated content from.
+
+    Returns:
+        str: Cleaned text content from the source.
+    """
+    # use the metadata-aware version but return only the cleaned content
+    _, content = await aretrieve_curated_metadata_and_content_from_url(url)
+    return content
+
+
+async def aretrieve_curated_document_content_from_url(url: str) -> str:
+    """
+    Retrieves a curated page and returns a fully formatted, self-contained Markdown document.
+
+    The output includes title, source URL, keywords, and a blockquote-formatted summary,
+    followed by a separator and the full cleaned content — ideal for archiving or feeding to LLMs.
+    The source is curated without blocking, so several calls can be in flight at once.
+
+    This can be used as a tool.
+    
+    Args:
+        url (str): The URL of the curated document.
+
+    Returns:
+        str: Complete Markdown document with header information and content.
+    """
+    metadata, content = await aretrieve_curated_metadata_and_content_from_url(url)
+
+    return _format_curated_document(url, metadata, content)
+
+
+async def aprefetch_web_sources() -> Dict[str, str]:
+    """
+    Downloads all the curated web sources not yet cached concurrently, so the agents read them from the cache.
+    Requests are bounded overall and per server, and spaced for each server.
+
+    Returns:
+        Dict[str, str]: The reason of the failure of each source which could not be downloaded, keyed by URL.
+    """
+    from content.provider import ContentProvider
+    from content.web_content_provider import WebContentProvider
+    from tools.data_sources import get_web_sources_urls
+
+    web_content_provider = ContentProvider.acquire(WebContentProvider)
+    try:
+        return await web_content_provider.aprefetch(get_web_sources_urls())
+    finally:
+        ContentProvider.release(web_content_provider)
+
+
+def prefetch_web_sources() -> Dict[str, str]:
+    """
+    Downloads all the curated web sources not yet cached concurrently, so the agents read them from the cache.
+    Cold start takes about as long as the slowest server instead of the sum of all the downloads.
+    Code running in an event loop awaits aprefetch_web_sources instead.
+
+    Returns:
+        Dict[str, str]: The reason of the failure of each source which could not be downloaded, keyed by URL.
+
+    Raises:
+        Exception: If called while an event loop is running in the current thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(aprefetch_web_sources())
+
+    raise Exception(f"{prefetch_web_sources.__name__} cannot run inside an event loop, await {aprefetch_web_sources.__name__} instead")
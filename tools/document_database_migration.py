@@ -0,0 +1,55 @@
+import sys
+sys.dont_write_bytecode = True
+
+import argparse
+import json
+import logging
+import os
+
+from document_database import DocumentDatabase
+
+def migrate_tinydb_to_sqlite(database_directory: str) -> int:
+    """
+    Imports an existing TinyDB document store (index.json + content/) into the SQLite implementation.
+    The content files are reused in place, the TinyDB index is left untouched. 
+    Running the migration again only imports the documents which are not yet present.
+
+    Args:
+        database_directory (str): The directory holding the index.json file and the content subdirectory.
+
+    Returns:
+        int: The number of documents imported.
+    """
+    index_path = database_directory + "/" + DocumentDatabase._DOCUMENT_DATABASE_FILE
+    if not os.path.exists(index_path):
+        raise Exception(f"No TinyDB index found at {index_path}")
+
+    # read the TinyDB file directly, every table holds document records
+    with open(index_path, "r", encoding="utf-8") as f:
+        tables = json.load(f)
+
+    document_database = DocumentDatabase.get_implementation(database_directory, DocumentDatabase._IMPLEMENTATION_SQLITE, cache_size=0)
+
+    imported_count = 0
+    for table in tables.values():
+        for record in table.values():
+            imported = document_database.import_record(
+                record[DocumentDatabase._KEY_ID],
+                record[DocumentDatabase._KEY_FILE_NAME],
+                record[DocumentDatabase._KEY_METADATA]
+            )
+            if imported:
+                imported_count = imported_count + 1
+
+    logging.info(f"Imported {imported_count} documents into the SQLite index at {database_directory}")
+
+    return imported_count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Imports TinyDB document stores into the SQLite document database.")
+    parser.add_argument("database_directories", nargs="+", help="the document store directories, e.g. ./0_0_2_cache/0_0_1_raw")
+    arguments = parser.parse_args()
+
+    for database_directory in arguments.database_directories:
+        imported_count = migrate_tinydb_to_sqlite(database_directory)
+        print(f"{database_directory}: {imported_count} documents imported")
@@ -0,0 +1,102 @@
+import re
+
+from typing import Dict, List, Tuple
+
+# Below this confidence, the properties found in the page metadata are left to the LLM agents
+MIN_CONFIDENCE = 0.8
+
+# The separators between the title of an article and the name of its site, as in "Title | Site"
+_TITLE_SEPARATOR_PATTERN = re.compile(r"\s+[|\-–—:·•]{1,2}\s+")
+
+# The titles given to pages having none
+_GENERIC_TITLES = frozenset(["untitled", "home", "homepage", "index", "news", "article"])
+
+
+def _strip_site_name(title: str, site_name: str) -> Tuple[str, bool]:
+    """
+    Removes the name of the site leading or trailing a title.
+
+    Args:
+        title (str): The title, as "Title | Site" or "Site - Title".
+        site_name (str): The name of the site, None if unknown.
+
+    Returns:
+        Tuple[str, bool]: The title without the site name, and whether the title still has separated parts
+        one of which might be a site name.
+    """
+    parts = _TITLE_SEPARATOR_PATTERN.split(title)
+    if len(parts) == 1:
+        return title, False
+
+    if site_name:
+        site_name = site_name.strip().lower()
+        kept_parts = [part for part in parts if part.strip().lower() != site_name]
+        if kept_parts and (len(kept_parts) < len(parts)):
+            return " - ".join(kept_parts), len(kept_parts) > 1
+
+    return title, True
+
+
+def _is_generic(title: str) -> bool:
+    """
+    Tells whether a title says nothing about the page.
+
+    Args:
+        title (str): The title.
+
+    Returns:
+        bool: True if the title is empty, a placeholder or a single word.
+    """
+    return (title.strip().lower() in _GENERIC_TITLES) or (len(title.split()) < 2)
+
+
+def extract_title(metadata: Dict[str, any]) -> Tuple[str, float]:
+    """
+    Finds the title of a document in the metadata of its page, without reading its content.
+    Headlines (JSON-LD, OpenGraph) are preferred to the title of the page, which often holds the site name.
+
+    Args:
+        metadata (Dict[str, any]): The page metadata, as extracted by extract_html_metadata.
+
+    Returns:
+        Tuple[str, float]: The title, None if not found, and the confidence in it between 0 and 1.
+    """
+    site_name = metadata.get("site_name")
+
+    headline = metadata.get("headline")
+    if headline:
+        headline, ambiguous = _strip_site_name(headline.strip(), site_name)
+        if not _is_generic(headline):
+            # the page title repeating the headline confirms it
+            title = metadata.get("title") or ""
+            confidence = 1.0 if headline.lower() in title.lower() else 0.9
+            return headline, confidence - (0.2 if ambiguous else 0.0)
+
+    title = metadata.get("title")
+    if title:
+        title, ambiguous = _strip_site_name(title.strip(), site_name)
+        if not _is_generic(title):
+            return title, 0.6 if ambiguous else 0.8
+
+    return None, 0.0
+
+
+def extract_authors(metadata: Dict[str, any]) -> Tuple[str, float]:
+    """
+    Finds the authors of a document in the metadata of its page, without reading its content.
+
+    Args:
+        metadata (Dict[str, any]): The page metadata, as extracted by extract_html_metadata.
+
+    Returns:
+        Tuple[str, float]: The authors as a comma separated string of values, None if not found,
+        and the confidence in them between 0 and 1.
+    """
+    authors: List[str] = metadata.get("authors") or []
+    # names are short, longer values are descriptions or bylines left unparsed
+    authors = [author for author in authors if 0 < len(author.split()) <= 5]
+    if not authors:
+        # the byline may still be in the content
+        return None, 0.0
+
+    return ", ".join(authors), 0.9
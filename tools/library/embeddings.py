@@ -0,0 +1,222 @@
+import hashlib
+import logging
+import math
+
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+import numpy as np
+
+from tools.library.passages import tokenize
+
+class EmbeddingFunction(ABC):
+    """
+    Abstract Base Class for the functions turning texts into vectors whose cosine similarity reflects their similarity.
+    """
+
+    @abstractmethod
+    def get_name(self) -> str:
+        """
+        Identifies the embedding, vectors computed by embeddings with different names are not comparable.
+
+        Returns:
+            str: The name of the embedding, including any setting changing its vectors.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_dimension(self) -> int:
+        """
+        Gives the number of components of the vectors.
+
+        Returns:
+            int: The dimension of the vectors.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Computes the vectors of several texts at once.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: A float32 matrix with one unit-length row per text, texts without content giving zero rows.
+        """
+        raise NotImplementedError
+
+
+class HashingEmbeddingFunction(EmbeddingFunction):
+    """
+    Embedding computed locally and offline with the hashing trick.
+
+    Each term and each pair of consecutive terms is hashed to a signed component of the vector,
+    weighted by its logarithmic frequency in the text. Texts sharing vocabulary get similar vectors,
+    which is enough to rank passages against a hypothesis without any model or network access.
+
+    The similarity is lexical, not semantic: synonyms and paraphrases share no component,
+    so a passage only ranks high when it uses the words of the query.
+    It is the fallback of get_default_embedding_function when no sentence embedding model is installed.
+    """
+
+    def __init__(self, dimension: int = 1024):
+        """
+        Initializes the embedding.
+
+        Args:
+            dimension (int): The number of components of the vectors.
+        """
+        self._dimension = dimension
+
+    def get_name(self) -> str:
+        """
+        Identifies the embedding, vectors computed by embeddings with different names are not comparable.
+
+        Returns:
+            str: The name of the embedding, including its dimension.
+        """
+        return f"hashing-{self._dimension}"
+
+    def get_dimension(self) -> int:
+        """
+        Gives the number of components of the vectors.
+
+        Returns:
+            int: The dimension of the vectors.
+        """
+        return self._dimension
+
+    def _get_component(self, feature: str) -> Tuple[int, float]:
+        """
+        Hashes a feature to a component of the vector.
+        A stable hash is used, the built-in one changes between processes.
+
+        Args:
+            feature (str): The term or pair of terms.
+
+        Returns:
+            Tuple[int, float]: The index of the component and the sign of the contribution.
+        """
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return (digest >> 1) % self._dimension, 1.0 if digest & 1 else -1.0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Computes the vectors of several texts at once.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: A float32 matrix with one unit-length row per text, texts without terms giving zero rows.
+        """
+        vectors = np.zeros((len(texts), self._dimension), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            terms = tokenize(text)
+
+            frequencies = {}
+            for feature in terms + [first + " " + second for first, second in zip(terms, terms[1:])]:
+                frequencies[feature] = frequencies.get(feature, 0) + 1
+
+            for feature, frequency in frequencies.items():
+                component, sign = self._get_component(feature)
+                vectors[row, component] += sign * (1 + math.log(frequency))
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+
+        return vectors / norms
+
+
+class SentenceTransformerEmbeddingFunction(EmbeddingFunction):
+    """
+    Embedding computed locally by a sentence-transformers model.
+
+    Texts of similar meaning get similar vectors even when they share no words, so a passage
+    can match a hypothesis phrased differently. Requires the optional sentence-transformers package,
+    the model is downloaded on first use and read from the local cache afterwards.
+    """
+
+    DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+    # The number of texts the model encodes at once
+    _BATCH_SIZE = 64
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME):
+        """
+        Loads the model.
+
+        Args:
+            model_name (str): The name of the sentence-transformers model.
+
+        Raises:
+            ImportError: If the sentence-transformers package is not installed.
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self._model_name = model_name
+        self._model = SentenceTransformer(model_name)
+        self._dimension = self._model.get_sentence_embedding_dimension()
+
+    def get_name(self) -> str:
+        """
+        Identifies the embedding, vectors computed by embeddings with different names are not comparable.
+
+        Returns:
+            str: The name of the embedding, including its model.
+        """
+        return f"sentence-transformers-{self._model_name}"
+
+    def get_dimension(self) -> int:
+        """
+        Gives the number of components of the vectors.
+
+        Returns:
+            int: The dimension of the vectors.
+        """
+        return self._dimension
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Computes the vectors of several texts at once.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: A float32 matrix with one unit-length row per text, texts without content giving zero rows.
+        """
+        vectors = np.zeros((len(texts), self._dimension), dtype=np.float32)
+
+        rows = [row for row, text in enumerate(texts) if text.strip()]
+        if rows:
+            vectors[rows] = self._model.encode(
+                [texts[row] for row in rows],
+                batch_size = self._BATCH_SIZE,
+                normalize_embeddings = True,
+                convert_to_numpy = True,
+                show_progress_bar = False
+            )
+
+        return vectors
+
+
+def get_default_embedding_function() -> EmbeddingFunction:
+    """
+    Gives the embedding of the vector indexes: a local sentence embedding model when sentence-transformers
+    is installed, the hashing embedding otherwise. Indexes built with another embedding are rebuilt when opened.
+
+    Returns:
+        EmbeddingFunction: The embedding.
+    """
+    try:
+        return SentenceTransformerEmbeddingFunction()
+    except ImportError:
+        logging.info("sentence-transformers is not installed, passages are matched by the hashing embedding")
+    except Exception as e:
+        logging.warning(f"Failed to load the sentence embedding model, passages are matched by the hashing embedding: {e}")
+
+    return HashingEmbeddingFunction()
@@ -0,0 +1,263 @@
+import json
+
+from html.parser import HTMLParser
+from typing import Dict, List
+
+# Meta tag names and properties, lowercased, giving each single-valued field, most reliable first
+_META_FIELDS = {
+    "headline": ["og:title", "twitter:title"],
+    "description": ["description", "og:description", "twitter:description"],
+    "site_name": ["og:site_name", "application-name"],
+    "published_time": ["article:published_time", "datepublished", "publisheddate", "pubdate", "date", "dc.date.issued", "dcterms.created"],
+    "modified_time": ["article:modified_time", "datemodified", "lastdate", "og:updated_time", "dcterms.modified"],
+    "canonical_url": ["og:url"]
+}
+
+# Meta tag names and properties, lowercased, listing the authors and the keywords
+_META_AUTHORS = ["author", "article:author", "cxenseparse:author", "dc.creator", "sailthru.author", "byl"]
+_META_KEYWORDS = ["keywords", "news_keywords", "article:tag"]
+
+# JSON-LD properties giving each single-valued field
+_JSON_LD_FIELDS = {
+    "headline": "headline",
+    "description": "description",
+    "published_time": "datePublished",
+    "modified_time": "dateModified"
+}
+
+# JSON-LD types describing the page content, other nodes (breadcrumbs, organizations...) are ignored
+_JSON_LD_CONTENT_TYPES = frozenset([
+    "Article", "NewsArticle", "ReportageNewsArticle", "AnalysisNewsArticle", "OpinionNewsArticle",
+    "BackgroundNewsArticle", "BlogPosting", "LiveBlogPosting", "Report", "ScholarlyArticle", "WebPage"
+])
+
+
+class HtmlMetadataParser(HTMLParser):
+    """
+    Collects the document properties of an HTML page in a single pass: the title, the OpenGraph and meta tags,
+    the authors, the keywords, the publication dates, the canonical URL and the JSON-LD description of the content.
+    The page can be fed in pieces as it is downloaded.
+    """
+
+    def __init__(self):
+        """
+        Initializes the parser.
+        """
+        super().__init__(convert_charrefs=True)
+
+        self._title = None
+        self._language = None
+        self._canonical_url = None
+        self._meta = {}
+        self._json_ld_nodes = []
+
+        # the text of the element being read, if it is one of interest
+        self._text_parts = None
+        # SVG images have titles of their own, which are not the title of the page
+        self._svg_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List[tuple]) -> None:
+        if tag == "svg":
+            self._svg_depth = self._svg_depth + 1
+            return
+
+        if tag not in ("meta", "title", "link", "script", "html"):
+            return
+
+        attributes = {name: value for name, value in attrs if value is not None}
+
+        if tag == "meta":
+            name = attributes.get("property") or attributes.get("name") or attributes.get("itemprop")
+            content = attributes.get("content", "").strip()
+            if name and content:
+                self._meta.setdefault(name.lower(), []).append(content)
+        elif tag == "title":
+            if (self._title is None) and (self._svg_depth == 0):
+                self._text_parts = []
+        elif tag == "link":
+            if ("canonical" in attributes.get("rel", "").lower().split()) and attributes.get("href"):
+                self._canonical_url = self._canonical_url or attributes["href"].strip()
+        elif tag == "script":
+            if attributes.get("type", "").strip().lower() == "application/ld+json":
+                self._text_parts = []
+        elif tag == "html":
+            self._language = attributes.get("lang")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "svg":
+            self._svg_depth = max(self._svg_depth - 1, 0)
+        elif (tag == "title") and (self._text_parts is not None):
+            self._title = " ".join("".join(self._text_parts).split())
+            self._text_parts = None
+        elif (tag == "script") and (self._text_parts is not None):
+            self._add_json_ld("".join(self._text_parts))
+            self._text_parts = None
+
+    def handle_data(self, data: str) -> None:
+        if self._text_parts is not None:
+            self._text_parts.append(data)
+
+    def _add_json_ld(self, text: str) -> None:
+        """
+        Keeps the nodes of a JSON-LD script describing the page content.
+
+        Args:
+            text (str): The content of the script.
+        """
+        try:
+            document = json.loads(text)
+        except ValueError:
+            # malformed structured data is common, the page is described by its other tags
+            return
+
+        nodes = document if isinstance(document, list) else [document]
+        for node in nodes:
+            if not isinstance(node, dict):
+                continue
+            if isinstance(node.get("@graph"), list):
+                nodes.extend(node["@graph"])
+                continue
+
+            types = node.get("@type", [])
+            types = types if isinstance(types, list) else [types]
+            if any(node_type in _JSON_LD_CONTENT_TYPES for node_type in types):
+                self._json_ld_nodes.append(node)
+
+    def get_metadata(self) -> Dict[str, any]:
+        """
+        Gives the properties found in the page, the ones which are absent are left out.
+
+        Returns:
+            Dict[str, any]: Among title, headline, description, site_name, language, authors (list of names),
+            keywords (list), published_time, modified_time and canonical_url, the ones found in the page.
+        """
+        # articles are more specific than the pages holding them
+        json_ld_nodes = sorted(self._json_ld_nodes, key=lambda node: node.get("@type") == "WebPage")
+
+        metadata = {}
+        if self._title:
+            metadata["title"] = self._title
+
+        for field, names in _META_FIELDS.items():
+            values = [self._meta[name][0] for name in names if name in self._meta]
+            values = values + [node[_JSON_LD_FIELDS[field]] for node in json_ld_nodes if isinstance(node.get(_JSON_LD_FIELDS.get(field)), str)]
+            if values:
+                metadata[field] = values[0].strip()
+
+        if "site_name" not in metadata:
+            for node in json_ld_nodes:
+                publisher = node.get("publisher")
+                if isinstance(publisher, dict) and isinstance(publisher.get("name"), str):
+                    metadata["site_name"] = publisher["name"].strip()
+                    break
+
+        if self._canonical_url:
+            metadata["canonical_url"] = self._canonical_url
+        if self._language:
+            metadata["language"] = self._language
+
+        authors = []
+        for node in json_ld_nodes:
+            authors.extend(_get_json_ld_names(node.get("author")))
+        for name in _META_AUTHORS:
+            # profile links are not names
+            authors.extend(author for author in self._meta.get(name, []) if not author.startswith(("http://", "https://")))
+        # bylines are given as "By Jane Doe"
+        authors = _deduplicate([author[3:] if author.lower().startswith("by ") else author for author in authors])
+        if authors:
+            metadata["authors"] = authors
+
+        keywords = []
+        for name in _META_KEYWORDS:
+            for value in self._meta.get(name, []):
+                keywords.extend(value.split(","))
+        for node in json_ld_nodes:
+            node_keywords = node.get("keywords", [])
+            keywords.extend(node_keywords.split(",") if isinstance(node_keywords, str) else [keyword for keyword in node_keywords if isinstance(keyword, str)])
+        keywords = _deduplicate(keywords)
+        if keywords:
+            metadata["keywords"] = keywords
+
+        return metadata
+
+
+def _get_json_ld_names(value: any) -> List[str]:
+    """
+    Extracts the names of the people of a JSON-LD property.
+
+    Args:
+        value (any): The property, a name, a node with a name or a list of either.
+
+    Returns:
+        List[str]: The names.
+    """
+    values = value if isinstance(value, list) else [value]
+
+    names = []
+    for item in values:
+        if isinstance(item, str):
+            names.append(item)
+        elif isinstance(item, dict) and isinstance(item.get("name"), str):
+            # news organizations standing as authors are not people
+            types = item.get("@type", "Person")
+            if "Person" in (types if isinstance(types, list) else [types]):
+                names.append(item["name"])
+
+    return names
+
+
+def _deduplicate(values: List[str]) -> List[str]:
+    """
+    Removes the blank and repeated values, ignoring case and surrounding spaces.
+
+    Args:
+        values (List[str]): The values, in order of preference.
+
+    Returns:
+        List[str]: The first occurrence of each value, stripped.
+    """
+    unique_values = {}
+    for value in values:
+        value = " ".join(value.split())
+        if value and (value.lower() not in unique_values):
+            unique_values[value.lower()] = value
+
+    return list(unique_values.values())
+
+
+def extract_html_metadata(content: str) -> Dict[str, any]:
+    """
+    Collects the document properties of an HTML page in a single pass.
+    The head is parsed in full, while only the JSON-LD scripts of the body are, 
+    the body being most of the page and holding none of the other properties.
+
+    Args:
+        content (str): The HTML content of the page.
+
+    Returns:
+        Dict[str, any]: Among title, headline, description, site_name, language, authors (list of names),
+        keywords (list), published_time, modified_time and canonical_url, the ones found in the page.
+    """
+    parser = HtmlMetadataParser()
+
+    lowered_content = content.lower()
+    head_end = lowered_content.find("</head>")
+    if head_end < 0:
+        parser.feed(content)
+    else:
+        parser.feed(content[:head_end])
+
+        position = head_end
+        while True:
+            marker = lowered_content.find("application/ld+json", position)
+            script_start = lowered_content.rfind("<script", position, marker) if marker >= 0 else -1
+            script_end = lowered_content.find("</script>", marker) if script_start >= 0 else -1
+            if script_end < 0:
+                break
+
+            position = script_end + len("</script>")
+            parser.feed(content[script_start:position])
+
+    parser.close()
+
+    return parser.get_metadata()
@@ -0,0 +1,213 @@
+import importlib.metadata
+import re
+
+from typing import Dict, Tuple
+
+from bs4 import BeautifulSoup, Tag
+from markdownify import MarkdownConverter
+
+def _get_markdownify_version() -> str:
+    """
+    Gives the installed version of markdownify, whose output changes between versions.
+
+    Returns:
+        str: The version, "unknown" if the package metadata is not available.
+    """
+    try:
+        return importlib.metadata.version("markdownify")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# Identifies the extraction and the conversion, to be increased whenever a change here changes the Markdown produced,
+# so the Markdown cached for the previous version is produced again
+MAIN_CONTENT_CONVERTER_VERSION = "main-content-1/markdownify-" + _get_markdownify_version()
+
+# Elements never holding the content of a page
+_REMOVED_TAGS = [
+    "script", "style", "noscript", "template", "iframe", "svg", "canvas", "form", "button",
+    "input", "select", "textarea", "nav", "footer", "aside", "dialog", "link", "meta"
+]
+
+# Landmark roles of the page chrome
+_REMOVED_ROLES = frozenset(["navigation", "banner", "contentinfo", "complementary", "search", "menu", "menubar", "dialog", "alert"])
+
+# Class and identifier words of the page chrome, unless they also describe the content
+_NEGATIVE_PATTERN = re.compile(
+    r"(^|[-_\s])(ad|ads|advert|advertisement|banner|breadcrumbs?|comments?|cookies?|consent|footer|masthead|menu|modal|"
+    r"newsletter|outbrain|popup|promo|related|share|sharing|sidebar|skip|social|sponsored|subscribe|subscription|taboola|widget)($|[-_\s])",
+    re.IGNORECASE
+)
+_POSITIVE_PATTERN = re.compile(r"article|body|content|entry|main|post|story|text", re.IGNORECASE)
+
+# Blocks more than this share of whose text is in links are lists of links...
+_MAX_LINK_DENSITY = 0.5
+
+# ...unless they have at least this many characters of text outside links, like a paragraph citing its sources
+_MIN_UNLINKED_TEXT_LENGTH = 50
+
+# The containers scored as the potential main content of the page
+_CANDIDATE_TAGS = ["article", "main", "section", "div", "td", "body"]
+
+
+def _get_text_length(element: Tag) -> int:
+    """
+    Measures the text of an element, whitespace excluded.
+
+    Args:
+        element (Tag): The element.
+
+    Returns:
+        int: The number of characters of text.
+    """
+    return len("".join(element.get_text().split()))
+
+
+def _get_link_density(element: Tag) -> float:
+    """
+    Measures the share of the text of an element which is in links.
+
+    Args:
+        element (Tag): The element.
+
+    Returns:
+        float: The ratio of the link text to the whole text, 1 for elements without text.
+    """
+    text_length = _get_text_length(element)
+    if text_length == 0:
+        return 1.0
+
+    return sum(_get_text_length(link) for link in element.find_all("a")) / text_length
+
+
+def _is_link_list(element: Tag) -> bool:
+    """
+    Tells whether an element is a list of links: related articles, tags, sharing or navigation.
+
+    Args:
+        element (Tag): The element.
+
+    Returns:
+        bool: True if the text of the element is mostly in links, with little prose around them.
+    """
+    text_length = _get_text_length(element)
+    link_text_length = sum(_get_text_length(link) for link in element.find_all("a"))
+
+    return (link_text_length > text_length * _MAX_LINK_DENSITY) and (text_length - link_text_length < _MIN_UNLINKED_TEXT_LENGTH)
+
+
+def _is_chrome(element: Tag) -> bool:
+    """
+    Tells whether an element is part of the page chrome: hidden, a navigation landmark, named like one
+    or a decorative image.
+
+    Args:
+        element (Tag): The element.
+
+    Returns:
+        bool: True if the element is not part of the content.
+    """
+    if element.attrs is None:
+        return False
+    if element.has_attr("hidden") or (element.get("aria-hidden") == "true"):
+        return True
+    if element.get("role", "").lower() in _REMOVED_ROLES:
+        return True
+    # decorative images and placeholders are described by no text
+    if (element.name == "img") and not element.get("alt", "").strip():
+        return True
+    # the header of the page, not the one of the article
+    if (element.name == "header") and (element.find_parent(["article", "main"]) is None):
+        return True
+
+    names = " ".join(element.get("class", [])) + " " + element.get("id", "")
+    return bool(_NEGATIVE_PATTERN.search(names)) and not _POSITIVE_PATTERN.search(names)
+
+
+def _select_main_element(soup: BeautifulSoup) -> Tag:
+    """
+    Finds the element holding the content of the page, scoring the containers by the paragraphs they hold.
+
+    Args:
+        soup (BeautifulSoup): The page, stripped of its chrome.
+
+    Returns:
+        Tag: The main element, the body when no better container is found.
+    """
+    scores = {}
+    for paragraph in soup.find_all(["p", "pre", "blockquote", "li"]):
+        text = paragraph.get_text()
+        length = len(text.strip())
+        if length < 25:
+            continue
+
+        # longer sentences with more clauses weigh more, like in readability
+        score = 1 + text.count(",") + min(length // 100, 3)
+        parent = paragraph.find_parent(_CANDIDATE_TAGS)
+        for level, container in enumerate([parent, parent.find_parent(_CANDIDATE_TAGS) if parent else None]):
+            if container is not None:
+                scores[id(container)] = (scores.get(id(container), (0, container))[0] + score / (level + 1), container)
+
+    body = soup.body if soup.body else soup
+    if not scores:
+        return body
+
+    # a container mostly made of links is a menu, however long
+    best_score, best_element = max(
+        ((score * (1 - _get_link_density(element)), element) for score, element in scores.values()),
+        key=lambda candidate: candidate[0]
+    )
+
+    # an article split over sibling sections is taken whole
+    parent = best_element.find_parent(_CANDIDATE_TAGS)
+    if (parent is not None) and (id(parent) in scores) and (scores[id(parent)][0] >= best_score):
+        return parent
+
+    return best_element if best_score > 0 else body
+
+
+def extract_main_content(html: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Converts the main content of a page to Markdown, leaving out its navigation, scripts, styles,
+    headers, footers, sidebars and link lists, so they are neither converted nor sent to the agents.
+
+    Args:
+        html (str): The HTML content of the page.
+
+    Returns:
+        Tuple[str, Dict[str, int]]: The Markdown main content, and the sizes of the page and of its content
+        ("html_characters", "html_tokens", "markdown_characters", "markdown_tokens"), 
+        tokens being estimated at four characters each.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    for element in soup.find_all(_REMOVED_TAGS):
+        element.decompose()
+    for element in soup.find_all(_is_chrome):
+        # the descendants of removed elements are removed with them
+        if not element.decomposed:
+            element.decompose()
+
+    main_element = _select_main_element(soup)
+
+    # lists of links left inside the content: related articles, tags, sharing
+    for element in main_element.find_all(["div", "section", "ul", "ol", "table", "p"]):
+        if (not element.decomposed) and _is_link_list(element):
+            element.decompose()
+
+    # the title stays first, the agents rely on it
+    title = soup.title.get_text().strip() if soup.title else ""
+    markdown = MarkdownConverter(heading_style="ATX").convert_soup(main_element).strip()
+    if title and (title not in markdown[:len(title) * 2]):
+        markdown = title + "\n\n" + markdown
+
+    markdown = re.sub(r"\n{3,}", "\n\n", markdown)
+
+    statistics = {
+        "html_characters": len(html),
+        "html_tokens": len(html) // 4,
+        "markdown_characters": len(markdown),
+        "markdown_tokens": len(markdown) // 4
+    }
+
+    return markdown, statistics
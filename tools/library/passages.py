@@ -0,0 +1,147 @@
+import re
+
+from typing import List
+
+# Common English words carrying no meaning on their own, left out of the searchable terms
+_STOP_WORDS = frozenset("""
+    a about above after again against all am an and any are as at be because been before being below
+    between both but by can could did do does doing down during each few for from further had has have
+    having he her here hers herself him himself his how i if in into is it its itself just me more most
+    my myself no nor not now of off on once only or other our ours ourselves out over own same she should
+    so some such than that the their theirs them themselves then there these they this those through to
+    too under until up very was we were what when where which while who whom why will with would you your
+    yours yourself yourselves
+""".split())
+
+# Endings in "s" which do not mark a plural
+_KEPT_ENDINGS = ("ss", "us", "is", "ous")
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+_PARAGRAPH_SEPARATOR_PATTERN = re.compile(r"\n\s*\n")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits a text into its searchable terms.
+    Terms are lowercased words with their plural "s" removed, stop words and single characters are left out.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        List[str]: The terms of the text, in order and with repetitions.
+    """
+    terms = []
+    for term in _TERM_PATTERN.findall(text.lower()):
+        if (len(term) < 2) or (term in _STOP_WORDS):
+            continue
+
+        # "sanctions" and "sanction" are the same term, "process" or "status" are left untouched
+        if (len(term) > 3) and term.endswith("s") and not term.endswith(_KEPT_ENDINGS):
+            term = term[:-1]
+
+        terms.append(term)
+
+    return terms
+
+
+def split_passages(text: str, max_words: int = 200) -> List[str]:
+    """
+    Splits a text into passages of consecutive paragraphs.
+    Paragraphs are grouped until a passage reaches the maximum number of words,
+    longer paragraphs are cut into several passages.
+
+    Args:
+        text (str): The text to split, paragraphs being separated by blank lines.
+        max_words (int): The maximum number of words in a passage.
+
+    Returns:
+        List[str]: The passages of the text, in order.
+    """
+    passages = []
+    passage_paragraphs = []
+    passage_word_count = 0
+
+    def flush() -> None:
+        nonlocal passage_paragraphs, passage_word_count
+        if passage_paragraphs:
+            passages.append("\n\n".join(passage_paragraphs))
+        passage_paragraphs = []
+        passage_word_count = 0
+
+    for paragraph in _PARAGRAPH_SEPARATOR_PATTERN.split(text):
+        paragraph = paragraph.strip()
+        words = paragraph.split()
+        if not words:
+            continue
+
+        if passage_word_count + len(words) > max_words:
+            flush()
+
+        # paragraphs longer than a passage are cut at word boundaries
+        while len(words) > max_words:
+            passages.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+            paragraph = " ".join(words)
+
+        passage_paragraphs.append(paragraph)
+        passage_word_count = passage_word_count + len(words)
+
+    flush()
+
+    return passages
+
+
+def split_chunks(text: str, max_characters: int = 12_000) -> List[str]:
+    """
+    Splits a Markdown text into chunks processed independently, at heading and paragraph boundaries.
+    Each heading starts a new chunk once the current one is a quarter full, so an edit only
+    moves the chunk boundaries of its own section. Paragraphs are grouped until a chunk reaches
+    the maximum size, longer paragraphs are cut at word boundaries.
+
+    Args:
+        text (str): The text to split, paragraphs being separated by blank lines.
+        max_characters (int): The maximum number of characters in a chunk.
+
+    Returns:
+        List[str]: The chunks of the text, in order, an empty text having none.
+    """
+    chunks = []
+    chunk_paragraphs = []
+    chunk_size = 0
+
+    def flush() -> None:
+        nonlocal chunk_paragraphs, chunk_size
+        if chunk_paragraphs:
+            chunks.append("\n\n".join(chunk_paragraphs))
+        chunk_paragraphs = []
+        chunk_size = 0
+
+    for paragraph in _PARAGRAPH_SEPARATOR_PATTERN.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        if paragraph.startswith("#") and (chunk_size >= max_characters // 4):
+            flush()
+        if (chunk_size + len(paragraph) > max_characters) and (len(paragraph) <= max_characters):
+            flush()
+
+        # paragraphs longer than a chunk are cut at word boundaries, filling the current chunk first
+        while chunk_size + len(paragraph) > max_characters:
+            cut = paragraph.rfind(" ", 0, max_characters - chunk_size)
+            if cut <= 0:
+                if chunk_paragraphs:
+                    flush()
+                    continue
+                cut = max_characters
+            chunk_paragraphs.append(paragraph[:cut].strip())
+            flush()
+            paragraph = paragraph[cut:].strip()
+
+        chunk_paragraphs.append(paragraph)
+        chunk_size = chunk_size + len(paragraph) + 2
+
+    flush()
+
+    return chunks
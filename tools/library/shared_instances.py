@@ -0,0 +1,134 @@
+import atexit
+import threading
+
+from typing import Any, Callable, Dict, Hashable
+
+class _Creation:
+    """
+    An instance being created, which the other acquisitions of its key wait for.
+    """
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.done = threading.Event()
+        self.waiter_count = 0
+        self.instance = None
+
+class SharedInstanceRegistry:
+    """
+    Hands out long-lived instances shared by the whole process, counting their users.
+
+    An instance is created on its first acquisition and stays open once its users release it,
+    so later acquisitions reuse it instead of paying its construction again. 
+    Instances are created outside of the registry lock, so a slow construction only delays the acquisitions
+    of its own key, and a factory may acquire other instances from the same registry.
+    Instances are closed, by calling their close() method, through close_unused or when the process exits.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty registry and arranges for it to be closed at process exit.
+        """
+        self._lock = threading.Lock()
+        self._instances: Dict[Hashable, Any] = {}
+        self._reference_counts: Dict[Hashable, int] = {}
+        self._keys: Dict[int, Hashable] = {}
+        self._creations: Dict[Hashable, _Creation] = {}
+
+        atexit.register(self.close_all)
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Retrieves the instance registered under the key, creating it if needed.
+        Every acquisition must be paired with a release.
+
+        Args:
+            key (Hashable): The key identifying the shared instance.
+            factory (Callable[[], Any]): Creates the instance when it is not registered yet.
+
+        Returns:
+            Any: The shared instance.
+
+        Raises:
+            Exception: If the factory acquires the instance it is creating.
+        """
+        while True:
+            with self._lock:
+                if key in self._instances:
+                    self._reference_counts[key] = self._reference_counts[key] + 1
+                    return self._instances[key]
+
+                creation = self._creations.get(key)
+                if creation is None:
+                    creation = _Creation()
+                    self._creations[key] = creation
+                    break
+
+                if creation.thread_id == threading.get_ident():
+                    raise Exception(f"The shared instance {key} is acquired again while it is being created")
+
+                # the waiters are counted as users as soon as the instance is registered
+                creation.waiter_count = creation.waiter_count + 1
+
+            creation.done.wait()
+            if creation.instance is not None:
+                return creation.instance
+
+            # the creation failed, this acquisition tries again
+
+        instance = None
+        try:
+            instance = factory()
+        finally:
+            with self._lock:
+                del self._creations[key]
+                if instance is not None:
+                    self._instances[key] = instance
+                    self._reference_counts[key] = 1 + creation.waiter_count
+                    self._keys[id(instance)] = key
+                    creation.instance = instance
+            creation.done.set()
+
+        return instance
+
+    def release(self, instance: Any) -> None:
+        """
+        Releases an acquired instance, which stays open for later acquisitions.
+
+        Args:
+            instance (Any): The instance returned by acquire.
+        """
+        with self._lock:
+            key = self._keys.get(id(instance))
+            if key is not None:
+                self._reference_counts[key] = self._reference_counts[key] - 1
+
+    def close_unused(self) -> None:
+        """
+        Closes and forgets the instances no one has acquired.
+        """
+        with self._lock:
+            unused_keys = [key for key, reference_count in self._reference_counts.items() if reference_count <= 0]
+            
+            instances = []
+            for key in unused_keys:
+                instance = self._instances.pop(key)
+                del self._reference_counts[key]
+                del self._keys[id(instance)]
+                instances.append(instance)
+
+        for instance in instances:
+            instance.close()
+
+    def close_all(self) -> None:
+        """
+        Closes all the registered instances, regardless of their users.
+        """
+        with self._lock:
+            instances = list(self._instances.values())
+            self._instances.clear()
+            self._reference_counts.clear()
+            self._keys.clear()
+
+        for instance in instances:
+            instance.close()
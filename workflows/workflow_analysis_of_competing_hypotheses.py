@@ -1,3 +1,5 @@
+import asyncio
+
 from tools.prompting import generate_evidence_extraction_prompt
 from tools.prompting import generate_evidence_structuring_prompt
 from tools.prompting import generate_competing_hypotheses_matrix_prompt
@@ -6,6 +8,8 @@ from tools.prompting import generate_evidence_analysis_executive_review_prompt
 from tools.prompting import generate_actionable_information_prompt
 from tools.prompting import generate_report_title_prompt
 
+from tools.content import aprefetch_web_sources
+
 from agents.analysis_hypotheses_extraction_agent_factory import AnalysisHypothesesExtractionAgentFactory
 from agents.analysis_web_information_agent_factory import AnalysisWebInformationAgentFactory
 from agents.analysis_evidence_structuring_agent_factory import AnalysisEvidenceStructuringAgentFactory
@@ -33,46 +37,53 @@ def silence_event_loop_closed(func):
 
 @silence_event_loop_closed
 def run_workflow_analysis_of_competing_hypotheses(user_request: str) -> str:
+    # code running in an event loop, like a notebook, awaits arun_workflow_analysis_of_competing_hypotheses instead
+    return asyncio.run(arun_workflow_analysis_of_competing_hypotheses(user_request))
+
+async def arun_workflow_analysis_of_competing_hypotheses(user_request: str) -> str:
     
+    # download the curated web sources at once, the agents then read them from the cache
+    await aprefetch_web_sources()
+
     # first extract the hypotheses
     runner = SimpleRunner()
-    extracted_hypotheses = runner.run(
+    extracted_hypotheses = await runner.arun(
         AnalysisHypothesesExtractionAgentFactory().get_agent(),
         user_request
     )
     
     # extract the evidence from the data
-    extracted_evidence = runner.run(
+    extracted_evidence = await runner.arun(
         AnalysisWebInformationAgentFactory().get_agent(),
         generate_evidence_extraction_prompt(extracted_hypotheses)
     )
 
     # structure the extracted evidence 
-    structured_evidence = runner.run(
+    structured_evidence = await runner.arun(
         AnalysisEvidenceStructuringAgentFactory().get_agent(),
         generate_evidence_structuring_prompt(extracted_evidence)
     )
 
     # generate the competitive hypotheses matrix
-    competing_hypotheses_matrix = runner.run(
+    competing_hypotheses_matrix = await runner.arun(
         AnalysisCompetingHypothesesMatrixAgentFactory().get_agent(),
         generate_competing_hypotheses_matrix_prompt(extracted_hypotheses, structured_evidence)
     )
     
     # perform an in depth analysis of the structured evidence and its support for hypotheses 
-    detailed_evidence_analysis = runner.run(
+    detailed_evidence_analysis = await runner.arun(
         AnalysisEvidenceDetailedAnalysisAgentFactory().get_agent(),
         generate_evidence_in_depth_analysis_prompt(extracted_hypotheses, structured_evidence)
     )
 
     # generate the executive review 
-    executive_review = runner.run(
+    executive_review = await runner.arun(
         AnalysisExecutiveReviewAgentFactory().get_agent(),
         generate_evidence_analysis_executive_review_prompt(extracted_hypotheses, detailed_evidence_analysis)
     )
     
     # generate the actionable information 
-    actionable_information = runner.run(
+    actionable_information = await runner.arun(
         AnalysisActionableInformationAgentFactory().get_agent(),
         generate_actionable_information_prompt(
             user_request, 
@@ -83,7 +94,7 @@ def run_workflow_analysis_of_competing_hypotheses(user_request: str) -> str:
     )
     
     # generate the report title 
-    report_title = runner.run(
+    report_title = await runner.arun(
         AnalysisReportTitleAgentFactory().get_agent(),
         generate_report_title_prompt(
             user_request, 